@@ -160,7 +160,7 @@ export async function saveProject(projectData: object, filename?: string): Promi
   return response.json();
 }
 
-export async function loadProject(filename: string): Promise<{ success: boolean; project?: any; error?: string }> {
+export async function loadProject(filename: string): Promise<{ success: boolean; project?: any; warning?: string; error?: string }> {
   const response = await fetch(`${API_BASE_URL}/project/load?filename=${encodeURIComponent(filename)}`, { method: 'POST' });
   return response.json();
 }
@@ -194,7 +194,7 @@ export async function checkAutosave(): Promise<{ exists: boolean; savedAt?: stri
   return response.json();
 }
 
-export async function recoverAutosave(): Promise<{ success: boolean; project?: any }> {
+export async function recoverAutosave(): Promise<{ success: boolean; project?: any; warning?: string }> {
   const response = await fetch(`${API_BASE_URL}/project/autosave/recover`, { method: 'POST' });
   return response.json();
 }
@@ -117,7 +117,7 @@ export async function getSupportedFormats(
   extensions: string[];
   description: string;
 }>> {
-  const response = await fetch(`${apiUrl}/supported-formats`);
+  const response = await fetch(`${apiUrl}/gis/supported-formats`);
 
   if (!response.ok) {
     throw new Error('Failed to get supported formats');
@@ -7,13 +7,14 @@ Validates and suggests emergency exit locations to ensure:
 - Exits are reachable from any point in the maze
 """
 
-import math
 from typing import Dict, List, Tuple, Optional
 
 import numpy as np
 from shapely.geometry import Point, LineString
 from shapely.geometry.base import BaseGeometry
 
+from .grid import walkable_grid
+
 
 def analyze_emergency_exits(
     walls: BaseGeometry,
@@ -40,81 +41,42 @@ def analyze_emergency_exits(
             "exit_stats": [{"x": float, "y": float, "coverage_area_m2": float}, ...]
         }
     """
-    minx, miny, maxx, maxy = field_boundary.bounds
-    cols = max(1, int((maxx - minx) / resolution))
-    rows = max(1, int((maxy - miny) / resolution))
-
-    # Build walkable grid
-    walkable = np.zeros((rows, cols), dtype=bool)
-    for r in range(rows):
-        for c in range(cols):
-            cx = minx + (c + 0.5) * resolution
-            cy = miny + (r + 0.5) * resolution
-            if field_boundary.contains(Point(cx, cy)):
-                walkable[r, c] = True
-
-    if walls and not walls.is_empty:
-        wall_buffer = walls.buffer(resolution * 0.4)
-        for r in range(rows):
-            for c in range(cols):
-                if not walkable[r, c]:
-                    continue
-                cx = minx + (c + 0.5) * resolution
-                cy = miny + (r + 0.5) * resolution
-                if wall_buffer.contains(Point(cx, cy)):
-                    walkable[r, c] = False
+    # Without exits nothing is covered; skip the grid, whose distances would
+    # all be infinite (and not representable in the JSON response)
+    if not emergency_exits:
+        return {"coverage_pct": 0, "max_distance_found": 0, "uncovered_areas": [], "exit_stats": []}
+
+    walkable, xs, ys = walkable_grid(walls, field_boundary, resolution)
 
     total_walkable = int(walkable.sum())
     if total_walkable == 0:
         return {"coverage_pct": 0, "max_distance_found": 0, "uncovered_areas": [], "exit_stats": []}
 
     # Calculate distance from each walkable cell to nearest exit (Euclidean for speed)
-    min_distances = np.full((rows, cols), float('inf'))
-
-    for ex, ey in emergency_exits:
-        for r in range(rows):
-            for c in range(cols):
-                if not walkable[r, c]:
-                    continue
-                cx = minx + (c + 0.5) * resolution
-                cy = miny + (r + 0.5) * resolution
-                dist = math.sqrt((cx - ex) ** 2 + (cy - ey) ** 2)
-                if dist < min_distances[r, c]:
-                    min_distances[r, c] = dist
+    exit_distances = [
+        np.sqrt((xs - ex) ** 2 + (ys - ey) ** 2) for ex, ey in emergency_exits
+    ]
+    min_distances = np.full(walkable.shape, float('inf'))
+    for dist in exit_distances:
+        np.minimum(min_distances, dist, out=min_distances, where=walkable)
 
     # Coverage analysis
-    covered = 0
-    uncovered_areas = []
-    max_dist_found = 0
-
-    for r in range(rows):
-        for c in range(cols):
-            if not walkable[r, c]:
-                continue
-            dist = min_distances[r, c]
-            if dist <= max_distance:
-                covered += 1
-            else:
-                cx = minx + (c + 0.5) * resolution
-                cy = miny + (r + 0.5) * resolution
-                uncovered_areas.append({"x": round(cx, 2), "y": round(cy, 2), "distance": round(dist, 1)})
-            if dist < float('inf') and dist > max_dist_found:
-                max_dist_found = dist
+    covered_mask = walkable & (min_distances <= max_distance)
+    covered = int(covered_mask.sum())
+
+    uncovered_areas = [
+        {"x": round(float(xs[r, c]), 2), "y": round(float(ys[r, c]), 2), "distance": round(float(min_distances[r, c]), 1)}
+        for r, c in np.argwhere(walkable & ~covered_mask)
+    ]
+
+    finite = min_distances[walkable & np.isfinite(min_distances)]
+    max_dist_found = float(finite.max()) if finite.size else 0
 
     # Per-exit stats
     exit_stats = []
     cell_area = resolution * resolution
-    for ex, ey in emergency_exits:
-        count = 0
-        for r in range(rows):
-            for c in range(cols):
-                if not walkable[r, c]:
-                    continue
-                cx = minx + (c + 0.5) * resolution
-                cy = miny + (r + 0.5) * resolution
-                dist = math.sqrt((cx - ex) ** 2 + (cy - ey) ** 2)
-                if dist <= max_distance and dist == min_distances[r, c]:
-                    count += 1
+    for (ex, ey), dist in zip(emergency_exits, exit_distances):
+        count = int((covered_mask & (dist == min_distances)).sum())
         exit_stats.append({
             "x": round(ex, 2),
             "y": round(ey, 2),
@@ -153,66 +115,37 @@ def suggest_emergency_exits(
     """
     existing = list(existing_exits) if existing_exits else []
 
-    minx, miny, maxx, maxy = field_boundary.bounds
-    cols = max(1, int((maxx - minx) / resolution))
-    rows = max(1, int((maxy - miny) / resolution))
-
-    # Build walkable grid
-    walkable = np.zeros((rows, cols), dtype=bool)
-    for r in range(rows):
-        for c in range(cols):
-            cx = minx + (c + 0.5) * resolution
-            cy = miny + (r + 0.5) * resolution
-            if field_boundary.contains(Point(cx, cy)):
-                walkable[r, c] = True
-
-    if walls and not walls.is_empty:
-        wall_buffer = walls.buffer(resolution * 0.4)
-        for r in range(rows):
-            for c in range(cols):
-                if not walkable[r, c]:
-                    continue
-                cx = minx + (c + 0.5) * resolution
-                cy = miny + (r + 0.5) * resolution
-                if wall_buffer.contains(Point(cx, cy)):
-                    walkable[r, c] = False
+    walkable, xs, ys = walkable_grid(walls, field_boundary, resolution)
 
     suggested = []
-    all_exits = list(existing)
     max_iterations = 20
 
+    # Distance from every walkable cell to its nearest exit, updated as
+    # exits are placed; non-walkable cells never win the argmax
+    cell_x = xs[walkable]
+    cell_y = ys[walkable]
+    min_dist = np.full(cell_x.shape, float('inf'))
+    for ex, ey in existing:
+        np.minimum(min_dist, np.sqrt((cell_x - ex) ** 2 + (cell_y - ey) ** 2), out=min_dist)
+
     for iteration in range(max_iterations):
         # Find the walkable cell farthest from any exit
-        max_min_dist = 0
-        best_pos = None
-
-        for r in range(rows):
-            for c in range(cols):
-                if not walkable[r, c]:
-                    continue
-                cx = minx + (c + 0.5) * resolution
-                cy = miny + (r + 0.5) * resolution
-
-                min_dist = float('inf')
-                for ex, ey in all_exits:
-                    dist = math.sqrt((cx - ex) ** 2 + (cy - ey) ** 2)
-                    if dist < min_dist:
-                        min_dist = dist
-
-                if min_dist > max_min_dist:
-                    max_min_dist = min_dist
-                    best_pos = (cx, cy)
-
-        if max_min_dist <= max_distance:
+        if min_dist.size == 0 or min_dist.max() <= max_distance:
             break  # Full coverage achieved
 
-        if best_pos:
-            # Place exit on the nearest field boundary point
-            boundary_point = field_boundary.exterior.interpolate(
-                field_boundary.exterior.project(Point(best_pos))
-            )
-            exit_pos = (round(boundary_point.x, 2), round(boundary_point.y, 2))
-            suggested.append(exit_pos)
-            all_exits.append(exit_pos)
+        best = int(min_dist.argmax())
+        best_pos = (float(cell_x[best]), float(cell_y[best]))
+
+        # Place exit on the nearest field boundary point
+        boundary_point = field_boundary.exterior.interpolate(
+            field_boundary.exterior.project(Point(best_pos))
+        )
+        exit_pos = (round(boundary_point.x, 2), round(boundary_point.y, 2))
+        suggested.append(exit_pos)
+        np.minimum(
+            min_dist,
+            np.sqrt((cell_x - exit_pos[0]) ** 2 + (cell_y - exit_pos[1]) ** 2),
+            out=min_dist,
+        )
 
     return suggested
@@ -8,15 +8,216 @@ Uses a simplified agent-based approach: multiple agents navigate from
 entrance to exit using randomized A*-biased decisions at junctions.
 """
 
-import random
 import math
 from collections import defaultdict
 from typing import Dict, List, Tuple, Optional
 
 import numpy as np
-from shapely.geometry import Point
 from shapely.geometry.base import BaseGeometry
 
+from .grid import walkable_grid
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:  # numba is optional; the pure-Python walk is used instead
+    _HAS_NUMBA = False
+
+# Grid moves: up, down, left, right
+NEIGHBORS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+# The same moves as a contiguous (4, 2) array for the compiled walk
+DIRECTIONS = np.array(NEIGHBORS, dtype=np.int8)
+
+
+def _uniform_stream(rng: np.random.Generator, block: int = 4096):
+    """Yield uniform floats in [0, 1) drawn from *rng* a block at a time."""
+    while True:
+        yield from rng.random(block).tolist()
+
+
+def _open_neighbors(grid: np.ndarray) -> np.ndarray:
+    """
+    Which of the NEIGHBORS moves lead to an open in-grid cell, for every cell.
+
+    Built from shifted copies of the grid, one slice assignment per
+    direction, so the walk needs no per-step bounds checks.
+
+    Returns:
+        Boolean array of shape (rows, cols, len(NEIGHBORS)).
+    """
+    rows, cols = grid.shape
+    is_open = ~grid
+    valid = np.zeros((rows, cols, len(NEIGHBORS)), dtype=bool)
+    for d, (dr, dc) in enumerate(NEIGHBORS):
+        valid[max(0, -dr):rows - max(0, dr), max(0, -dc):cols - max(0, dc), d] = \
+            is_open[max(0, dr):rows - max(0, -dr), max(0, dc):cols - max(0, -dc)]
+    return valid
+
+
+def _walk_visitors_py(
+    grid: np.ndarray,
+    entrance_cells: List[Tuple[int, int]],
+    exit_cells: List[Tuple[int, int]],
+    num_visitors: int,
+    max_steps: int,
+    seed: Optional[int],
+) -> Tuple[np.ndarray, int, List[int]]:
+    """
+    Random-walk every visitor from an entrance toward an exit.
+
+    Randomness comes from a local np.random.Generator, drawn in blocks,
+    so the walk never touches the global random state.
+
+    Returns:
+        (heatmap, completions, solve_steps)
+    """
+    uniform = _uniform_stream(np.random.default_rng(seed)).__next__
+
+    def choice(seq):
+        return seq[int(uniform() * len(seq))]
+
+    rows, cols = grid.shape
+    heatmap = np.zeros((rows, cols), dtype=int)
+    solve_steps = []
+    completions = 0
+
+    # Open neighbour cells of every cell, in NEIGHBORS order
+    open_moves = _open_neighbors(grid)
+    neighbors = [[[] for _ in range(cols)] for _ in range(rows)]
+    for d, (dr, dc) in enumerate(NEIGHBORS):
+        for r, c in np.argwhere(open_moves[:, :, d]).tolist():
+            neighbors[r][c].append((r + dr, c + dc))
+
+    for v in range(num_visitors):
+        # Pick random entrance
+        start = choice(entrance_cells)
+        target_exit = choice(exit_cells)
+
+        # Random walk with exit-biased heuristic
+        r, c = start
+        visited = set()
+        steps = 0
+
+        while steps < max_steps:
+            heatmap[r, c] += 1
+            visited.add((r, c))
+            steps += 1
+
+            if (r, c) == target_exit or (r, c) in exit_cells:
+                completions += 1
+                solve_steps.append(steps)
+                break
+
+            # Get valid neighbors
+            valid = list(neighbors[r][c])
+
+            if not valid:
+                break
+
+            # Bias toward exit (70% chance to pick best direction)
+            if uniform() < 0.7 and len(valid) > 1:
+                valid.sort(key=lambda p: abs(p[0] - target_exit[0]) + abs(p[1] - target_exit[1]))
+
+            # Prefer unvisited cells
+            unvisited = [p for p in valid if p not in visited]
+            if unvisited:
+                if uniform() < 0.8:
+                    r, c = unvisited[0]
+                else:
+                    r, c = choice(unvisited)
+            else:
+                r, c = choice(valid)
+
+    return heatmap, completions, solve_steps
+
+
+if _HAS_NUMBA:
+    # Compiled on the first simulation and cached on disk, so importing
+    # this module does not wait on numba.
+    @njit(cache=True)
+    def _walk_visitors_jit(open_moves, directions, entrance_cells, exit_cells, num_visitors, max_steps, rng):
+        # Same walk as _walk_visitors_py with fixed-size buffers in place of
+        # lists and a per-visitor stamp in place of the visited set.
+        # open_moves is _open_neighbors() as uint8, so each step reads four
+        # flags instead of bounds-checking its neighbours.  Draws come from
+        # the caller's Generator, never numba's global random state.
+
+        rows, cols = open_moves.shape[0], open_moves.shape[1]
+        heatmap = np.zeros((rows, cols), dtype=np.int64)
+        solve_steps = np.empty(num_visitors, dtype=np.int64)
+        completions = 0
+
+        is_exit = np.zeros((rows, cols), dtype=np.uint8)
+        for i in range(exit_cells.shape[0]):
+            is_exit[exit_cells[i, 0], exit_cells[i, 1]] = 1
+
+        visited = np.zeros((rows, cols), dtype=np.int32)
+        valid = np.empty((4, 2), dtype=np.int64)
+        unvisited = np.empty((4, 2), dtype=np.int64)
+
+        for v in range(num_visitors):
+            s = rng.integers(0, entrance_cells.shape[0])
+            t = rng.integers(0, exit_cells.shape[0])
+            r = entrance_cells[s, 0]
+            c = entrance_cells[s, 1]
+            tr = exit_cells[t, 0]
+            tc = exit_cells[t, 1]
+            stamp = np.int32(v + 1)
+            steps = 0
+
+            while steps < max_steps:
+                heatmap[r, c] += 1
+                visited[r, c] = stamp
+                steps += 1
+
+                if is_exit[r, c] != 0:
+                    solve_steps[completions] = steps
+                    completions += 1
+                    break
+
+                k = 0
+                for d in range(4):
+                    if open_moves[r, c, d] != 0:
+                        valid[k, 0] = r + directions[d, 0]
+                        valid[k, 1] = c + directions[d, 1]
+                        k += 1
+
+                if k == 0:
+                    break
+
+                # Stable insertion sort by Manhattan distance to the exit
+                if rng.random() < 0.7 and k > 1:
+                    for i in range(1, k):
+                        vr = valid[i, 0]
+                        vc = valid[i, 1]
+                        key = abs(vr - tr) + abs(vc - tc)
+                        j = i - 1
+                        while j >= 0 and abs(valid[j, 0] - tr) + abs(valid[j, 1] - tc) > key:
+                            valid[j + 1, 0] = valid[j, 0]
+                            valid[j + 1, 1] = valid[j, 1]
+                            j -= 1
+                        valid[j + 1, 0] = vr
+                        valid[j + 1, 1] = vc
+
+                u = 0
+                for i in range(k):
+                    if visited[valid[i, 0], valid[i, 1]] != stamp:
+                        unvisited[u, 0] = valid[i, 0]
+                        unvisited[u, 1] = valid[i, 1]
+                        u += 1
+
+                if u > 0:
+                    pick = 0 if rng.random() < 0.8 else rng.integers(0, u)
+                    r = unvisited[pick, 0]
+                    c = unvisited[pick, 1]
+                else:
+                    pick = rng.integers(0, k)
+                    r = valid[pick, 0]
+                    c = valid[pick, 1]
+
+        return heatmap, completions, solve_steps[:completions]
+
 
 def simulate_visitor_flow(
     walls: BaseGeometry,
@@ -49,36 +250,15 @@ def simulate_visitor_flow(
             "resolution": float,
         }
     """
-    if seed is not None:
-        random.seed(seed)
-
     if not entrances or not exits:
         return {"error": "Need at least one entrance and one exit"}
 
     minx, miny, maxx, maxy = field_boundary.bounds
-    cols = max(1, int((maxx - minx) / resolution))
-    rows = max(1, int((maxy - miny) / resolution))
-
-    # Build occupancy grid
-    grid = np.ones((rows, cols), dtype=bool)  # True = blocked
-
-    for r in range(rows):
-        for c in range(cols):
-            cx = minx + (c + 0.5) * resolution
-            cy = miny + (r + 0.5) * resolution
-            if field_boundary.contains(Point(cx, cy)):
-                grid[r, c] = False
-
-    if walls and not walls.is_empty:
-        wall_buffer = walls.buffer(resolution * 0.4)
-        for r in range(rows):
-            for c in range(cols):
-                if grid[r, c]:
-                    continue
-                cx = minx + (c + 0.5) * resolution
-                cy = miny + (r + 0.5) * resolution
-                if wall_buffer.contains(Point(cx, cy)):
-                    grid[r, c] = True
+
+    # Build occupancy grid (True = blocked)
+    walkable, _, _ = walkable_grid(walls, field_boundary, resolution)
+    grid = ~walkable
+    rows, cols = grid.shape
 
     def world_to_grid(x, y):
         c = max(0, min(int((x - minx) / resolution), cols - 1))
@@ -92,70 +272,37 @@ def simulate_visitor_flow(
     entrance_cells = [world_to_grid(x, y) for x, y in entrances]
     exit_cells = [world_to_grid(x, y) for x, y in exits]
 
-    # Heatmap: count visits per cell
-    heatmap = np.zeros((rows, cols), dtype=int)
-    solve_steps = []
-    completions = 0
     max_steps = rows * cols * 2
 
-    neighbors = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-
-    for v in range(num_visitors):
-        # Pick random entrance
-        start = random.choice(entrance_cells)
-        target_exit = random.choice(exit_cells)
-
-        # Random walk with exit-biased heuristic
-        r, c = start
-        visited = set()
-        steps = 0
-
-        while steps < max_steps:
-            heatmap[r, c] += 1
-            visited.add((r, c))
-            steps += 1
-
-            if (r, c) == target_exit or (r, c) in exit_cells:
-                completions += 1
-                solve_steps.append(steps)
-                break
-
-            # Get valid neighbors
-            valid = []
-            for dr, dc in neighbors:
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < rows and 0 <= nc < cols and not grid[nr, nc]:
-                    valid.append((nr, nc))
-
-            if not valid:
-                break
-
-            # Bias toward exit (70% chance to pick best direction)
-            if random.random() < 0.7 and len(valid) > 1:
-                valid.sort(key=lambda p: abs(p[0] - target_exit[0]) + abs(p[1] - target_exit[1]))
-
-            # Prefer unvisited cells
-            unvisited = [p for p in valid if p not in visited]
-            if unvisited:
-                if random.random() < 0.8:
-                    r, c = unvisited[0]
-                else:
-                    r, c = random.choice(unvisited)
-            else:
-                r, c = random.choice(valid)
+    # Walk the visitors (compiled when numba is available; the two paths
+    # consume the seeded generator differently, so a seed reproduces within
+    # one environment)
+    if _HAS_NUMBA:
+        heatmap, completions, solve_steps = _walk_visitors_jit(
+            _open_neighbors(grid).view(np.uint8),
+            DIRECTIONS,
+            np.array(entrance_cells, dtype=np.int64),
+            np.array(exit_cells, dtype=np.int64),
+            num_visitors,
+            max_steps,
+            np.random.default_rng(seed),
+        )
+        solve_steps = solve_steps.tolist()
+    else:
+        heatmap, completions, solve_steps = _walk_visitors_py(
+            grid, entrance_cells, exit_cells, num_visitors, max_steps, seed,
+        )
 
     # Find bottlenecks (top N cells by visit count)
     threshold = np.percentile(heatmap[heatmap > 0], 90) if heatmap.any() else 0
     bottlenecks = []
-    for r in range(rows):
-        for c in range(cols):
-            if heatmap[r, c] >= threshold and heatmap[r, c] > 0:
-                wx, wy = grid_to_world(r, c)
-                bottlenecks.append({
-                    "x": round(wx, 2),
-                    "y": round(wy, 2),
-                    "visits": int(heatmap[r, c]),
-                })
+    for r, c in np.argwhere((heatmap >= threshold) & (heatmap > 0)):
+        wx, wy = grid_to_world(int(r), int(c))
+        bottlenecks.append({
+            "x": round(wx, 2),
+            "y": round(wy, 2),
+            "visits": int(heatmap[r, c]),
+        })
 
     # Sort by visits descending, limit to top 20
     bottlenecks.sort(key=lambda b: b["visits"], reverse=True)
@@ -169,5 +316,5 @@ def simulate_visitor_flow(
         "bounds": {"minx": minx, "miny": miny, "maxx": maxx, "maxy": maxy},
         "resolution": resolution,
         "total_visitors": num_visitors,
-        "completed": completions,
+        "completed": int(completions),
     }
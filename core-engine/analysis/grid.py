@@ -0,0 +1,240 @@
+"""
+Cell-grid helpers shared by the grid-based analyses.
+
+Pathfinding, emergency-exit coverage and flow simulation all sample the
+field on the same regular grid of cell centres.  walkable_grid() builds
+that grid once for all of them, testing cells in a single vectorized pass
+instead of one GEOS call per cell.  Polygonal masks are rasterized with an
+even-odd scanline fill over the polygon's edges, so GEOS is not consulted
+per cell at all.
+"""
+
+import numpy as np
+import shapely
+from shapely.geometry.base import BaseGeometry
+from typing import Tuple
+
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:  # numba is optional; the NumPy scanline fill is used instead
+    _HAS_NUMBA = False
+
+# Grids with fewer cells are swept on one thread; below this the thread
+# pool start-up costs more than the parallel sweep saves.
+PARALLEL_FILL_MIN_CELLS = 250_000
+
+
+def cell_centers(
+    minx: float,
+    miny: float,
+    rows: int,
+    cols: int,
+    resolution: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    World coordinates of every cell centre.
+
+    Returns:
+        (xs, ys) arrays of shape (rows, cols); cell [r, c] is centred on
+        (minx + (c + 0.5) * resolution, miny + (r + 0.5) * resolution).
+    """
+    cx = minx + (np.arange(cols) + 0.5) * resolution
+    cy = miny + (np.arange(rows) + 0.5) * resolution
+    return np.meshgrid(cx, cy)
+
+
+def inside_mask(
+    geom: BaseGeometry,
+    xs: np.ndarray,
+    ys: np.ndarray,
+) -> np.ndarray:
+    """
+    Test which points lie strictly inside *geom*.
+
+    Points outside the geometry's bounding box are rejected with plain
+    array comparisons; only the survivors go to GEOS, in one call against
+    the prepared geometry.  The prepared index stays attached to *geom*,
+    so later masks over the same geometry reuse it.
+
+    Returns:
+        Boolean array with the shape of *xs*, True where geom contains the point.
+    """
+    mask = np.zeros(xs.shape, dtype=bool)
+    if geom is None or geom.is_empty:
+        return mask
+
+    bminx, bminy, bmaxx, bmaxy = geom.bounds
+    candidates = (xs > bminx) & (xs < bmaxx) & (ys > bminy) & (ys < bmaxy)
+    shapely.prepare(geom)
+    mask[candidates] = shapely.contains_xy(geom, xs[candidates], ys[candidates])
+    return mask
+
+
+def _ring_edges(geom: BaseGeometry) -> np.ndarray:
+    """
+    Every ring edge of a (Multi)Polygon as an (N, 4) array of x0, y0, x1, y1.
+    """
+    rings = shapely.get_rings(shapely.get_parts(geom))
+    coords, index = shapely.get_coordinates(rings, return_index=True)
+    same_ring = index[1:] == index[:-1]
+    return np.hstack([coords[:-1][same_ring], coords[1:][same_ring]])
+
+
+def polygon_mask(
+    geom: BaseGeometry,
+    minx: float,
+    miny: float,
+    rows: int,
+    cols: int,
+    resolution: float,
+) -> np.ndarray:
+    """
+    Rasterize a (Multi)Polygon onto the cell grid of cell_centers().
+
+    Each edge is intersected with the scanlines through the cell centres it
+    spans (half-open in y, so shared vertices are counted once).  A cell is
+    inside when an odd number of crossings lie to its left, which handles
+    holes and multi-part polygons without GEOS.  With numba installed the
+    fill is compiled, and grids of PARALLEL_FILL_MIN_CELLS or more are
+    swept in parallel.  Cells centred exactly on the boundary may be
+    classified either way, unlike contains_xy().
+
+    Returns:
+        Boolean array of shape (rows, cols).
+    """
+    if geom is None or geom.is_empty:
+        return np.zeros((rows, cols), dtype=bool)
+
+    x0, y0, x1, y1 = _ring_edges(geom).T
+    sloped = y0 != y1
+    x0, y0, x1, y1 = (np.ascontiguousarray(a[sloped]) for a in (x0, y0, x1, y1))
+
+    # Scanline r passes through y = miny + (r + 0.5) * resolution; an edge
+    # covers the scanlines with ylo <= y < yhi.  Vertices shared by two edges
+    # go through the same expression, so exactly one of them claims the row.
+    first = np.ceil((np.minimum(y0, y1) - miny) / resolution - 0.5).astype(np.intp)
+    stop = np.ceil((np.maximum(y0, y1) - miny) / resolution - 0.5).astype(np.intp)
+    first = np.clip(first, 0, rows)
+    stop = np.clip(stop, 0, rows)
+
+    if _HAS_NUMBA:
+        return _scanline_fill_jit(x0, y0, x1, y1, first, stop, minx, miny, resolution, rows, cols)
+    return _scanline_fill(x0, y0, x1, y1, first, stop, minx, miny, resolution, rows, cols)
+
+
+def _scanline_fill(x0, y0, x1, y1, first, stop, minx, miny, resolution, rows, cols):
+    """NumPy even-odd fill of the scanline crossings described in polygon_mask()."""
+    counts = np.maximum(stop - first, 0)
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros((rows, cols), dtype=bool)
+
+    edge = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.cumsum(counts) - counts
+    row = first[edge] + (np.arange(total) - np.repeat(offsets, counts))
+    cy = miny + (row + 0.5) * resolution
+    cross_x = x0[edge] + (cy - y0[edge]) * (x1[edge] - x0[edge]) / (y1[edge] - y0[edge])
+
+    # Sort crossings by (row, x) with one key, then count the crossings left
+    # of every cell centre with a single searchsorted.
+    width = (cols + 2) * resolution
+    keys = np.sort(row * width + np.clip(cross_x - minx, -0.5 * resolution, width - 1.5 * resolution))
+    cx = (np.arange(cols) + 0.5) * resolution
+    cell_keys = np.arange(rows)[:, None] * width + cx[None, :]
+    row_start = np.searchsorted(keys, np.arange(rows) * width - resolution)
+    left = np.searchsorted(keys, cell_keys.ravel()).reshape(rows, cols) - row_start[:, None]
+    return (left & 1).astype(bool)
+
+
+if _HAS_NUMBA:
+    # Compiled lazily on first use (and cached on disk) rather than from
+    # explicit signatures, so importing this module stays cheap.
+    @njit(cache=True)
+    def _bucket_crossings_jit(x0, y0, x1, y1, first, stop, minx, miny, resolution, rows):
+        # Same crossings as _scanline_fill, bucketed by scanline with a
+        # counting pass.  Returns (crossings, row_start).
+        row_start = np.zeros(rows + 1, dtype=np.intp)
+        for e in range(x0.shape[0]):
+            for r in range(first[e], stop[e]):
+                row_start[r + 1] += 1
+        for r in range(rows):
+            row_start[r + 1] += row_start[r]
+
+        crossings = np.empty(row_start[rows])
+        fill = row_start[:rows].copy()
+        for e in range(x0.shape[0]):
+            for r in range(first[e], stop[e]):
+                cy = miny + (r + 0.5) * resolution
+                crossings[fill[r]] = x0[e] + (cy - y0[e]) * (x1[e] - x0[e]) / (y1[e] - y0[e]) - minx
+                fill[r] += 1
+        return crossings, row_start
+
+    @njit(cache=True)
+    def _sweep_row_jit(crossings, resolution, out):
+        # Sort one scanline's crossings, then sweep its cells
+        row = np.sort(crossings)
+        n = row.shape[0]
+        k = 0
+        for c in range(out.shape[0]):
+            cx = (c + 0.5) * resolution
+            while k < n and row[k] < cx:
+                k += 1
+            out[c] = (k & 1) == 1
+
+    @njit(cache=True)
+    def _sweep_rows_jit(crossings, row_start, resolution, mask):
+        for r in range(mask.shape[0]):
+            _sweep_row_jit(crossings[row_start[r]:row_start[r + 1]], resolution, mask[r])
+
+    @njit(parallel=True, cache=True)
+    def _sweep_rows_parallel_jit(crossings, row_start, resolution, mask):
+        for r in prange(mask.shape[0]):
+            _sweep_row_jit(crossings[row_start[r]:row_start[r + 1]], resolution, mask[r])
+
+    def _scanline_fill_jit(x0, y0, x1, y1, first, stop, minx, miny, resolution, rows, cols):
+        """Compiled fill of the scanline crossings, threaded on large grids."""
+        crossings, row_start = _bucket_crossings_jit(
+            x0, y0, x1, y1, first, stop, minx, miny, resolution, rows
+        )
+        mask = np.zeros((rows, cols), dtype=bool)
+        if rows * cols >= PARALLEL_FILL_MIN_CELLS:
+            _sweep_rows_parallel_jit(crossings, row_start, resolution, mask)
+        else:
+            _sweep_rows_jit(crossings, row_start, resolution, mask)
+        return mask
+
+
+def walkable_grid(
+    walls: BaseGeometry,
+    field_boundary: BaseGeometry,
+    resolution: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rasterize the field into walkable cells.
+
+    The grid is anchored at the boundary's lower-left bounds corner with
+    max(1, int(extent / resolution)) cells per axis.  A cell is walkable
+    when its centre lies inside the field boundary and outside the walls
+    buffered by 0.4 * resolution.
+
+    Returns:
+        (walkable, xs, ys) arrays of shape (rows, cols): the walkable mask
+        and the cell-centre coordinates.
+    """
+    minx, miny, maxx, maxy = field_boundary.bounds
+    cols = max(1, int((maxx - minx) / resolution))
+    rows = max(1, int((maxy - miny) / resolution))
+
+    xs, ys = cell_centers(minx, miny, rows, cols, resolution)
+    def mask(geom):
+        if geom.geom_type in ("Polygon", "MultiPolygon"):
+            return polygon_mask(geom, minx, miny, rows, cols, resolution)
+        return inside_mask(geom, xs, ys)
+
+    walkable = mask(field_boundary)
+
+    if walls is not None and not walls.is_empty:
+        walkable &= ~mask(walls.buffer(resolution * 0.4))
+
+    return walkable, xs, ys
@@ -8,10 +8,24 @@ and path complexity metrics.
 import heapq
 import math
 import numpy as np
-from shapely.geometry import Point
 from shapely.geometry.base import BaseGeometry
 from typing import List, Tuple, Optional
 
+from .grid import walkable_grid
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:  # numba is optional; the heapq search is used instead
+    _HAS_NUMBA = False
+
+# 8-directional moves in the order the search expands them
+_MOVES = [
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1),           (0, 1),
+    (1, -1),  (1, 0),  (1, 1),
+]
+
 
 def _rasterize_walls(
     walls: BaseGeometry,
@@ -25,36 +39,32 @@ def _rasterize_walls(
         (grid, minx, miny, grid_cols, grid_rows)
         grid[row][col] is True if that cell is blocked by a wall.
     """
-    minx, miny, maxx, maxy = field_boundary.bounds
-    grid_cols = max(1, int((maxx - minx) / resolution))
-    grid_rows = max(1, int((maxy - miny) / resolution))
-
-    # Start with everything blocked (outside boundary)
-    grid = np.ones((grid_rows, grid_cols), dtype=bool)
-
-    # Mark cells inside the boundary as open
-    for r in range(grid_rows):
-        for c in range(grid_cols):
-            cx = minx + (c + 0.5) * resolution
-            cy = miny + (r + 0.5) * resolution
-            if field_boundary.contains(Point(cx, cy)):
-                grid[r, c] = False
-
-    # Buffer walls slightly and mark overlapping cells as blocked
-    if walls is not None and not walls.is_empty:
-        wall_buffer = walls.buffer(resolution * 0.4)
-        for r in range(grid_rows):
-            for c in range(grid_cols):
-                if grid[r, c]:
-                    continue
-                cx = minx + (c + 0.5) * resolution
-                cy = miny + (r + 0.5) * resolution
-                if wall_buffer.contains(Point(cx, cy)):
-                    grid[r, c] = True
+    walkable, _, _ = walkable_grid(walls, field_boundary, resolution)
+    minx, miny, _, _ = field_boundary.bounds
+    grid_rows, grid_cols = walkable.shape
+    grid = ~walkable
 
     return grid, minx, miny, grid_cols, grid_rows
 
 
+def _nearest_open(grid: np.ndarray, rc: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+    """
+    Return *rc* if it is open, else the first open cell on growing square
+    rings around it, or None if the grid has no open cell.
+    """
+    r, c = rc
+    if not grid[r, c]:
+        return rc
+    grid_rows, grid_cols = grid.shape
+    for radius in range(1, max(grid_rows, grid_cols)):
+        for dr in range(-radius, radius + 1):
+            for dc in range(-radius, radius + 1):
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < grid_rows and 0 <= nc < grid_cols and not grid[nr, nc]:
+                    return nr, nc
+    return None
+
+
 def find_path(
     walls: BaseGeometry,
     start: Tuple[float, float],
@@ -87,81 +97,211 @@ def find_path(
     def grid_to_world(r: int, c: int) -> Tuple[float, float]:
         return minx + (c + 0.5) * resolution, miny + (r + 0.5) * resolution
 
-    start_rc = world_to_grid(start[0], start[1])
-    goal_rc = world_to_grid(goal[0], goal[1])
-
-    # If start or goal is in a wall, find nearest open cell
-    for target_name, target_rc in [("start", start_rc), ("goal", goal_rc)]:
-        r, c = target_rc
-        if grid[r, c]:
-            found = False
-            for radius in range(1, max(grid_rows, grid_cols)):
-                for dr in range(-radius, radius + 1):
-                    for dc in range(-radius, radius + 1):
-                        nr, nc = r + dr, c + dc
-                        if 0 <= nr < grid_rows and 0 <= nc < grid_cols and not grid[nr, nc]:
-                            if target_name == "start":
-                                start_rc = (nr, nc)
-                            else:
-                                goal_rc = (nr, nc)
-                            found = True
-                            break
-                    if found:
-                        break
-                if found:
-                    break
-            if not found:
-                return None
+    start_rc = _nearest_open(grid, world_to_grid(start[0], start[1]))
+    goal_rc = _nearest_open(grid, world_to_grid(goal[0], goal[1]))
+    if start_rc is None or goal_rc is None:
+        return None
+
+    # A* with 8-directional movement.  The grid is padded with a blocked
+    # border so neighbour lookups need no bounds checks, and cells are packed
+    # as r * cols + c (padded) so scores live in flat preallocated arrays.
+    pcols = grid_cols + 2
+    padded = np.pad(grid, 1, constant_values=True).ravel()
+
+    def pack(rc: Tuple[int, int]) -> int:
+        return (rc[0] + 1) * pcols + rc[1] + 1
 
-    # A* with 8-directional movement
-    def heuristic(rc: Tuple[int, int]) -> float:
-        return math.sqrt((rc[0] - goal_rc[0]) ** 2 + (rc[1] - goal_rc[1]) ** 2)
+    def unpack_world(node: int) -> Tuple[float, float]:
+        r, c = divmod(node, pcols)
+        return grid_to_world(r - 1, c - 1)
 
-    open_set = []
-    heapq.heappush(open_set, (heuristic(start_rc), 0.0, start_rc))
-    came_from = {}
-    g_score = {start_rc: 0.0}
+    if _HAS_NUMBA:
+        nodes = _astar_jit(padded.view(np.uint8), pcols, pack(start_rc), pack(goal_rc)).tolist()
+    else:
+        nodes = _astar_py(padded.tolist(), pcols, pack(start_rc), pack(goal_rc))
+    if not nodes:
+        return None
+    return [unpack_world(node) for node in nodes]
 
+
+def _astar_py(blocked: List[bool], pcols: int, start: int, goal: int) -> List[int]:
+    """
+    A* over a padded, flattened grid.
+
+    Returns:
+        Packed cells from start to goal, or an empty list if goal is unreachable.
+    """
+    goal_r, goal_c = divmod(goal, pcols)
+
+    def heuristic(node: int) -> float:
+        r, c = divmod(node, pcols)
+        return math.sqrt((r - goal_r) ** 2 + (c - goal_c) ** 2)
+
+    g_score = [math.inf] * len(blocked)
+    came_from = [-1] * len(blocked)
+    g_score[start] = 0.0
+
+    open_set = [(heuristic(start), 0.0, start)]
+
+    diag_cost = math.sqrt(2)
     neighbors_offsets = [
-        (-1, -1), (-1, 0), (-1, 1),
-        (0, -1),           (0, 1),
-        (1, -1),  (1, 0),  (1, 1),
+        (dr * pcols + dc, diag_cost if (dr != 0 and dc != 0) else 1.0)
+        for dr, dc in _MOVES
     ]
-    diag_cost = math.sqrt(2)
 
     while open_set:
         _, current_g, current = heapq.heappop(open_set)
 
-        if current == goal_rc:
-            path = []
-            node = current
-            while node in came_from:
-                path.append(grid_to_world(node[0], node[1]))
-                node = came_from[node]
-            path.append(grid_to_world(node[0], node[1]))
+        if current == goal:
+            path = [current]
+            while current != start:
+                current = came_from[current]
+                path.append(current)
             path.reverse()
             return path
 
-        if current_g > g_score.get(current, float('inf')):
+        if current_g > g_score[current]:
             continue
 
-        for dr, dc in neighbors_offsets:
-            nr, nc = current[0] + dr, current[1] + dc
-            if not (0 <= nr < grid_rows and 0 <= nc < grid_cols):
-                continue
-            if grid[nr, nc]:
+        for offset, move_cost in neighbors_offsets:
+            neighbor = current + offset
+            if blocked[neighbor]:
                 continue
 
-            move_cost = diag_cost if (dr != 0 and dc != 0) else 1.0
             tentative_g = current_g + move_cost
-            neighbor = (nr, nc)
-
-            if tentative_g < g_score.get(neighbor, float('inf')):
+            if tentative_g < g_score[neighbor]:
                 g_score[neighbor] = tentative_g
                 came_from[neighbor] = current
                 heapq.heappush(open_set, (tentative_g + heuristic(neighbor), tentative_g, neighbor))
 
-    return None
+    return []
+
+
+if _HAS_NUMBA:
+    # Compiled on first use and cached on disk, so importing this module
+    # does not wait on numba
+    @njit(cache=True)
+    def _astar_jit(blocked, pcols, start, goal):
+        # Same search as _astar_py.  The open set is a binary heap over
+        # parallel (f, g, node) arrays ordered like heapq's tuples, so cells
+        # are expanded in the same order and the same path is returned.
+        n = blocked.shape[0]
+        goal_r = goal // pcols
+        goal_c = goal % pcols
+
+        offsets = np.empty(8, dtype=np.int64)
+        costs = np.empty(8, dtype=np.float64)
+        k = 0
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                if dr == 0 and dc == 0:
+                    continue
+                offsets[k] = dr * pcols + dc
+                costs[k] = math.sqrt(2) if (dr != 0 and dc != 0) else 1.0
+                k += 1
+
+        g_score = np.full(n, np.inf)
+        came_from = np.full(n, -1, dtype=np.int64)
+        g_score[start] = 0.0
+
+        cap = 1024
+        heap_f = np.empty(cap)
+        heap_g = np.empty(cap)
+        heap_n = np.empty(cap, dtype=np.int64)
+        r = start // pcols - goal_r
+        c = start % pcols - goal_c
+        heap_f[0] = math.sqrt(r * r + c * c)
+        heap_g[0] = 0.0
+        heap_n[0] = start
+        size = 1
+
+        while size > 0:
+            current_g = heap_g[0]
+            current = heap_n[0]
+
+            # Pop: move the last entry to the root and sift it down
+            size -= 1
+            f = heap_f[size]
+            g = heap_g[size]
+            node = heap_n[size]
+            i = 0
+            while True:
+                child = 2 * i + 1
+                if child >= size:
+                    break
+                if child + 1 < size and (
+                    heap_f[child + 1] < heap_f[child]
+                    or (heap_f[child + 1] == heap_f[child]
+                        and (heap_g[child + 1] < heap_g[child]
+                             or (heap_g[child + 1] == heap_g[child] and heap_n[child + 1] < heap_n[child])))
+                ):
+                    child += 1
+                if heap_f[child] < f or (heap_f[child] == f and (
+                        heap_g[child] < g or (heap_g[child] == g and heap_n[child] < node))):
+                    heap_f[i] = heap_f[child]
+                    heap_g[i] = heap_g[child]
+                    heap_n[i] = heap_n[child]
+                    i = child
+                else:
+                    break
+            heap_f[i] = f
+            heap_g[i] = g
+            heap_n[i] = node
+
+            if current == goal:
+                length = 1
+                node = current
+                while node != start:
+                    node = came_from[node]
+                    length += 1
+                path = np.empty(length, dtype=np.int64)
+                node = current
+                for j in range(length - 1, -1, -1):
+                    path[j] = node
+                    node = came_from[node]
+                return path
+
+            if current_g > g_score[current]:
+                continue
+
+            for k in range(8):
+                neighbor = current + offsets[k]
+                if blocked[neighbor]:
+                    continue
+
+                tentative_g = current_g + costs[k]
+                if tentative_g < g_score[neighbor]:
+                    g_score[neighbor] = tentative_g
+                    came_from[neighbor] = current
+                    r = neighbor // pcols - goal_r
+                    c = neighbor % pcols - goal_c
+                    f = tentative_g + math.sqrt(r * r + c * c)
+
+                    if size == cap:
+                        cap *= 2
+                        heap_f = np.concatenate((heap_f, np.empty(cap - size)))
+                        heap_g = np.concatenate((heap_g, np.empty(cap - size)))
+                        heap_n = np.concatenate((heap_n, np.empty(cap - size, dtype=np.int64)))
+
+                    # Push: sift the new entry up from the end
+                    i = size
+                    size += 1
+                    while i > 0:
+                        parent = (i - 1) // 2
+                        if f < heap_f[parent] or (f == heap_f[parent] and (
+                                tentative_g < heap_g[parent]
+                                or (tentative_g == heap_g[parent] and neighbor < heap_n[parent]))):
+                            heap_f[i] = heap_f[parent]
+                            heap_g[i] = heap_g[parent]
+                            heap_n[i] = heap_n[parent]
+                            i = parent
+                        else:
+                            break
+                    heap_f[i] = f
+                    heap_g[i] = tentative_g
+                    heap_n[i] = neighbor
+
+        return np.empty(0, dtype=np.int64)
 
 
 def is_solvable(
@@ -173,9 +313,77 @@ def is_solvable(
 ) -> bool:
     """
     Check if maze has a solution path from entrance to exit.
+
+    Only connectivity matters here, so with numba installed the open cells
+    are grouped into 8-connected components with a union-find and the two
+    endpoints compared, instead of searching for a path.
     """
-    path = find_path(walls, entrance, exit_point, field_boundary, resolution)
-    return path is not None
+    if not _HAS_NUMBA:
+        path = find_path(walls, entrance, exit_point, field_boundary, resolution)
+        return path is not None
+
+    grid, minx, miny, grid_cols, grid_rows = _rasterize_walls(
+        walls, field_boundary, resolution
+    )
+
+    def world_to_grid(x: float, y: float) -> Tuple[int, int]:
+        c = max(0, min(int((x - minx) / resolution), grid_cols - 1))
+        r = max(0, min(int((y - miny) / resolution), grid_rows - 1))
+        return r, c
+
+    start_rc = _nearest_open(grid, world_to_grid(entrance[0], entrance[1]))
+    goal_rc = _nearest_open(grid, world_to_grid(exit_point[0], exit_point[1]))
+    if start_rc is None or goal_rc is None:
+        return False
+
+    pcols = grid_cols + 2
+    padded = np.pad(grid, 1, constant_values=True).ravel()
+    labels = _component_roots_jit(padded.view(np.uint8), pcols)
+    start = (start_rc[0] + 1) * pcols + start_rc[1] + 1
+    goal = (goal_rc[0] + 1) * pcols + goal_rc[1] + 1
+    return bool(labels[start] == labels[goal])
+
+
+if _HAS_NUMBA:
+    # Compiled on first use, like _astar_jit
+    @njit(cache=True)
+    def _component_roots_jit(blocked, pcols):
+        # Union-find with union by size and path halving over the padded grid.
+        # Each open cell is joined to its open east, south-west, south and
+        # south-east neighbours, which covers all 8-connected pairs once.
+        n = blocked.shape[0]
+        parent = np.arange(n)
+        size = np.ones(n, dtype=np.int64)
+        offsets = (1, pcols - 1, pcols, pcols + 1)
+
+        for a in range(n - pcols - 1):
+            if blocked[a]:
+                continue
+            for k in range(4):
+                b = a + offsets[k]
+                if blocked[b]:
+                    continue
+                ra = a
+                while parent[ra] != ra:
+                    parent[ra] = parent[parent[ra]]
+                    ra = parent[ra]
+                rb = b
+                while parent[rb] != rb:
+                    parent[rb] = parent[parent[rb]]
+                    rb = parent[rb]
+                if ra == rb:
+                    continue
+                if size[ra] < size[rb]:
+                    ra, rb = rb, ra
+                parent[rb] = ra
+                size[ra] += size[rb]
+
+        for a in range(n):
+            root = a
+            while parent[root] != root:
+                root = parent[root]
+            parent[a] = root
+        return parent
 
 
 def calculate_path_length(path: List[Tuple[float, float]]) -> float:
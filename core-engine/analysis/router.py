@@ -397,8 +397,7 @@ def import_mazegps_data(req: MazeGPSImportRequest):
         raise HTTPException(status_code=400, detail={"error": "No CRS set"})
 
     try:
-        import pyproj
-        transformer = pyproj.Transformer.from_crs("EPSG:4326", crs, always_xy=True)
+        transformer = app_state.get_gps_transformer()
         cx, cy = offset
 
         # Convert GPS positions to design coordinates
@@ -448,9 +447,11 @@ def compute_planter_grid(req: PlanterGridRequest):
     Headland rows follow the field boundary contour (concentric rings).
     Interior rows are straight parallel lines at the planting direction.
     """
+    import numpy as np
+    import shapely
     from shapely.geometry import LineString, Polygon
     from shapely.ops import unary_union
-    from geometry.operations import smooth_buffer
+    from geometry.operations import smooth_buffer, headland_area
     import math
 
     field = app_state.get_field()
@@ -465,31 +466,32 @@ def compute_planter_grid(req: PlanterGridRequest):
         # === HEADLAND ROWS ===
         # Each individual corn row in the headland follows the field boundary contour.
         # Total headland corn rows = headlands * planter_rows
-        headland_lines = []
-        headland_geom_lines = []  # Shapely LineStrings for carving
         total_headland_rows = req.headlands * req.planter_rows
 
-        for i in range(total_headland_rows):
-            # Offset from boundary edge: first row at half-spacing, then each row_spacing
-            offset = row_spacing_m * (i + 0.5)
-            ring = smooth_buffer(field, -offset)
-
-            if ring.is_empty or ring.area <= 0:
-                break
-
-            # Handle MultiPolygon from buffer
-            if ring.geom_type == 'MultiPolygon':
-                polys = sorted(ring.geoms, key=lambda g: g.area, reverse=True)
-            else:
-                polys = [ring]
-
-            for poly in polys:
-                if poly.area <= 0:
-                    continue
-                coords = [[round(c[0], 4), round(c[1], 4)] for c in poly.exterior.coords]
-                if len(coords) >= 3:
-                    headland_lines.append(coords)
-                    headland_geom_lines.append(LineString(poly.exterior.coords))
+        # Offset from boundary edge: first row at half-spacing, then each
+        # row_spacing.  All rings are buffered in one vectorized call and cut
+        # off at the first offset that collapses the field.
+        ring_offsets = row_spacing_m * (np.arange(total_headland_rows) + 0.5)
+        rings = smooth_buffer(field, -ring_offsets)
+        collapsed = shapely.is_empty(rings) | (shapely.area(rings) <= 0)
+        if collapsed.any():
+            rings = rings[:int(np.argmax(collapsed))]
+
+        # Each ring part (largest first for a MultiPolygon buffer) becomes one row
+        polys = [
+            poly
+            for ring in rings
+            for poly in sorted(shapely.get_parts(ring), key=lambda g: g.area, reverse=True)
+            if poly.area > 0
+        ]
+        ring_coords, ring_index = shapely.get_coordinates(
+            shapely.get_exterior_ring(np.asarray(polys, dtype=object)), return_index=True
+        )
+        # Shapely LineStrings for carving, plus rounded coordinates for the UI
+        headland_geom_lines = list(shapely.linestrings(ring_coords, indices=ring_index))
+        rounded = np.round(ring_coords, 4).tolist()
+        ends = np.cumsum(np.bincount(ring_index, minlength=len(polys))).tolist()
+        headland_lines = [rounded[i:j] for i, j in zip([0] + ends[:-1], ends)]
 
         # Store headland rows as geometry so carving can operate on them
         if headland_geom_lines:
@@ -498,16 +500,8 @@ def compute_planter_grid(req: PlanterGridRequest):
             app_state.set_headland_walls(None)
 
         # === HEADLAND BOUNDARY (innermost edge of headland area) ===
-        headland_poly = None
-        planting_area = field
-        if headland_inset > 0:
-            inset = smooth_buffer(field, -headland_inset)
-            if not inset.is_empty and inset.area > 0:
-                if inset.geom_type == 'MultiPolygon':
-                    planting_area = max(inset.geoms, key=lambda g: g.area)
-                else:
-                    planting_area = inset
-                headland_poly = planting_area
+        headland_poly = headland_area(field, headland_inset)
+        planting_area = headland_poly if headland_poly is not None else field
 
         # === INTERIOR ROWS ===
         # Straight parallel lines at the planting direction, clipped to the headland boundary
@@ -531,30 +525,43 @@ def compute_planter_grid(req: PlanterGridRequest):
         num_steps = int(2 * half_diag / row_spacing_m) + 1
         start_offset = -half_diag
 
-        interior_lines = []
-        for i in range(num_steps):
-            offset = start_offset + i * row_spacing_m
-            px = cx + offset * perp_x
-            py = cy + offset * perp_y
-            x1 = px - half_diag * dir_x
-            y1 = py - half_diag * dir_y
-            x2 = px + half_diag * dir_x
-            y2 = py + half_diag * dir_y
-
-            line = LineString([(x1, y1), (x2, y2)])
-            clipped = line.intersection(planting_area)
-
-            if clipped.is_empty:
-                continue
-
-            if clipped.geom_type == 'LineString' and len(clipped.coords) >= 2:
-                coords = [[round(c[0], 4), round(c[1], 4)] for c in clipped.coords]
-                interior_lines.append(coords)
-            elif clipped.geom_type == 'MultiLineString':
-                for segment in clipped.geoms:
-                    if len(segment.coords) >= 2:
-                        coords = [[round(c[0], 4), round(c[1], 4)] for c in segment.coords]
-                        interior_lines.append(coords)
+        # Rows whose offset falls outside the planting area's bounding box
+        # (projected onto the stepping direction) cannot intersect it
+        corner_offsets = [
+            (x - cx) * perp_x + (y - cy) * perp_y
+            for x in (minx, maxx) for y in (miny, maxy)
+        ]
+        first_step = max(0, math.floor((min(corner_offsets) - start_offset) / row_spacing_m))
+        last_step = min(num_steps - 1, math.ceil((max(corner_offsets) - start_offset) / row_spacing_m))
+
+        # Build every candidate row in one batch: (N, 2, 2) endpoint array
+        offsets = start_offset + np.arange(first_step, last_step + 1) * row_spacing_m
+        px = cx + offsets * perp_x
+        py = cy + offsets * perp_y
+        row_coords = np.empty((len(offsets), 2, 2))
+        row_coords[:, 0, 0] = px - half_diag * dir_x
+        row_coords[:, 0, 1] = py - half_diag * dir_y
+        row_coords[:, 1, 0] = px + half_diag * dir_x
+        row_coords[:, 1, 1] = py + half_diag * dir_y
+        lines = shapely.linestrings(row_coords)
+
+        # Prepared once so the intersects filter is cheap; only rows that
+        # reach the planting area are clipped, in one vectorized call
+        shapely.prepare(planting_area)
+        lines = lines[shapely.intersects(planting_area, lines)]
+        clipped = shapely.intersection(lines, planting_area)
+
+        # Keep line results only, split multi-part rows into their segments
+        line_types = np.isin(
+            shapely.get_type_id(clipped),
+            [shapely.GeometryType.LINESTRING, shapely.GeometryType.MULTILINESTRING],
+        )
+        segments = shapely.get_parts(clipped[line_types])
+        segments = segments[shapely.get_num_coordinates(segments) >= 2]
+
+        seg_coords = np.round(shapely.get_coordinates(segments), 4).tolist()
+        ends = np.cumsum(shapely.get_num_coordinates(segments)).tolist()
+        interior_lines = [seg_coords[i:j] for i, j in zip([0] + ends[:-1], ends)]
 
         # Headland boundary polygon coordinates
         headland_boundary_coords = None
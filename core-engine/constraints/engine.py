@@ -11,13 +11,42 @@ Validates maze designs against real-world constraints:
 """
 
 import math
+from collections import OrderedDict
 from typing import List, Dict, Tuple, Optional
 
 import numpy as np
-from shapely.geometry import Point, LineString, MultiLineString
+import shapely
+from shapely.geometry import LineString, MultiLineString
 from shapely.geometry.base import BaseGeometry
 from shapely.ops import nearest_points
 
+# Field insets used by check_edge_buffer(), most recently used last.
+EDGE_INSET_CACHE_SIZE: int = 8
+_edge_inset_cache: "OrderedDict" = OrderedDict()
+
+
+def _edge_inset(field_boundary: BaseGeometry, edge_buffer: float) -> BaseGeometry:
+    """
+    The field shrunk by *edge_buffer*, prepared and cached per (field object, buffer).
+
+    Validation re-runs against the same stored field, while the router builds
+    a fresh ConstraintEngine per request, so the cache lives at module level.
+    """
+    key = (id(field_boundary), edge_buffer)
+    cached = _edge_inset_cache.get(key)
+    # The field is stored alongside so a recycled id() can't return a stale hit
+    if cached is not None and cached[0] is field_boundary:
+        _edge_inset_cache.move_to_end(key)
+        return cached[1]
+
+    inset = field_boundary.buffer(-edge_buffer)
+    shapely.prepare(inset)
+
+    _edge_inset_cache[key] = (field_boundary, inset)
+    if len(_edge_inset_cache) > EDGE_INSET_CACHE_SIZE:
+        _edge_inset_cache.popitem(last=False)
+    return inset
+
 
 class ConstraintEngine:
     """
@@ -86,25 +115,34 @@ class ConstraintEngine:
 
         wall_buffer = walls.buffer(0.1)
 
-        for x in np.arange(minx + sample_resolution, maxx, sample_resolution):
-            for y in np.arange(miny + sample_resolution, maxy, sample_resolution):
-                pt = Point(x, y)
-                if not field_boundary.contains(pt):
-                    continue
-                if wall_buffer.contains(pt):
-                    continue  # Inside a wall, skip
-
-                # This is a path cell - check distance to nearest wall
-                dist = walls.distance(pt)
-                if dist < self.min_path_width / 2 and dist > 0.1:
-                    violations.append({
-                        "type": "path_too_narrow",
-                        "severity": "warning",
-                        "message": f"Path may be narrow: {dist*2:.1f}m wide (min {self.min_path_width}m)",
-                        "location": [round(x, 2), round(y, 2)],
-                        "actualValue": round(dist * 2, 2),
-                        "requiredValue": self.min_path_width,
-                    })
+        # Sample points in x-major order; the field and wall-buffer tests and
+        # the wall distances then run as single vectorized calls.
+        xs, ys = np.meshgrid(
+            np.arange(minx + sample_resolution, maxx, sample_resolution),
+            np.arange(miny + sample_resolution, maxy, sample_resolution),
+            indexing="ij",
+        )
+        xs, ys = xs.ravel(), ys.ravel()
+
+        keep = shapely.contains_xy(field_boundary, xs, ys)
+        xs, ys = xs[keep], ys[keep]
+        keep = ~shapely.contains_xy(wall_buffer, xs, ys)  # Inside a wall, skip
+        xs, ys = xs[keep], ys[keep]
+
+        # Path cells - check distance to nearest wall
+        shapely.prepare(walls)
+        dists = shapely.distance(walls, shapely.points(xs, ys))
+        narrow = (dists < self.min_path_width / 2) & (dists > 0.1)
+
+        for x, y, dist in zip(xs[narrow].tolist(), ys[narrow].tolist(), dists[narrow].tolist()):
+            violations.append({
+                "type": "path_too_narrow",
+                "severity": "warning",
+                "message": f"Path may be narrow: {dist*2:.1f}m wide (min {self.min_path_width}m)",
+                "location": [round(x, 2), round(y, 2)],
+                "actualValue": round(dist * 2, 2),
+                "requiredValue": self.min_path_width,
+            })
 
         # Limit violations to avoid overwhelming output
         return violations[:50]
@@ -157,10 +195,19 @@ class ConstraintEngine:
         if walls is None or walls.is_empty:
             return violations
 
-        inset = field_boundary.buffer(-self.edge_buffer)
+        inset = _edge_inset(field_boundary, self.edge_buffer)
         if inset.is_empty:
             return violations
 
+        # Walls lying strictly inside the inset cannot violate the buffer,
+        # so only the rest go through the difference
+        parts = shapely.get_parts(walls)
+        crossing = parts[~shapely.contains_properly(inset, parts)]
+        if len(crossing) == 0:
+            return violations
+        if len(crossing) < len(parts) and walls.geom_type == "MultiLineString":
+            walls = shapely.multilinestrings(crossing)
+
         # Check if any walls extend beyond the inset boundary
         outside = walls.difference(inset)
         if outside.is_empty:
@@ -218,32 +265,34 @@ class ConstraintEngine:
                 if geom.geom_type == 'LineString':
                     lines.append(geom)
 
+        if len(lines) < 2:
+            return violations
+
+        # Only pairs within the buffer distance can violate it; the tree
+        # finds them without testing every pair of walls
+        lines = np.asarray(lines, dtype=object)
+        tree = shapely.STRtree(lines)
+        left, right = tree.query(lines, predicate="dwithin", distance=self.inter_path_buffer)
+        pairs = left < right
+        left, right = left[pairs], right[pairs]
+        order = np.lexsort((right, left))
+        left, right = left[order], right[order]
+
         # Check pairs of nearby wall segments for thin buffer zones
-        checked = set()
-        for i, line_i in enumerate(lines):
-            for j, line_j in enumerate(lines):
-                if i >= j:
-                    continue
-                key = (min(i, j), max(i, j))
-                if key in checked:
-                    continue
-                checked.add(key)
-
-                dist = line_i.distance(line_j)
-                if 0 < dist < self.inter_path_buffer and dist > self.min_wall_width:
-                    pt1, pt2 = nearest_points(line_i, line_j)
-                    corn_rows = int(dist / self.corn_row_spacing)
-                    violations.append({
-                        "type": "inter_path_buffer",
-                        "severity": "warning",
-                        "message": f"Only {corn_rows} corn rows between paths ({dist:.1f}m). Need {int(self.inter_path_buffer / self.corn_row_spacing)} rows ({self.inter_path_buffer}m).",
-                        "location": [round((pt1.x + pt2.x) / 2, 2), round((pt1.y + pt2.y) / 2, 2)],
-                        "actualValue": round(dist, 2),
-                        "requiredValue": self.inter_path_buffer,
-                    })
+        dists = shapely.distance(lines[left], lines[right])
+        thin = (dists > 0) & (dists < self.inter_path_buffer) & (dists > self.min_wall_width)
 
-                if len(violations) >= 30:
-                    return violations
+        for i, j, dist in zip(left[thin][:30].tolist(), right[thin][:30].tolist(), dists[thin][:30].tolist()):
+            pt1, pt2 = nearest_points(lines[i], lines[j])
+            corn_rows = int(dist / self.corn_row_spacing)
+            violations.append({
+                "type": "inter_path_buffer",
+                "severity": "warning",
+                "message": f"Only {corn_rows} corn rows between paths ({dist:.1f}m). Need {int(self.inter_path_buffer / self.corn_row_spacing)} rows ({self.inter_path_buffer}m).",
+                "location": [round((pt1.x + pt2.x) / 2, 2), round((pt1.y + pt2.y) / 2, 2)],
+                "actualValue": round(dist, 2),
+                "requiredValue": self.inter_path_buffer,
+            })
 
         return violations
 
@@ -321,7 +321,7 @@ def export_maze_dxf(
     return {
         "success": True,
         "path": str(output_path),
-        "wall_count": wall_count,
+        "wall_count": 0,  # Corn-row walls are not exported (see docstring)
         "path_edge_count": path_edge_count,
         "centerline_count": centerline_count,
         "cut_path_polygon_count": cut_path_polygon_count,
@@ -7,6 +7,7 @@ that can be loaded into GPS receivers for field cutting.
 
 from pathlib import Path
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Dict, List, Tuple
 from xml.sax.saxutils import escape
 
@@ -24,8 +25,14 @@ def _uncenter_geometry(geom: BaseGeometry, centroid_offset: Tuple[float, float])
     return transform(lambda x, y: (x + cx, y + cy), geom)
 
 
+@lru_cache(maxsize=8)
+def _wgs84_transformer(source_crs: str) -> pyproj.Transformer:
+    """Source CRS -> WGS84 transformer, built once per CRS instead of per export."""
+    return pyproj.Transformer.from_crs(source_crs, "EPSG:4326", always_xy=True)
+
+
 def _reproject_to_wgs84(geom: BaseGeometry, source_crs: str) -> BaseGeometry:
-    transformer = pyproj.Transformer.from_crs(source_crs, "EPSG:4326", always_xy=True)
+    transformer = _wgs84_transformer(source_crs)
     return transform(transformer.transform, geom)
 
 
@@ -172,7 +179,7 @@ def export_cutting_guide_gpx(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_path = output_dir / f"{base_name}_{timestamp}.gpx"
 
-    transformer = pyproj.Transformer.from_crs(crs, "EPSG:4326", always_xy=True)
+    transformer = _wgs84_transformer(crs)
     cx, cy = centroid_offset
 
     # Waypoints for entrances and exits
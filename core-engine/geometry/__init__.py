@@ -13,6 +13,8 @@ from .validation import (
 
 from .operations import (
     flatten_geometry,
+    flatten_geometry_ragged,
+    lines_from_ragged,
     carve_path,
 )
 
@@ -21,5 +23,7 @@ __all__ = [
     "get_largest_polygon",
     "simplify_boundary",
     "flatten_geometry",
+    "flatten_geometry_ragged",
+    "lines_from_ragged",
     "carve_path",
 ]
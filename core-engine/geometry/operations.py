@@ -6,14 +6,28 @@ for maze path carving and wall modifications.
 """
 
 import math
+from collections import OrderedDict
+import numpy as np
+import shapely
 from shapely.geometry import LineString, MultiLineString, GeometryCollection
 from shapely.geometry.base import BaseGeometry
-from typing import List, Tuple, Optional
+from shapely.ops import unary_union
+from typing import Iterable, List, Tuple, Optional
 
 # ---------------------------------------------------------------------------
 # Curve-smoothing constants
 # ---------------------------------------------------------------------------
 
+# Geometries merged per unary_union call by union_chunked().
+UNION_CHUNK_SIZE: int = 256
+
+# Bits per axis of the Hilbert curve used to order geometries before a union.
+HILBERT_BITS: int = 16
+
+# Inset areas kept by headland_area(), most recently used last.
+HEADLAND_CACHE_SIZE: int = 8
+_headland_cache: "OrderedDict" = OrderedDict()
+
 # Maximum chord deviation from the true arc (metres / same units as geometry).
 # At 90 quad_segs and 2 m radius the actual deviation is ~0.5 mm, well under 15 cm.
 MAX_CHORD_DEV: float = 0.15  # 15 cm = 6 inches
@@ -26,16 +40,156 @@ def smooth_buffer(geom: BaseGeometry, dist: float, **kwargs) -> BaseGeometry:
     """
     Buffer *geom* by *dist* with high vertex density on curved sections.
 
+    *geom* and *dist* may also be NumPy arrays, in which case every
+    geometry is buffered in a single vectorized call and an array of
+    polygons is returned.
+
     Uses SMOOTH_QUAD_SEGS (90 segments/quadrant = 1 vertex/degree) so that
     every buffered arc has a chord deviation of at most ~MAX_CHORD_DEV (15 cm)
     for all practical path radii.
 
-    Pass-through kwargs are forwarded to Shapely's buffer() unchanged
+    Pass-through kwargs are forwarded to shapely.buffer() unchanged
     (e.g. cap_style, join_style, single_sided).
 
     Returns the buffered geometry.
     """
-    return geom.buffer(dist, quad_segs=SMOOTH_QUAD_SEGS, **kwargs)
+    return shapely.buffer(geom, dist, quad_segs=SMOOTH_QUAD_SEGS, **kwargs)
+
+
+def headland_area(field: BaseGeometry, inset: float) -> Optional[BaseGeometry]:
+    """
+    Inset *field* by *inset* metres for headlands, keeping the largest part.
+
+    The smooth negative buffer is the most expensive step of row
+    generation and the UI re-runs it with the same field and inset on every
+    regenerate, so results are cached per (field object, inset).
+
+    Returns:
+        The inset polygon, or None when the inset is not positive or
+        collapses the field.
+    """
+    if inset <= 0:
+        return None
+
+    key = (id(field), inset)
+    cached = _headland_cache.get(key)
+    # The field is stored alongside so a recycled id() can't return a stale hit
+    if cached is not None and cached[0] is field:
+        _headland_cache.move_to_end(key)
+        return cached[1]
+
+    area = smooth_buffer(field, -inset)
+    if area.is_empty or area.area <= 0:
+        area = None
+    elif area.geom_type == 'MultiPolygon':
+        area = max(area.geoms, key=lambda g: g.area)
+
+    _headland_cache[key] = (field, area)
+    if len(_headland_cache) > HEADLAND_CACHE_SIZE:
+        _headland_cache.popitem(last=False)
+    return area
+
+
+def hilbert_order(geoms: List[BaseGeometry], bits: int = HILBERT_BITS) -> np.ndarray:
+    """
+    Indices that sort *geoms* by the Hilbert index of their bounds centres.
+
+    Centres are snapped to a 2**bits grid over the combined extent; empty
+    geometries sort first.
+    """
+    bounds = shapely.bounds(np.asarray(geoms, dtype=object))
+    cx = (bounds[:, 0] + bounds[:, 2]) * 0.5
+    cy = (bounds[:, 1] + bounds[:, 3]) * 0.5
+    valid = ~np.isnan(cx)
+    if not valid.any():
+        return np.arange(len(geoms))
+
+    n = 1 << bits
+    minx, maxx = cx[valid].min(), cx[valid].max()
+    miny, maxy = cy[valid].min(), cy[valid].max()
+    scale = (n - 1) / max(maxx - minx, maxy - miny, 1e-12)
+    x = np.where(valid, (cx - minx) * scale, 0).astype(np.int64)
+    y = np.where(valid, (cy - miny) * scale, 0).astype(np.int64)
+
+    d = np.zeros(len(geoms), dtype=np.int64)
+    s = n >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # Rotate the quadrant so the curve stays continuous
+        flip = ~ry & rx
+        x = np.where(flip, n - 1 - x, x)
+        y = np.where(flip, n - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s >>= 1
+    d[~valid] = -1
+    return np.argsort(d, kind="stable")
+
+
+def union_chunked(
+    geoms: Iterable[BaseGeometry],
+    chunk_size: int = UNION_CHUNK_SIZE,
+) -> BaseGeometry:
+    """
+    Union many geometries by merging fixed-size chunks, then the partial results.
+
+    A single unary_union over thousands of small carve polygons spends most
+    of its time noding one huge intermediate result; merging in rounds keeps
+    every call small.  Inputs of at most *chunk_size* geometries go straight
+    to unary_union.  Larger inputs are first sorted along a Hilbert curve so
+    each chunk holds spatial neighbours and its partial union stays compact.
+    """
+    geoms = list(geoms)
+    if len(geoms) > chunk_size:
+        order = hilbert_order(geoms)
+        geoms = [geoms[i] for i in order]
+    while len(geoms) > chunk_size:
+        geoms = [
+            unary_union(geoms[i:i + chunk_size])
+            for i in range(0, len(geoms), chunk_size)
+        ]
+    return unary_union(geoms)
+
+
+def erase_lines(walls: BaseGeometry, eraser: BaseGeometry) -> BaseGeometry:
+    """
+    Subtract *eraser* from line geometry, touching only the lines it hits.
+
+    A carve usually covers a small corner of the field, yet a plain
+    walls.difference(eraser) overlays every wall line.  Here the lines are
+    split out, the ones that intersect the eraser are differenced in one
+    vectorized call, and the rest pass through unchanged in their original
+    order.
+
+    Returns:
+        MultiLineString of the remaining lines (a GeometryCollection if the
+        difference produced anything other than lines).
+    """
+    if walls is None or walls.is_empty or eraser is None or eraser.is_empty:
+        return walls
+
+    parts = shapely.get_parts(walls)
+    shapely.prepare(eraser)
+    hit = shapely.intersects(eraser, parts)
+    if not hit.any():
+        return walls
+    if hit.all():
+        return walls.difference(eraser)
+
+    cut, cut_index = shapely.get_parts(
+        shapely.difference(parts[hit], eraser), return_index=True
+    )
+    pieces = np.concatenate([parts[~hit], cut])
+    order = np.argsort(
+        np.concatenate([np.flatnonzero(~hit), np.flatnonzero(hit)[cut_index]]),
+        kind="stable",
+    )
+    pieces = pieces[order]
+
+    if (shapely.get_type_id(pieces) == shapely.GeometryType.LINESTRING).all():
+        return MultiLineString(list(pieces))
+    return GeometryCollection(list(pieces))
 
 
 # ---------------------------------------------------------------------------
@@ -275,6 +429,17 @@ def extract_path_edge_lines(
     return edges
 
 
+def _line_parts(geom: BaseGeometry) -> np.ndarray:
+    """Every LineString inside *geom*, in order, unpacking nested collections."""
+    parts = np.array([geom])
+    while True:
+        types = shapely.get_type_id(parts)
+        if not np.isin(types, (4, 5, 6, 7)).any():
+            break
+        parts = shapely.get_parts(parts)
+    return parts[types == 1]
+
+
 def flatten_geometry(geom: BaseGeometry) -> List[List[Tuple[float, float]]]:
     """
     Recursively flatten MultiLineString/GeometryCollection to list of line segments.
@@ -290,18 +455,53 @@ def flatten_geometry(geom: BaseGeometry) -> List[List[Tuple[float, float]]]:
         >>> flatten_geometry(line)
         [[(0.0, 0.0), (1.0, 1.0), (2.0, 2.0)]]
     """
-    lines = []
+    if geom is None or geom.is_empty:
+        return []
+    lines = _line_parts(geom)
+
+    # One coordinate pull for every line, split back per line
+    coords, index = shapely.get_coordinates(lines, return_index=True, include_z=geom.has_z)
+    points = list(zip(*coords.T.tolist()))
+    ends = np.cumsum(np.bincount(index, minlength=len(lines))).tolist()
+    starts = [0] + ends[:-1]
+    return [points[a:b] for a, b in zip(starts, ends)]
+
+
+def flatten_geometry_ragged(geom: BaseGeometry) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Flatten line geometry to one coordinate array plus offsets.
 
+    The ragged layout of shapely.to_ragged_array: line i runs from
+    coords[offsets[i]] up to coords[offsets[i + 1]].  Coordinates are 2D.
+
+    Args:
+        geom: Shapely geometry (LineString, MultiLineString, or GeometryCollection)
+
+    Returns:
+        (coords, offsets) with coords of shape (N, 2) and len(lines) + 1 offsets
+    """
     if geom is None or geom.is_empty:
-        return lines
+        return np.empty((0, 2)), np.zeros(1, dtype=np.int64)
+    lines = _line_parts(geom)
+    offsets = np.zeros(len(lines) + 1, dtype=np.int64)
+    np.cumsum(shapely.get_num_coordinates(lines), out=offsets[1:])
+    return shapely.get_coordinates(lines), offsets
+
+
+def lines_from_ragged(coords, offsets) -> Optional[MultiLineString]:
+    """
+    Rebuild lines flattened by flatten_geometry_ragged into one MultiLineString.
 
-    if geom.geom_type == 'LineString':
-        lines.append(list(geom.coords))
-    elif geom.geom_type in ['MultiLineString', 'GeometryCollection']:
-        for part in geom.geoms:
-            lines.extend(flatten_geometry(part))
+    Lines with fewer than two coordinates are dropped.
 
-    return lines
+    Returns:
+        MultiLineString, or None when no line remains
+    """
+    coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    lines = shapely.from_ragged_array(shapely.GeometryType.LINESTRING, coords, (offsets,))
+    lines = lines[shapely.get_num_coordinates(lines) >= 2]
+    return shapely.multilinestrings(lines) if len(lines) else None
 
 
 def carve_path(
@@ -347,7 +547,7 @@ def carve_path(
         # Path entirely outside - return unchanged
         return walls, "Path outside field boundary"
 
-    # Boolean difference
-    updated_walls = walls.difference(eraser)
+    # Boolean difference, limited to the walls the eraser touches
+    updated_walls = erase_lines(walls, eraser)
 
     return updated_walls, None
@@ -7,7 +7,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from state import app_state
-from .operations import carve_path, flatten_geometry, smooth_buffer, densify_curves
+from .operations import carve_path, flatten_geometry, smooth_buffer, densify_curves, union_chunked, erase_lines
 
 router = APIRouter()
 
@@ -90,7 +90,7 @@ def carve_path_endpoint(req: PathRequest):
         # Carve headland walls with the same eraser
         headland_walls = app_state.get_headland_walls()
         if headland_walls:
-            updated_headland = headland_walls.difference(carve_polygon)
+            updated_headland = erase_lines(headland_walls, carve_polygon)
             app_state.set_headland_walls(updated_headland)
 
         # Track carved edges for validation and carve areas for retention
@@ -1844,7 +1844,7 @@ def carve_batch(req: CarveBatchRequest):
     """
     from shapely.geometry import LineString, MultiLineString, Polygon
     from shapely.geometry.base import BaseGeometry
-    from shapely.ops import unary_union
+    import numpy as np
 
     try:
         print("[Carve-batch] ========== START ==========")
@@ -1871,6 +1871,8 @@ def carve_batch(req: CarveBatchRequest):
 
         # Collect all carve geometries
         carve_geoms = []
+        stroke_lines = []
+        stroke_widths = []
 
         for el in req.elements:
             if len(el.points) < 2:
@@ -1959,12 +1961,12 @@ def carve_batch(req: CarveBatchRequest):
                         print(f"[Batch Carve]   -> SKIPPING degenerate polygon (area too small: {poly.area:.4f}m²)")
                 else:
                     # PATHS/LINES: Buffer the line to create width (stroke)
+                    # (collected here, buffered together after the loop)
                     print(f"[Batch Carve] Processing as BUFFERED LINE: {el.id[:8]} (type={el.type}, width={el.width}m)")
-                    line = LineString(points)
-                    buffered = smooth_buffer(line, el.width / 2.0, cap_style=1, join_style=1)
-                    carve_geoms.append(buffered)
+                    stroke_lines.append(LineString(points))
+                    stroke_widths.append(el.width)
                     app_state.add_carved_path(points, el.width)
-                    print(f"[Batch Carve]   -> ADDED buffered line to carve_geoms")
+                    print(f"[Batch Carve]   -> QUEUED line for buffering")
 
             except Exception as e:
                 print(f"[Batch Carve] ERROR processing element {el.id[:8]}: {e}")
@@ -1972,20 +1974,29 @@ def carve_batch(req: CarveBatchRequest):
                 traceback.print_exc()
                 continue
 
+        # Buffer every stroke in one vectorized call
+        if stroke_lines:
+            carve_geoms.extend(smooth_buffer(
+                np.array(stroke_lines, dtype=object),
+                np.array(stroke_widths) / 2.0,
+                cap_style=1,
+                join_style=1,
+            ))
+
         # Union all carve areas and subtract from walls
         print(f"[Batch Carve] Total carve_geoms collected: {len(carve_geoms)}")
         if carve_geoms:
             try:
                 print(f"[Batch Carve] Creating union of {len(carve_geoms)} geometries...")
-                all_carves = unary_union(carve_geoms)
+                all_carves = union_chunked(carve_geoms)
                 print(f"[Batch Carve] Union created, performing difference on walls...")
-                updated_walls = current_walls.difference(all_carves)
+                updated_walls = erase_lines(current_walls, all_carves)
                 print(f"[Batch Carve] SUCCESS - Carved {len(carve_geoms)} elements from maze")
 
                 # Carve headland walls with the same eraser
                 headland_walls = app_state.get_headland_walls()
                 if headland_walls:
-                    updated_headland = headland_walls.difference(all_carves)
+                    updated_headland = erase_lines(headland_walls, all_carves)
                     app_state.set_headland_walls(updated_headland)
                     print(f"[Batch Carve] Also carved headland walls")
 
@@ -2000,9 +2011,6 @@ def carve_batch(req: CarveBatchRequest):
                 print(f"[Batch Carve] boundary is_empty: {boundary.is_empty}, bounds: {boundary.bounds}")
                 app_state.add_carved_edges(boundary)
                 app_state.add_carved_area(clipped_carves)
-                carved_state = app_state.get_carved_edges()
-                print(f"[Batch Carve] After add - carved_edges type: {type(carved_state).__name__ if carved_state else 'None'}")
-                print(f"[Batch Carve] carved_edges is_empty: {carved_state.is_empty if carved_state else 'N/A'}")
 
             except Exception as e:
                 print(f"[Batch Carve] ERROR - Union/difference failed: {e}")
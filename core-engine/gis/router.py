@@ -3,8 +3,9 @@ GIS API Router: File import and format support endpoints.
 """
 
 from fastapi import APIRouter, File, UploadFile, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import os
 import math
 import tempfile
@@ -103,16 +104,26 @@ async def import_boundary_file(
             detail={"error": "No files uploaded", "error_code": "NO_FILES"}
         )
 
+    uploads = [
+        (os.path.basename(uploaded_file.filename or "upload"), await uploaded_file.read())
+        for uploaded_file in uploaded_files
+    ]
+
+    # Writing, parsing and projecting the upload all block; run them on the
+    # threadpool so the event loop keeps serving other requests
+    return await run_in_threadpool(_import_uploads, uploads, lat_col, lon_col)
+
+
+def _import_uploads(uploads: List[Tuple[str, bytes]], lat_col: str, lon_col: str) -> dict:
+    """Import a boundary from uploaded (filename, content) pairs; returns the response body."""
     # Create temp directory for file processing
     temp_dir = tempfile.mkdtemp()
 
     try:
         # Save uploaded files
         saved_files = []
-        for uploaded_file in uploaded_files:
-            filename = os.path.basename(uploaded_file.filename or "upload")
+        for filename, content in uploads:
             temp_path = os.path.join(temp_dir, filename)
-            content = await uploaded_file.read()
 
             with open(temp_path, 'wb') as f:
                 f.write(content)
@@ -7,39 +7,205 @@ Provides endpoints for guiding a mower operator during maze cutting:
 - Provides next-path routing suggestions
 """
 
-from typing import List, Tuple, Optional, Dict
-from fastapi import APIRouter, HTTPException
+import json
+import os
+import threading
+from typing import Callable, List, Tuple, Optional, Dict
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel
 
-import pyproj
-from shapely.geometry import Point, LineString
+import numpy as np
+import shapely
+from shapely import STRtree
+from shapely.geometry import LineString
 from shapely.geometry.base import BaseGeometry
 
 from state import app_state
+from .segments import segment_arrays, nearest_segment
 
 router = APIRouter()
 
+# Initial capacity of the cut-segment buffer; doubled whenever it fills up
+CUT_BUFFER_CAPACITY = 1024
+
+# Operator counts as on a path when within this distance of a wall line (meters)
+ON_PATH_DISTANCE = 3.0
+
+# Coordinate dtype for the segment and cut buffers.  GUIDANCE_FP32=1 halves
+# their memory on low-RAM cutter tablets; GPS accuracy (metres) swamps the
+# lost precision.  Projection itself always runs in float64.
+COORD_DTYPE = np.float32 if os.getenv('GUIDANCE_FP32', '0') == '1' else np.float64
+
 
 class GuidanceState:
-    """Tracks cutting progress during GPS guidance mode."""
-    _instance = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.is_active = False
-            cls._instance.cut_segments = []  # [(x1,y1,x2,y2), ...]
-            cls._instance.current_position = None
-            cls._instance.total_path_length = 0
-            cls._instance.cut_path_length = 0
-        return cls._instance
+    """Tracks cutting progress during GPS guidance mode.
+
+    A single module-level instance is shared by all requests.  Cut
+    bookkeeping is guarded by a lock because FastAPI runs these handlers
+    on its threadpool and paired mowers may post cuts concurrently.
+    """
+
+    __slots__ = (
+        "is_active", "current_position", "total_path_length", "cut_path_length",
+        "lines", "line_lengths", "tree",
+        "seg_p0", "seg_p1", "seg_bounds", "seg_line", "cut_mask",
+        "revision", "_cut_buf", "_cut_n", "_response_cache", "_lock",
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.revision = 0  # Bumped on every change; keys the response cache
+        self.reset()
 
     def reset(self):
         self.is_active = False
-        self.cut_segments = []
         self.current_position = None
         self.total_path_length = 0
         self.cut_path_length = 0
+        self._cut_buf = np.empty((CUT_BUFFER_CAPACITY, 4), dtype=COORD_DTYPE)  # rows of (x1,y1,x2,y2)
+        self._cut_n = 0
+        self.lines = []  # Flat wall LineStrings, indexed by tree
+        self.line_lengths = np.empty(0)  # Length of each line
+        self.tree = None  # STRtree over lines, built at /start
+        self.seg_p0 = np.empty((0, 2), dtype=COORD_DTYPE)  # Segment start points
+        self.seg_p1 = np.empty((0, 2), dtype=COORD_DTYPE)  # Segment end points
+        self.seg_bounds = np.empty((4, 0), dtype=COORD_DTYPE)  # Segment minx, miny, maxx, maxy rows
+        self.seg_line = np.empty(0, dtype=np.intp)  # Owning line of each segment
+        self.cut_mask = np.zeros(0, dtype=bool)  # Lines marked as cut, by index
+        self._response_cache = {}  # name -> (revision, JSON bytes)
+        self._touch()
+
+    def _touch(self):
+        self.revision += 1
+
+    def cached_response(self, name: str, build: Callable[[], dict]) -> Response:
+        """Serve the JSON body from *build* as cached bytes until the state changes."""
+        cached = self._response_cache.get(name)
+        if cached is None or cached[0] != self.revision:
+            cached = (self.revision, json.dumps(build()).encode())
+            self._response_cache[name] = cached
+        return Response(content=cached[1], media_type="application/json")
+
+    def set_position(self, x: float, y: float):
+        """Set the operator's current design-space position."""
+        self.current_position = [round(x, 2), round(y, 2)]
+        self._touch()
+
+    @property
+    def completion_pct(self) -> float:
+        """Percentage of the total path length cut so far, rounded to 0.1."""
+        if self.total_path_length <= 0:
+            return 0
+        return round(self.cut_path_length / self.total_path_length * 100, 1)
+
+    @property
+    def cut_segments(self) -> np.ndarray:
+        """(N, 4) view of the cut segments as (x1, y1, x2, y2) rows."""
+        return self._cut_buf[:self._cut_n]
+
+    def _record_cut(self, x1: float, y1: float, x2: float, y2: float):
+        # Caller holds self._lock
+        if self._cut_n == len(self._cut_buf):
+            grown = np.empty((2 * len(self._cut_buf), 4), dtype=COORD_DTYPE)
+            grown[:self._cut_n] = self._cut_buf
+            self._cut_buf = grown
+        self._cut_buf[self._cut_n] = (x1, y1, x2, y2)
+        self._cut_n += 1
+        self._touch()
+
+    def add_cut(self, x1: float, y1: float, x2: float, y2: float) -> float:
+        """Record a free-form cut segment and return its length."""
+        length = float(np.hypot(x2 - x1, y2 - y1))
+        with self._lock:
+            self._record_cut(x1, y1, x2, y2)
+            self.cut_path_length += length
+        return length
+
+    def cut_line(self, idx: int) -> bool:
+        """Mark wall line *idx* as cut.  Returns False if it was already cut."""
+        coords = self.lines[idx].coords
+        with self._lock:
+            if self.cut_mask[idx]:
+                return False
+            self.cut_mask[idx] = True
+            self._record_cut(*coords[0], *coords[-1])
+            self.cut_path_length += float(self.line_lengths[idx])
+        return True
+
+    def load_walls(self, walls: BaseGeometry):
+        """Flatten the maze walls and build the spatial index used for lookups."""
+        self.lines = _wall_lines(walls)
+        self.line_lengths = shapely.length(np.asarray(self.lines, dtype=object))
+        self.tree = STRtree(self.lines) if self.lines else None
+        self.seg_p0, self.seg_p1, self.seg_line = segment_arrays(self.lines, dtype=COORD_DTYPE)
+        self.seg_bounds = np.vstack([
+            np.minimum(self.seg_p0, self.seg_p1).T,
+            np.maximum(self.seg_p0, self.seg_p1).T,
+        ])
+        self.cut_mask = np.zeros(len(self.lines), dtype=bool)
+        if len(self.seg_p0):
+            # Compile the nearest-segment kernel now rather than on the first fix
+            nearest_segment(self.seg_p0[:1], self.seg_p1[:1], 0.0, 0.0)
+        self._touch()
+
+    def closest_segment(
+        self, x: float, y: float, radius: float = ON_PATH_DISTANCE, uncut_only: bool = False
+    ) -> Tuple[Optional[int], float]:
+        """Return the index of the wall segment closest to (x, y) and its distance.
+
+        Segments whose bounding box lies farther than *radius* from the point
+        are skipped; the full segment set is only scanned when nothing is
+        within *radius*.  With *uncut_only*, segments of lines already marked
+        as cut are ignored.
+        """
+        if len(self.seg_p0) == 0:
+            return None, float('inf')
+        minx, miny, maxx, maxy = self.seg_bounds
+        candidates = (minx <= x + radius) & (maxx >= x - radius) & (miny <= y + radius) & (maxy >= y - radius)
+        if uncut_only:
+            uncut = ~self.cut_mask[self.seg_line]
+            candidates &= uncut
+        near = np.flatnonzero(candidates)
+        if len(near):
+            idx, dist = nearest_segment(self.seg_p0[near], self.seg_p1[near], x, y)
+            if dist <= radius:
+                return int(near[idx]), dist
+        if not uncut_only:
+            return nearest_segment(self.seg_p0, self.seg_p1, x, y)
+        pool = np.flatnonzero(uncut)
+        if not len(pool):
+            return None, float('inf')
+        idx, dist = nearest_segment(self.seg_p0[pool], self.seg_p1[pool], x, y)
+        return int(pool[idx]), dist
+
+    def nearest_line(self, x: float, y: float, uncut_only: bool = False) -> Tuple[Optional[int], float]:
+        """Return the index of the wall line closest to (x, y) and its distance."""
+        seg, dist = self.closest_segment(x, y, uncut_only=uncut_only)
+        if seg is None:
+            return None, dist
+        return int(self.seg_line[seg]), dist
+
+    def nearest_distances(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Return the nearest-wall distance for each point in a batch."""
+        if self.tree is None:
+            return np.full(len(xs), np.inf)
+        _, distances = self.tree.query_nearest(
+            shapely.points(xs, ys), return_distance=True, all_matches=False
+        )
+        return distances
+
+
+def _wall_lines(walls: BaseGeometry) -> List[LineString]:
+    """Split a wall geometry into its component LineStrings."""
+    if walls is None or walls.is_empty:
+        return []
+    if walls.geom_type == 'LineString':
+        return [walls]
+    lines = []
+    if walls.geom_type in ('MultiLineString', 'GeometryCollection'):
+        for geom in walls.geoms:
+            lines.extend(_wall_lines(geom))
+    return lines
 
 
 guidance_state = GuidanceState()
@@ -56,6 +222,10 @@ class PositionUpdate(BaseModel):
     heading: float = 0  # degrees from north
 
 
+class PositionBatch(BaseModel):
+    points: List[PositionUpdate]
+
+
 class MarkCutRequest(BaseModel):
     startX: float
     startY: float
@@ -63,6 +233,10 @@ class MarkCutRequest(BaseModel):
     endY: float
 
 
+class MarkCutByIdRequest(BaseModel):
+    segment_id: int
+
+
 @router.post("/start")
 def start_guidance(req: StartGuidanceRequest):
     """Start GPS cutting guidance mode."""
@@ -76,7 +250,8 @@ def start_guidance(req: StartGuidanceRequest):
 
     guidance_state.reset()
     guidance_state.is_active = True
-    guidance_state.total_path_length = walls.length if walls else 0
+    guidance_state.total_path_length = app_state.get_walls_total_length()
+    guidance_state.load_walls(walls)
 
     return {
         "success": True,
@@ -91,30 +266,30 @@ def stop_guidance():
     stats = {
         "total_path_length": round(guidance_state.total_path_length, 1),
         "cut_path_length": round(guidance_state.cut_path_length, 1),
-        "completion_pct": round(
-            guidance_state.cut_path_length / guidance_state.total_path_length * 100, 1
-        ) if guidance_state.total_path_length > 0 else 0,
+        "completion_pct": guidance_state.completion_pct,
         "segments_cut": len(guidance_state.cut_segments),
     }
     guidance_state.reset()
     return {"success": True, "stats": stats}
 
 
-@router.get("/status")
-def get_guidance_status():
-    """Get current guidance status."""
+def _status_body() -> dict:
     return {
         "is_active": guidance_state.is_active,
         "current_position": guidance_state.current_position,
         "cut_path_length": round(guidance_state.cut_path_length, 1),
         "total_path_length": round(guidance_state.total_path_length, 1),
-        "completion_pct": round(
-            guidance_state.cut_path_length / guidance_state.total_path_length * 100, 1
-        ) if guidance_state.total_path_length > 0 else 0,
+        "completion_pct": guidance_state.completion_pct,
         "segments_cut": len(guidance_state.cut_segments),
     }
 
 
+@router.get("/status")
+def get_guidance_status():
+    """Get current guidance status (cached until the guidance state changes)."""
+    return guidance_state.cached_response("status", _status_body)
+
+
 @router.post("/update-position")
 def update_position(req: PositionUpdate):
     """
@@ -126,28 +301,27 @@ def update_position(req: PositionUpdate):
     if not guidance_state.is_active:
         raise HTTPException(status_code=400, detail={"error": "Guidance not active"})
 
-    crs = app_state.get_crs()
+    transformer = app_state.get_gps_transformer()
     offset = app_state.get_centroid_offset()
-    walls = app_state.get_walls()
 
-    if not crs:
+    if transformer is None:
         raise HTTPException(status_code=400, detail={"error": "No CRS set"})
 
     # Transform GPS to design coordinates
-    transformer = pyproj.Transformer.from_crs("EPSG:4326", crs, always_xy=True)
     proj_x, proj_y = transformer.transform(req.longitude, req.latitude)
     cx, cy = offset or (0, 0)
     design_x = proj_x - cx
     design_y = proj_y - cy
 
-    guidance_state.current_position = [round(design_x, 2), round(design_y, 2)]
+    guidance_state.set_position(design_x, design_y)
 
     # Find nearest wall/path
-    current_point = Point(design_x, design_y)
-    nearest_distance = walls.distance(current_point) if walls else 999
+    nearest_distance = 999
+    if len(guidance_state.seg_p0):
+        _, nearest_distance = guidance_state.closest_segment(design_x, design_y)
 
     # Determine if operator is on a path to cut
-    on_path = nearest_distance < 3.0  # Within 3 meters of a wall line
+    on_path = nearest_distance < ON_PATH_DISTANCE
 
     return {
         "design_position": guidance_state.current_position,
@@ -158,68 +332,161 @@ def update_position(req: PositionUpdate):
     }
 
 
+@router.post("/update-positions")
+def update_positions(req: PositionBatch):
+    """
+    Update with a batch of GPS fixes and return guidance info for each.
+
+    All fixes are projected in one Transformer call and measured against
+    the walls in one spatial-index query.  The last fix becomes the
+    current position.
+    """
+    if not guidance_state.is_active:
+        raise HTTPException(status_code=400, detail={"error": "Guidance not active"})
+
+    transformer = app_state.get_gps_transformer()
+    offset = app_state.get_centroid_offset()
+
+    if transformer is None:
+        raise HTTPException(status_code=400, detail={"error": "No CRS set"})
+
+    if not req.points:
+        return {"positions": []}
+
+    # Transform all GPS fixes to design coordinates at once
+    n = len(req.points)
+    lons = np.fromiter((p.longitude for p in req.points), dtype=np.float64, count=n)
+    lats = np.fromiter((p.latitude for p in req.points), dtype=np.float64, count=n)
+    proj_x, proj_y = transformer.transform(lons, lats)
+    cx, cy = offset or (0, 0)
+    design_x = np.asarray(proj_x) - cx
+    design_y = np.asarray(proj_y) - cy
+
+    if guidance_state.tree is not None:
+        distances = guidance_state.nearest_distances(design_x, design_y)
+    else:
+        distances = np.full(n, 999.0)
+
+    guidance_state.set_position(float(design_x[-1]), float(design_y[-1]))
+
+    return {
+        "positions": [
+            {
+                "design_position": [round(float(x), 2), round(float(y), 2)],
+                "nearest_wall_distance": round(float(d), 2),
+                "on_path": bool(d < ON_PATH_DISTANCE),
+                "gps_accuracy": p.accuracy,
+                "heading": p.heading,
+            }
+            for p, x, y, d in zip(req.points, design_x, design_y, distances)
+        ]
+    }
+
+
+@router.get("/segments")
+def list_segments():
+    """List the wall lines being cut, indexed for /mark-cut-by-id."""
+    if not guidance_state.is_active:
+        raise HTTPException(status_code=400, detail={"error": "Guidance not active"})
+
+    return {
+        "segments": [
+            {
+                "id": i,
+                "points": [[round(x, 2), round(y, 2)] for x, y in line.coords],
+                "length": round(float(guidance_state.line_lengths[i]), 2),
+                "cut": bool(guidance_state.cut_mask[i]),
+            }
+            for i, line in enumerate(guidance_state.lines)
+        ]
+    }
+
+
 @router.post("/mark-cut")
 def mark_cut(req: MarkCutRequest):
-    """Mark a path segment as cut."""
+    """
+    Mark a path segment as cut.
+
+    A segment within the on-path radius of a wall line snaps to that line,
+    which is marked as cut and credited once with its full length, exactly
+    as /mark-cut-by-id does.  Segments away from every wall are credited
+    with the length between the given endpoints.
+    """
     if not guidance_state.is_active:
         raise HTTPException(status_code=400, detail={"error": "Guidance not active"})
 
-    segment_length = ((req.endX - req.startX)**2 + (req.endY - req.startY)**2)**0.5
-    guidance_state.cut_segments.append((req.startX, req.startY, req.endX, req.endY))
-    guidance_state.cut_path_length += segment_length
+    segment_id = None
+    if guidance_state.tree is not None:
+        cut = LineString([(req.startX, req.startY), (req.endX, req.endY)])
+        idx = int(guidance_state.tree.nearest(cut))
+        if guidance_state.lines[idx].distance(cut) < ON_PATH_DISTANCE:
+            segment_id = idx
+
+    if segment_id is None:
+        newly_cut = True
+        segment_length = guidance_state.add_cut(req.startX, req.startY, req.endX, req.endY)
+    else:
+        newly_cut = guidance_state.cut_line(segment_id)
+        segment_length = float(guidance_state.line_lengths[segment_id])
 
     return {
         "success": True,
+        "already_cut": not newly_cut,
         "segment_length": round(segment_length, 2),
+        "segment_id": segment_id,
         "total_cut": round(guidance_state.cut_path_length, 1),
-        "completion_pct": round(
-            guidance_state.cut_path_length / guidance_state.total_path_length * 100, 1
-        ) if guidance_state.total_path_length > 0 else 0,
+        "completion_pct": guidance_state.completion_pct,
     }
 
 
-@router.get("/next-path")
-def suggest_next_path():
-    """Suggest the nearest uncut path segment for efficient cutting."""
+@router.post("/mark-cut-by-id")
+def mark_cut_by_id(req: MarkCutByIdRequest):
+    """Mark a wall line from /segments as cut, crediting its full length."""
     if not guidance_state.is_active:
         raise HTTPException(status_code=400, detail={"error": "Guidance not active"})
 
-    walls = app_state.get_walls()
-    if not walls or walls.is_empty:
-        return {"suggestion": None}
+    if not 0 <= req.segment_id < len(guidance_state.lines):
+        raise HTTPException(status_code=404, detail={"error": f"Unknown segment: {req.segment_id}"})
 
-    if not guidance_state.current_position:
-        return {"suggestion": None, "message": "No current position"}
+    newly_cut = guidance_state.cut_line(req.segment_id)
 
-    current = Point(guidance_state.current_position)
+    return {
+        "success": True,
+        "already_cut": not newly_cut,
+        "segment_length": round(float(guidance_state.line_lengths[req.segment_id]), 2),
+        "total_cut": round(guidance_state.cut_path_length, 1),
+        "completion_pct": guidance_state.completion_pct,
+    }
 
-    # Find nearest wall segment
-    lines = []
-    if walls.geom_type == 'LineString':
-        lines = [walls]
-    elif walls.geom_type in ('MultiLineString', 'GeometryCollection'):
-        for geom in walls.geoms:
-            if geom.geom_type == 'LineString':
-                lines.append(geom)
 
-    best_line = None
-    best_dist = float('inf')
+def _next_path_body() -> dict:
+    if not guidance_state.lines:
+        return {"suggestion": None}
 
-    for line in lines:
-        dist = line.distance(current)
-        if dist < best_dist:
-            best_dist = dist
-            best_line = line
+    if not guidance_state.current_position:
+        return {"suggestion": None, "message": "No current position"}
+
+    # Find nearest uncut wall segment
+    best_idx, best_dist = guidance_state.nearest_line(*guidance_state.current_position, uncut_only=True)
 
-    if best_line:
-        coords = list(best_line.coords)
+    if best_idx is not None:
+        coords = list(guidance_state.lines[best_idx].coords)
         return {
             "suggestion": {
                 "start": [round(coords[0][0], 2), round(coords[0][1], 2)],
                 "end": [round(coords[-1][0], 2), round(coords[-1][1], 2)],
                 "distance": round(best_dist, 2),
-                "length": round(best_line.length, 2),
+                "length": round(float(guidance_state.line_lengths[best_idx]), 2),
             }
         }
 
     return {"suggestion": None}
+
+
+@router.get("/next-path")
+def suggest_next_path():
+    """Suggest the nearest uncut path segment (cached until the guidance state changes)."""
+    if not guidance_state.is_active:
+        raise HTTPException(status_code=400, detail={"error": "Guidance not active"})
+
+    return guidance_state.cached_response("next_path", _next_path_body)
@@ -0,0 +1,122 @@
+"""
+Vectorized wall-segment geometry for GPS guidance.
+
+Wall lines are exploded into straight segments held as coordinate arrays
+so that point-to-wall distance queries run as a few NumPy operations
+instead of one GEOS call per geometry.  When numba is installed the
+nearest-segment search is JIT-compiled into a single fused loop.
+"""
+
+import numpy as np
+import shapely
+from shapely.geometry import LineString
+from typing import List, Tuple
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:  # numba is optional; the NumPy kernel is used instead
+    _HAS_NUMBA = False
+
+
+def segment_arrays(
+    lines: List[LineString],
+    dtype=np.float64,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Explode LineStrings into their straight segments.
+
+    Args:
+        lines: Wall LineStrings
+        dtype: Coordinate dtype of the returned arrays (float64 or float32)
+
+    Returns:
+        (p0, p1, line_index) where p0 and p1 are (N, 2) arrays of segment
+        start/end points and line_index[i] is the position in *lines* of the
+        LineString segment i belongs to.
+    """
+    if not lines:
+        empty = np.empty((0, 2), dtype=dtype)
+        return empty, empty.copy(), np.empty(0, dtype=np.intp)
+
+    coords, index = shapely.get_coordinates(
+        np.asarray(lines, dtype=object), return_index=True
+    )
+    # Consecutive vertices of the same line form a segment
+    same_line = index[1:] == index[:-1]
+    p0 = np.ascontiguousarray(coords[:-1][same_line], dtype=dtype)
+    p1 = np.ascontiguousarray(coords[1:][same_line], dtype=dtype)
+    return p0, p1, index[:-1][same_line]
+
+
+def point_segment_distances(
+    p0: np.ndarray,
+    p1: np.ndarray,
+    x: float,
+    y: float,
+) -> np.ndarray:
+    """
+    Distance from point (x, y) to every segment p0[i] -> p1[i].
+
+    Degenerate (zero-length) segments are measured to their start point.
+    Computed in the dtype of *p0*.
+    """
+    q = np.array([x, y], dtype=p0.dtype)
+    v = p1 - p0
+    w = q - p0
+    vv = (v * v).sum(axis=1)
+    t = np.clip((w * v).sum(axis=1) / np.where(vv > 0, vv, 1.0), 0.0, 1.0)
+    proj = p0 + t[:, None] * v
+    return np.sqrt(((q - proj) ** 2).sum(axis=1))
+
+
+if _HAS_NUMBA:
+    # Compiled on first use for each coordinate dtype and cached on disk,
+    # so importing this module does not wait on numba.  GuidanceState
+    # warms it up at /start, before the first GPS fix arrives.
+    @njit(cache=True, fastmath=True)
+    def _nearest_segment_jit(p0, p1, x, y):
+        best_idx = -1
+        best_d2 = np.inf
+        for i in range(p0.shape[0]):
+            vx = p1[i, 0] - p0[i, 0]
+            vy = p1[i, 1] - p0[i, 1]
+            wx = x - p0[i, 0]
+            wy = y - p0[i, 1]
+            vv = vx * vx + vy * vy
+            t = 0.0
+            if vv > 0.0:
+                t = min(max((wx * vx + wy * vy) / vv, 0.0), 1.0)
+            dx = wx - t * vx
+            dy = wy - t * vy
+            d2 = dx * dx + dy * dy
+            if d2 < best_d2:
+                best_d2 = d2
+                best_idx = i
+        return best_idx, np.sqrt(best_d2)
+
+
+def nearest_segment(
+    p0: np.ndarray,
+    p1: np.ndarray,
+    x: float,
+    y: float,
+) -> Tuple[int, float]:
+    """
+    Find the segment closest to point (x, y).
+
+    Args:
+        p0: (N, 2) C-contiguous float64 or float32 segment start points, N > 0
+        p1: (N, 2) C-contiguous segment end points, same dtype as p0
+        x, y: Query point
+
+    Returns:
+        (index, distance) of the nearest segment
+    """
+    if _HAS_NUMBA:
+        scalar = p0.dtype.type
+        idx, dist = _nearest_segment_jit(p0, p1, scalar(x), scalar(y))
+        return int(idx), float(dist)
+    distances = point_segment_distances(p0, p1, x, y)
+    idx = int(distances.argmin())
+    return idx, float(distances[idx])
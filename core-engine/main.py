@@ -5,8 +5,9 @@ FastAPI backend for corn maze design with GIS integration.
 Routes are organized into modular routers for different functionality areas.
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import RedirectResponse
 import uvicorn
 
 # Import routers
@@ -115,43 +116,35 @@ app.include_router(
 )
 
 
-# Backwards compatibility endpoints (redirect to new paths)
+# Backwards compatibility endpoints: old flat paths permanently redirect to
+# their module routes.  308 keeps the method and body, and the query string
+# is carried over.  Kept out of the OpenAPI schema.
 # TODO: Remove these after frontend is updated to use new paths
 
-from gis.router import get_formats, import_gps_data
-from geometry.router import carve_path_endpoint, PathRequest
-from mazification.router import generate_maze
-from export.router import export_shapefile_endpoint
-
-# Old: /supported-formats -> New: /gis/supported-formats
-@app.get("/supported-formats")
-def supported_formats_compat():
-    """Backwards compatibility: Use /gis/supported-formats instead."""
-    return get_formats()
-
-# Old: /import-gps-data -> New: /gis/import-gps-data
-@app.get("/import-gps-data")
-def import_gps_data_compat(demo: bool = False):
-    """Backwards compatibility: Use /gis/import-gps-data instead."""
-    return import_gps_data(demo=demo)
-
-# Old: /carve-path -> New: /geometry/carve
-@app.post("/carve-path")
-def carve_path_compat(req: PathRequest):
-    """Backwards compatibility: Use /geometry/carve instead."""
-    return carve_path_endpoint(req)
-
-# Old: /generate-maze -> New: /maze/generate
-@app.get("/generate-maze")
-def generate_maze_compat(spacing: float = 10.0, algorithm: str = "backtracker", seed: int = None, direction_deg: float = 0.0, headland_inset: float = 0.0):
-    """Backwards compatibility: Use /maze/generate instead."""
-    return generate_maze(spacing=spacing, algorithm=algorithm, seed=seed, direction_deg=direction_deg, headland_inset=headland_inset)
-
-# Old: /export-shapefile -> New: /export/shapefile
-@app.get("/export-shapefile")
-def export_shapefile_compat():
-    """Backwards compatibility: Use /export/shapefile instead."""
-    return export_shapefile_endpoint()
+LEGACY_REDIRECTS = {
+    # old path: (new path, method)
+    "/supported-formats": ("/gis/supported-formats", "GET"),
+    "/import-gps-data": ("/gis/import-gps-data", "GET"),
+    "/carve-path": ("/geometry/carve", "POST"),
+    "/generate-maze": ("/maze/generate", "GET"),
+    "/export-shapefile": ("/export/shapefile", "GET"),
+}
+
+
+def _legacy_redirect(target: str):
+    def redirect(request: Request):
+        query = request.url.query
+        return RedirectResponse(url=f"{target}?{query}" if query else target, status_code=308)
+    return redirect
+
+
+for old_path, (new_path, method) in LEGACY_REDIRECTS.items():
+    app.add_api_route(
+        old_path,
+        _legacy_redirect(new_path),
+        methods=[method],
+        include_in_schema=False,
+    )
 
 
 if __name__ == "__main__":
@@ -6,12 +6,15 @@ maze walls correspond to standing corn rows and paths correspond
 to mowed rows.
 """
 
-from shapely.geometry import LineString, MultiLineString
-from shapely.affinity import rotate as shapely_rotate
+import numpy as np
+import shapely
+from shapely.geometry import MultiLineString
 from shapely.geometry.base import BaseGeometry
-from shapely.ops import unary_union
-from typing import List, Optional
-from geometry.operations import smooth_buffer
+from typing import Optional
+from geometry.operations import headland_area
+
+# Grid (meters) the working area is snapped to before rows are clipped
+SNAP_GRID = 1e-6
 
 
 def generate_standing_rows(
@@ -48,42 +51,139 @@ def generate_standing_rows(
         raise ValueError("row_spacing is required for standing rows")
 
     # Determine the working area (optionally inset for headlands)
-    working_area = field_boundary
-    if headland_inset > 0:
-        inset = smooth_buffer(field_boundary, -headland_inset)
-        if not inset.is_empty and inset.area > 0:
-            if inset.geom_type == 'MultiPolygon':
-                working_area = max(inset.geoms, key=lambda g: g.area)
-            else:
-                working_area = inset
-
-    rot_cx, rot_cy = working_area.centroid.x, working_area.centroid.y
-
-    # Rotate the boundary so planting direction aligns with the Y-axis
-    rotated = shapely_rotate(working_area, direction_deg, origin=(rot_cx, rot_cy))
-    minx, miny, maxx, maxy = rotated.bounds
-
-    # Generate parallel corn-row lines in rotated space
-    corn_lines: List[BaseGeometry] = []
-    num_rows = int((maxx - minx) / row_spacing) + 2
-    for i in range(num_rows):
-        x = minx + i * row_spacing
-        line = LineString([(x, miny - row_spacing), (x, maxy + row_spacing)])
-        clipped = line.intersection(rotated)
-        if not clipped.is_empty:
-            corn_lines.append(clipped)
-
-    if not corn_lines:
+    working_area = headland_area(field_boundary, headland_inset)
+    if working_area is None:
+        working_area = field_boundary
+
+    # Snap the boundary to a micrometre grid so near-coincident vertices
+    # (common in digitised or buffered fields) are merged before clipping
+    working_area = shapely.set_precision(working_area, SNAP_GRID)
+    if working_area.is_empty:
+        return MultiLineString()
+
+    # Row layout works in a local frame where the planting direction is the
+    # Y-axis.  Only the boundary's coordinate array is rotated into it, and
+    # only row endpoints are rotated back; no geometry is transformed.
+    # North-south planting is already aligned and skips both rotations.
+    rings = shapely.get_exterior_ring(shapely.get_parts(working_area))
+    ring_xy, ring_index = shapely.get_coordinates(rings, return_index=True)
+    aligned = direction_deg % 360.0 == 0.0
+    if not aligned:
+        center = np.array([working_area.centroid.x, working_area.centroid.y])
+        ring_xy = (ring_xy - center) @ _rotation(direction_deg) + center
+    minx, miny = ring_xy.min(axis=0)
+    maxx, maxy = ring_xy.max(axis=0)
+
+    # One row every row_spacing across the local frame.  Rows past maxx
+    # would clip to nothing, so none are generated there.
+    num_rows = int((maxx - minx) / row_spacing) + 1
+    row_x = minx + np.arange(num_rows) * row_spacing
+
+    # Where each row first and last meets the boundary, from one pass over
+    # the edge/row pairs that overlap; rows that miss the polygon are skipped
+    ylo, yhi = _row_extents(ring_xy, ring_index, row_x)
+    spanned = yhi >= ylo
+    row_x, ylo, yhi = row_x[spanned], ylo[spanned], yhi[spanned]
+
+    convex = _is_convex(working_area)
+    if convex:
+        # Rows through an extreme vertex meet the polygon in a point;
+        # rounding can leave them a sub-nanometre span, which GEOS would
+        # not return
+        hit = yhi - ylo > 1e-9 * max(1.0, maxy - miny)
+        row_x, ylo, yhi = row_x[hit], ylo[hit], yhi[hit]
+    else:
+        # Sweep lines only over each row's own extent, with a margin so the
+        # ends stay outside the polygon for the GEOS clip below
+        ylo = ylo - row_spacing
+        yhi = yhi + row_spacing
+
+    coords = np.empty((len(row_x), 2, 2))
+    coords[:, :, 0] = row_x[:, None]
+    coords[:, 0, 1] = ylo
+    coords[:, 1, 1] = yhi
+    if not aligned:
+        coords = (coords - center) @ _rotation(-direction_deg) + center
+    corn_lines = shapely.linestrings(coords)
+
+    # A convex area is crossed in a single span, so its rows are already
+    # exact; anything else is clipped in one vectorized call
+    if not convex:
+        corn_lines = shapely.intersection(corn_lines, working_area)
+
+    # Rows that only touch the boundary clip to a point; drop those
+    corn_lines = corn_lines[shapely.length(corn_lines) > 0]
+    if len(corn_lines) == 0:
         return MultiLineString()
 
-    standing = unary_union(corn_lines)
+    # Parallel rows at distinct offsets never touch, so there is nothing
+    # to node or merge: collect the segments into one MultiLineString.
+    # A row grazing a vertex may also return a point or, once its ends are
+    # rotated back to world coordinates, a rounding-sized sliver; drop both.
+    segments = shapely.get_parts(corn_lines)
+    keep = shapely.length(segments) > 1e-9 * max(1.0, maxy - miny)
+    return shapely.multilinestrings(segments[keep])
+
 
-    # Rotate back to world coordinates
-    if direction_deg != 0:
-        standing = shapely_rotate(standing, -direction_deg, origin=(rot_cx, rot_cy))
+def _is_convex(geom: BaseGeometry) -> bool:
+    """True for a hole-free Polygon that matches its convex hull."""
+    if geom.geom_type != "Polygon" or len(geom.interiors) > 0:
+        return False
+    return geom.convex_hull.area - geom.area <= 1e-9 * geom.area
+
+
+def _row_extents(ring_xy: np.ndarray, ring_index: np.ndarray, row_x: np.ndarray):
+    """
+    Lowest and highest point where each vertical row meets the rings.
 
-    result = standing.intersection(working_area)
-    return result
+    *ring_xy* holds the ring vertices and *ring_index* the ring each vertex
+    belongs to, as returned by shapely.get_coordinates(..., return_index=True).
+    Edges are matched to the rows within their x-range with searchsorted on
+    the sorted *row_x*, so only overlapping edge/row pairs are evaluated.
+
+    Returns:
+        (ylo, yhi) arrays aligned with *row_x*; inf / -inf for rows that
+        miss every edge.
+    """
+    same_ring = ring_index[1:] == ring_index[:-1]
+    x0, y0 = ring_xy[:-1][same_ring].T
+    x1, y1 = ring_xy[1:][same_ring].T
+
+    first = np.searchsorted(row_x, np.minimum(x0, x1), side="left")
+    stop = np.searchsorted(row_x, np.maximum(x0, x1), side="right")
+    counts = stop - first
+    edge = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.cumsum(counts) - counts
+    row = first[edge] + (np.arange(int(counts.sum())) - np.repeat(offsets, counts))
+
+    # A vertical edge contributes its start here and its end through the
+    # next edge, so the whole edge is covered
+    x0, y0, x1, y1 = x0[edge], y0[edge], x1[edge], y1[edge]
+    dx = x1 - x0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y = np.where(dx != 0, y0 + (row_x[row] - x0) * (y1 - y0) / dx, y0)
+
+    ylo = np.full(len(row_x), np.inf)
+    yhi = np.full(len(row_x), -np.inf)
+    np.minimum.at(ylo, row, y)
+    np.maximum.at(yhi, row, y)
+    return ylo, yhi
+
+
+def _rotation(angle_deg: float) -> np.ndarray:
+    """
+    Matrix rotating row-vector coordinates counter-clockwise by *angle_deg*.
+
+    Used as (xy - origin) @ _rotation(angle) + origin, which matches
+    shapely.affinity.rotate.
+    """
+    theta = np.deg2rad(angle_deg)
+    c, s = np.cos(theta), np.sin(theta)
+    # Snap the rounding residue at multiples of 90 degrees, as shapely does,
+    # so rows lying on an axis-aligned boundary are kept
+    c = 0.0 if abs(c) < 2.5e-16 else c
+    s = 0.0 if abs(s) < 2.5e-16 else s
+    return np.array([[c, s], [-s, c]])
 
 
 # Lookup for algorithm selection
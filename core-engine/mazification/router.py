@@ -2,13 +2,55 @@
 Mazification API Router: Maze generation endpoints.
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
 from fastapi import APIRouter, HTTPException
 from state import app_state
 from .generators import ALGORITHMS
-from geometry.operations import flatten_geometry
+from geometry.operations import flatten_geometry, erase_lines
 
 router = APIRouter()
 
+# Generated (uncarved) walls kept by _generate_walls(), most recently used last.
+# Handlers run on the threadpool, so every access holds _walls_cache_lock.
+WALLS_CACHE_SIZE: int = 8
+_walls_cache: "OrderedDict" = OrderedDict()
+_walls_cache_lock = threading.Lock()
+
+# Parameters each algorithm accepts but ignores.  They are left out of the
+# cache key, and an algorithm that ignores the seed is cached unseeded too.
+_IGNORED_PARAMS = {"standing": {"spacing", "seed"}}
+
+
+def _generate_walls(field, algorithm: str, **params):
+    """
+    Run a generator, memoized on the field's WKB digest and the parameters.
+
+    The UI regenerates with unchanged settings after every field-level edit
+    (carving, undo, layer toggles).  Randomized algorithms are only cached
+    when seeded.
+    """
+    ignored = _IGNORED_PARAMS.get(algorithm, set())
+    if params.get("seed") is None and "seed" not in ignored:
+        return ALGORITHMS[algorithm](field, **params)
+
+    used = tuple(sorted((k, v) for k, v in params.items() if k not in ignored))
+    key = (hashlib.blake2b(field.wkb).digest(), algorithm, used)
+    with _walls_cache_lock:
+        walls = _walls_cache.get(key)
+        if walls is not None:
+            _walls_cache.move_to_end(key)
+            return walls
+
+    walls = ALGORITHMS[algorithm](field, **params)
+    with _walls_cache_lock:
+        _walls_cache[key] = walls
+        _walls_cache.move_to_end(key)
+        while len(_walls_cache) > WALLS_CACHE_SIZE:
+            _walls_cache.popitem(last=False)
+    return walls
+
 
 @router.get("/generate")
 def generate_maze(
@@ -52,48 +94,15 @@ def generate_maze(
         )
 
     try:
-        gen_func = ALGORITHMS[algorithm]
-
-        walls = gen_func(
+        return _build_maze(
             current_field,
+            algorithm,
             spacing=spacing,
             seed=seed,
             direction_deg=direction_deg,
             headland_inset=headland_inset,
             row_spacing=corn_row_spacing,
         )
-
-        # Store original uncarved walls for the restore/uncarve tool
-        app_state.original_walls = walls
-        headland_walls_raw = app_state.get_headland_walls()
-        if headland_walls_raw:
-            app_state.original_headland_walls = headland_walls_raw
-
-        # Re-apply any previously carved areas so carvings survive regeneration
-        carved_areas = app_state.get_carved_areas()
-        if carved_areas and not carved_areas.is_empty:
-            walls = walls.difference(carved_areas)
-
-        app_state.set_walls(walls)
-
-        # Include headland walls if they exist (set during planter grid computation)
-        # and also apply carved areas to them
-        headland_walls = app_state.get_headland_walls()
-        if headland_walls and carved_areas and not carved_areas.is_empty:
-            headland_walls = headland_walls.difference(carved_areas)
-            app_state.set_headland_walls(headland_walls)
-        headland_walls_flat = flatten_geometry(headland_walls) if headland_walls else []
-
-        # Serialize carved areas as WKT for frontend snapshot
-        carved_areas_wkt = carved_areas.wkt if carved_areas and not carved_areas.is_empty else ""
-
-        return {
-            "walls": flatten_geometry(walls),
-            "headlandWalls": headland_walls_flat,
-            "carvedAreas": carved_areas_wkt,
-            "algorithm": algorithm,
-        }
-
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -101,6 +110,43 @@ def generate_maze(
         )
 
 
+def _build_maze(current_field, algorithm: str, **params) -> dict:
+    """Generate walls, re-apply carvings and update app state; returns the response body."""
+    walls = _generate_walls(current_field, algorithm, **params)
+
+    # Store original uncarved walls for the restore/uncarve tool
+    app_state.original_walls = walls
+    headland_walls_raw = app_state.get_headland_walls()
+    if headland_walls_raw:
+        app_state.original_headland_walls = headland_walls_raw
+
+    # Re-apply any previously carved areas so carvings survive regeneration
+    carved_areas = app_state.get_carved_areas()
+    if carved_areas and not carved_areas.is_empty:
+        walls = erase_lines(walls, carved_areas)
+
+    # Measure once while generating so guidance start doesn't walk the walls
+    app_state.set_walls(walls, total_length=walls.length)
+
+    # Include headland walls if they exist (set during planter grid computation)
+    # and also apply carved areas to them
+    headland_walls = app_state.get_headland_walls()
+    if headland_walls and carved_areas and not carved_areas.is_empty:
+        headland_walls = erase_lines(headland_walls, carved_areas)
+        app_state.set_headland_walls(headland_walls)
+    headland_walls_flat = flatten_geometry(headland_walls) if headland_walls else []
+
+    # Serialize carved areas as WKT for frontend snapshot
+    carved_areas_wkt = carved_areas.wkt if carved_areas and not carved_areas.is_empty else ""
+
+    return {
+        "walls": flatten_geometry(walls),
+        "headlandWalls": headland_walls_flat,
+        "carvedAreas": carved_areas_wkt,
+        "algorithm": algorithm,
+    }
+
+
 @router.get("/algorithms")
 def list_algorithms():
     """List available maze generation algorithms."""
@@ -6,43 +6,267 @@ including field boundary, maze walls, design elements, layers,
 entrances/exits, and constraint settings.
 """
 
+import asyncio
+import gzip
+import hashlib
+import io
 import json
 import os
+import re
+import threading
+import zipfile
+import zlib
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Optional, List, Dict
+from typing import Optional, Dict, Tuple
 
-from fastapi import APIRouter, HTTPException
+import numpy as np
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
+from shapely.geometry import Polygon
+from shapely.geometry.base import BaseGeometry
 from state import app_state
-from geometry.operations import flatten_geometry
+from geometry.operations import flatten_geometry_ragged
 
 router = APIRouter()
 
 PROJECTS_DIR = Path.home() / ".corn-maze-cad" / "projects"
 AUTOSAVE_DIR = Path.home() / ".corn-maze-cad" / "autosave"
 
+# Project filenames are bare names: no separators, parent references or
+# drive prefixes (on Windows "D:name" would replace the directory's anchor)
+_UNSAFE_FILENAME = re.compile(r"\.\.|[/\\:\x00]")
+
+# Wall geometry is stored beside each project file as <name>.cmz.geom
+GEOMETRY_SUFFIX = ".geom"
+
+# Content hash of each sidecar this process last wrote, by path
+_geometry_hashes: Dict[str, str] = {}
+
+# Hash of the last autosave payload written, savedAt excluded
+_autosave_hash: Optional[str] = None
+
+# Held while an autosave is being written; payloads arriving meanwhile
+# replace _autosave_pending and are flushed as one write when it finishes
+_autosave_lock = asyncio.Lock()
+_autosave_pending: Optional[dict] = None
+
+# /autosave/check reply for a missing autosave, and the last positive reply
+# keyed by (path, mtime_ns, size)
+_NO_AUTOSAVE_JSON = b'{"exists":false}'
+_autosave_check: Optional[Tuple[Tuple[str, int, int], dict]] = None
+
+# Listing entries by path, reused while the file's (mtime_ns, size) holds
+_summary_cache: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+
+# Compact JSON keeps json on its C encoder; indent= falls back to the
+# pure-Python one, which is several times slower on large wall lists
+JSON_SEPARATORS = (",", ":")
+
+# Project JSON is stored gzip-compressed; files written before that are
+# plain JSON and are told apart by the gzip magic bytes
+GZIP_LEVEL = 6
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Errors from reading a damaged or truncated project file
+_READ_ERRORS = (json.JSONDecodeError, KeyError, OSError, EOFError, zlib.error)
+
 
 def _ensure_dirs():
     PROJECTS_DIR.mkdir(parents=True, exist_ok=True)
     AUTOSAVE_DIR.mkdir(parents=True, exist_ok=True)
 
 
-class ProjectData(BaseModel):
-    version: int = 2
-    name: str = "Untitled"
-    field: Optional[dict] = None
-    maze: Optional[dict] = None
-    designElements: List[dict] = []
-    layers: List[dict] = []
-    entrances: List[List[float]] = []
-    exits: List[List[float]] = []
-    emergencyExits: List[List[float]] = []
-    constraints: Optional[dict] = None
-    camera: Optional[dict] = None
-    gridSettings: Optional[dict] = None
-    difficultyPhases: List[dict] = []
-    metadata: Optional[dict] = None
+def _write_atomic(filepath: Path, data: bytes):
+    """
+    Replace *filepath* with *data* so readers never see a partial file.
+
+    The bytes go to a temp file in the same directory, are fsynced, and are
+    renamed over the target with os.replace; a crash mid-write leaves the
+    previous file intact.
+    """
+    tmp = filepath.with_name(f"{filepath.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, filepath)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _write_json(filepath: Path, project: dict):
+    """Write *project* as gzip-compressed compact JSON in a single write."""
+    data = json.dumps(project, separators=JSON_SEPARATORS).encode()
+    _write_atomic(filepath, gzip.compress(data, compresslevel=GZIP_LEVEL))
+
+
+def _read_json(filepath: Path) -> dict:
+    """Read a project file, compressed or plain."""
+    data = filepath.read_bytes()
+    if data[:2] == _GZIP_MAGIC:
+        data = gzip.decompress(data)
+    # Decode up front and drop the bytes, so they are not held alongside the
+    # parsed objects while json builds them
+    text = data.decode("utf-8")
+    del data
+    return json.loads(text)
+
+
+@lru_cache(maxsize=4)
+def _resolved_dir(directory: Path) -> Path:
+    """*directory* with symlinks resolved, computed once per directory."""
+    return directory.resolve()
+
+
+def _project_path(filename: str) -> Path:
+    """Path of a saved project, rejecting names that could leave PROJECTS_DIR."""
+    if not filename or _UNSAFE_FILENAME.search(filename):
+        raise HTTPException(status_code=400, detail={"error": "Invalid filename"})
+    filepath = PROJECTS_DIR / filename
+    # Containment check as well, in case the name check misses a
+    # platform-specific form or the entry is a symlink pointing elsewhere
+    if filepath.resolve().parent != _resolved_dir(PROJECTS_DIR):
+        raise HTTPException(status_code=400, detail={"error": "Invalid filename"})
+    return filepath
+
+
+def _ragged_lines(saved) -> Tuple[np.ndarray, np.ndarray]:
+    """Ragged coords/offsets of saved lines, from either on-disk layout."""
+    if isinstance(saved, dict):
+        return (
+            np.asarray(saved["coords"], dtype=float).reshape(-1, 2),
+            np.asarray(saved["offsets"], dtype=np.int64),
+        )
+
+    # Older files hold one [[x, y, ...], ...] list per line
+    segments = [seg for seg in saved if len(seg) >= 2]
+    offsets = np.zeros(len(segments) + 1, dtype=np.int64)
+    np.cumsum([len(seg) for seg in segments], out=offsets[1:])
+    coords = np.array([p[:2] for seg in segments for p in seg], dtype=float).reshape(-1, 2)
+    return coords, offsets
+
+
+def _geometry_path(filepath: Path) -> Path:
+    return filepath.with_name(filepath.name + GEOMETRY_SUFFIX)
+
+
+def _geometry_hash(arrays) -> str:
+    """Content hash of the sidecar arrays, as stored in _backend_geometry."""
+    digest = hashlib.blake2b(digest_size=8)
+    for name in sorted(arrays):
+        digest.update(name.encode())
+        digest.update(arrays[name].tobytes())
+    return digest.hexdigest()
+
+
+def _write_geometry(filepath: Path, geoms: Dict[str, Optional[BaseGeometry]]) -> Optional[dict]:
+    """
+    Store line geometries in the .geom sidecar of *filepath*.
+
+    The sidecar is an .npz of ragged coords/offsets per key.  It is only
+    rewritten when its content hash differs from the last write, so saves
+    that change UI state alone skip the heavy geometry.
+
+    Returns:
+        {"hash": ...} reference for the project JSON, or None when there is
+        no geometry (any stale sidecar is removed).
+    """
+    sidecar = _geometry_path(filepath)
+    arrays = {}
+    for key, geom in geoms.items():
+        if geom is not None and not geom.is_empty:
+            arrays[f"{key}_coords"], arrays[f"{key}_offsets"] = flatten_geometry_ragged(geom)
+    if not arrays:
+        sidecar.unlink(missing_ok=True)
+        _geometry_hashes.pop(str(sidecar), None)
+        return None
+
+    geometry_hash = _geometry_hash(arrays)
+    if _geometry_hashes.get(str(sidecar)) != geometry_hash or not sidecar.exists():
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        _write_atomic(sidecar, buffer.getvalue())
+        _geometry_hashes[str(sidecar)] = geometry_hash
+    return {"hash": geometry_hash}
+
+
+def _read_geometry(
+    filepath: Path, project: dict,
+) -> Tuple[Dict[str, Tuple[np.ndarray, np.ndarray]], Optional[str]]:
+    """
+    Ragged walls and headland walls saved with *project*, from its sidecar or inline.
+
+    The sidecar is only used when its content hash matches the one in the
+    project JSON.  A sidecar that is missing, unreadable, or left over from
+    a different save (say, one interrupted between the two writes) is
+    ignored.
+
+    Returns:
+        (geometry, warning): geometry by key, and a message when the
+        project's walls could not be restored.
+    """
+    saved = {}
+    warning = None
+    reference = project.get("_backend_geometry")
+    if reference:
+        sidecar = _geometry_path(filepath)
+        try:
+            with np.load(sidecar) as data:
+                arrays = {name: data[name] for name in data.files}
+        except (OSError, ValueError, EOFError, zipfile.BadZipFile, zlib.error):
+            arrays = None
+        if arrays is None:
+            warning = f"Wall geometry file {sidecar.name} is missing or unreadable; walls were not restored"
+        elif _geometry_hash(arrays) != reference.get("hash"):
+            warning = f"Wall geometry file {sidecar.name} does not match this project; walls were not restored"
+        else:
+            for key in ("walls", "headland_walls"):
+                if f"{key}_coords" in arrays:
+                    saved[key] = {"coords": arrays[f"{key}_coords"], "offsets": arrays[f"{key}_offsets"]}
+    # Projects saved before the sidecar embed the lines in the JSON
+    for key in ("walls", "headland_walls"):
+        if f"_backend_{key}" in project:
+            saved[key] = project[f"_backend_{key}"]
+
+    geometry = {}
+    for key, value in saved.items():
+        coords, offsets = _ragged_lines(value)
+        if len(offsets) > 1:
+            geometry[key] = (coords, offsets)
+    return geometry, warning
+
+
+def _restore_backend_state(filepath: Path, project: dict) -> Optional[str]:
+    """Put the walls, CRS, offset and carved polygons saved with *project* back into app_state.
+
+    Walls are handed over as ragged arrays; app_state builds the geometry
+    only when a later request asks for it.
+
+    Returns:
+        A warning when the saved walls could not be restored, else None.
+    """
+    geometry, warning = _read_geometry(filepath, project)
+    if "walls" in geometry:
+        app_state.set_walls_raw(*geometry["walls"])
+
+    if "headland_walls" in geometry:
+        app_state.set_headland_walls_raw(*geometry["headland_walls"])
+
+    if "_backend_crs" in project:
+        app_state.current_crs = project["_backend_crs"]
+
+    if "_backend_offset" in project:
+        app_state.centroid_offset = tuple(project["_backend_offset"])
+
+    if "_backend_carved_polygons" in project:
+        app_state.carved_polygons = list(project["_backend_carved_polygons"])
+
+    return warning
 
 
 class SaveRequest(BaseModel):
@@ -59,12 +283,7 @@ def save_project(req: SaveRequest):
     if not filename.endswith('.cmz'):
         filename += '.cmz'
 
-    # Prevent path traversal
-    if ".." in filename or "/" in filename or "\\" in filename:
-        raise HTTPException(status_code=400, detail={"error": "Invalid filename"})
-    filepath = PROJECTS_DIR / filename
-    if not str(filepath.resolve()).startswith(str(PROJECTS_DIR.resolve())):
-        raise HTTPException(status_code=400, detail={"error": "Invalid filename"})
+    filepath = _project_path(filename)
 
     project = {
         **req.projectData,
@@ -72,14 +291,13 @@ def save_project(req: SaveRequest):
         "savedAt": datetime.now(timezone.utc).isoformat(),
     }
 
-    # Include backend state (walls geometry)
-    walls = app_state.get_walls()
-    if walls and not walls.is_empty:
-        project["_backend_walls"] = flatten_geometry(walls)
-
-    headland_walls = app_state.get_headland_walls()
-    if headland_walls and not headland_walls.is_empty:
-        project["_backend_headland_walls"] = flatten_geometry(headland_walls)
+    # Include backend state (walls geometry, in the binary sidecar)
+    geometry = _write_geometry(filepath, {
+        "walls": app_state.get_walls(),
+        "headland_walls": app_state.get_headland_walls(),
+    })
+    if geometry:
+        project["_backend_geometry"] = geometry
 
     crs = app_state.get_crs()
     if crs:
@@ -93,8 +311,7 @@ def save_project(req: SaveRequest):
     if carved_polygons:
         project["_backend_carved_polygons"] = carved_polygons
 
-    with open(filepath, 'w') as f:
-        json.dump(project, f, indent=2)
+    _write_json(filepath, project)
 
     return {"success": True, "path": str(filepath), "filename": filename}
 
@@ -104,55 +321,26 @@ def load_project(filename: str):
     """Load a project from disk by filename."""
     _ensure_dirs()
 
-    # Prevent path traversal attacks
-    if ".." in filename or "/" in filename or "\\" in filename:
-        raise HTTPException(status_code=400, detail={"error": "Invalid filename"})
-
-    filepath = PROJECTS_DIR / filename
+    filepath = _project_path(filename)
     if not filepath.exists():
         raise HTTPException(status_code=404, detail={"error": f"Project not found: {filename}"})
 
-    with open(filepath, 'r') as f:
-        project = json.load(f)
-
-    # Restore backend state
-    if "_backend_walls" in project:
-        from shapely.geometry import MultiLineString, LineString
-        lines = []
-        for seg in project["_backend_walls"]:
-            if len(seg) >= 2:
-                lines.append(LineString([(p[0], p[1]) for p in seg]))
-        if lines:
-            app_state.set_walls(MultiLineString(lines))
-
-    if "_backend_headland_walls" in project:
-        from shapely.geometry import MultiLineString, LineString
-        h_lines = []
-        for seg in project["_backend_headland_walls"]:
-            if len(seg) >= 2:
-                h_lines.append(LineString([(p[0], p[1]) for p in seg]))
-        if h_lines:
-            app_state.set_headland_walls(MultiLineString(h_lines))
+    project = _read_json(filepath)
 
-    if "_backend_crs" in project:
-        app_state.current_crs = project["_backend_crs"]
-
-    if "_backend_offset" in project:
-        app_state.centroid_offset = tuple(project["_backend_offset"])
-
-    if "_backend_carved_polygons" in project:
-        app_state.carved_polygons = list(project["_backend_carved_polygons"])
+    warning = _restore_backend_state(filepath, project)
 
     # Restore field
     if project.get("field") and project["field"].get("geometry"):
-        from shapely.geometry import Polygon, shape
         geom_data = project["field"]["geometry"]
         if "exterior" in geom_data:
             field_geom = Polygon(geom_data["exterior"])
             crs = project["field"].get("crs", "EPSG:4326")
             app_state.set_field(field_geom, crs, app_state.centroid_offset)
 
-    return {"success": True, "project": project}
+    result = {"success": True, "project": project}
+    if warning:
+        result["warning"] = warning
+    return result
 
 
 @router.post("/load-boundary")
@@ -163,18 +351,12 @@ def load_boundary_from_project(filename: str):
     without touching any maze walls, design elements, or other project data.
     Intended for reusing a previously-imported field across multiple designs.
     """
-    if ".." in filename or "/" in filename or "\\" in filename:
-        raise HTTPException(status_code=400, detail={"error": "Invalid filename"})
-
-    filepath = PROJECTS_DIR / filename
-    if not str(filepath.resolve()).startswith(str(PROJECTS_DIR.resolve())):
-        raise HTTPException(status_code=400, detail={"error": "Invalid filename"})
+    filepath = _project_path(filename)
 
     if not filepath.exists():
         raise HTTPException(status_code=404, detail={"error": f"Project not found: {filename}"})
 
-    with open(filepath, 'r') as f:
-        project = json.load(f)
+    project = _read_json(filepath)
 
     if not project.get("field"):
         raise HTTPException(status_code=400, detail={"error": "Project contains no field boundary"})
@@ -188,7 +370,6 @@ def load_boundary_from_project(filename: str):
     # Restore field geometry to backend state
     field_data = project["field"]
     if field_data.get("geometry") and "exterior" in field_data["geometry"]:
-        from shapely.geometry import Polygon
         field_geom = Polygon(field_data["geometry"]["exterior"])
         crs = field_data.get("crs", "EPSG:4326")
         app_state.set_field(field_geom, crs, app_state.centroid_offset)
@@ -196,31 +377,48 @@ def load_boundary_from_project(filename: str):
     return {"success": True, "field": field_data}
 
 
+def _project_summary(f: Path, st: os.stat_result) -> dict:
+    """Listing entry for one saved project; unreadable files get placeholders."""
+    try:
+        data = _read_json(f)
+        return {
+            "filename": f.name,
+            "name": data.get("name", f.stem),
+            "savedAt": data.get("savedAt", ""),
+            "version": data.get("version", 1),
+            "size": st.st_size,
+        }
+    except _READ_ERRORS:
+        return {
+            "filename": f.name,
+            "name": f.stem,
+            "savedAt": "",
+            "version": 0,
+            "size": st.st_size,
+        }
+
+
 @router.get("/list")
 def list_projects():
     """List all saved projects."""
+    global _summary_cache
     _ensure_dirs()
 
+    # One stat per file serves both the newest-first order and the size
+    entries = [(f, f.stat()) for f in PROJECTS_DIR.glob("*.cmz")]
+    entries.sort(key=lambda entry: entry[1].st_mtime, reverse=True)
+
+    # Only files written since the last listing are parsed again; entries
+    # for files that are gone are dropped with the old cache
     projects = []
-    for f in sorted(PROJECTS_DIR.glob("*.cmz"), key=os.path.getmtime, reverse=True):
-        try:
-            with open(f, 'r') as fh:
-                data = json.load(fh)
-            projects.append({
-                "filename": f.name,
-                "name": data.get("name", f.stem),
-                "savedAt": data.get("savedAt", ""),
-                "version": data.get("version", 1),
-                "size": f.stat().st_size,
-            })
-        except (json.JSONDecodeError, KeyError, OSError):
-            projects.append({
-                "filename": f.name,
-                "name": f.stem,
-                "savedAt": "",
-                "version": 0,
-                "size": f.stat().st_size,
-            })
+    summaries = {}
+    for f, st in entries:
+        key = (st.st_mtime_ns, st.st_size)
+        cached = _summary_cache.get(str(f))
+        summary = cached[1] if cached is not None and cached[0] == key else _project_summary(f, st)
+        summaries[str(f)] = (key, summary)
+        projects.append(summary)
+    _summary_cache = summaries
 
     return {"projects": projects}
 
@@ -228,38 +426,69 @@ def list_projects():
 @router.delete("/delete")
 def delete_project(filename: str):
     """Delete a saved project."""
-    if ".." in filename or "/" in filename or "\\" in filename:
-        raise HTTPException(status_code=400, detail={"error": "Invalid filename"})
-
-    filepath = PROJECTS_DIR / filename
+    filepath = _project_path(filename)
     if not filepath.exists():
         raise HTTPException(status_code=404, detail={"error": f"Project not found: {filename}"})
 
     filepath.unlink()
+    _geometry_path(filepath).unlink(missing_ok=True)
     return {"success": True}
 
 
 @router.post("/autosave")
-def autosave(req: SaveRequest):
-    """Auto-save current project state for crash recovery."""
+async def autosave(request: Request):
+    """Auto-save current project state for crash recovery.
+
+    Takes the same body as /save.  It runs on every autosave tick, so the
+    body is parsed directly rather than through the SaveRequest model, and
+    the write happens on the threadpool.  Ticks that arrive while a write
+    is in progress are coalesced: only the newest of them is written, once
+    the current write finishes.
+    """
+    global _autosave_pending
+    try:
+        project_data = json.loads(await request.body()).get("projectData")
+    except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+        project_data = None
+    if not isinstance(project_data, dict):
+        raise HTTPException(status_code=400, detail={"error": "projectData must be an object"})
+
+    _autosave_pending = project_data
+    if _autosave_lock.locked():
+        return {"success": True, "path": str(AUTOSAVE_DIR / "autosave.cmz"), "coalesced": True}
+
+    async with _autosave_lock:
+        try:
+            while _autosave_pending is not None:
+                project_data, _autosave_pending = _autosave_pending, None
+                result = await run_in_threadpool(_write_autosave, project_data)
+        finally:
+            # If a write failed, drop payloads coalesced behind it rather
+            # than leave them for whichever tick comes next; every tick
+            # carries the full project, so the next one supersedes them
+            _autosave_pending = None
+    return result
+
+
+def _write_autosave(project_data: dict) -> dict:
+    global _autosave_hash
     _ensure_dirs()
 
     filepath = AUTOSAVE_DIR / "autosave.cmz"
 
     project = {
-        **req.projectData,
+        **project_data,
         "version": 2,
-        "savedAt": datetime.now(timezone.utc).isoformat(),
         "isAutosave": True,
     }
 
-    walls = app_state.get_walls()
-    if walls and not walls.is_empty:
-        project["_backend_walls"] = flatten_geometry(walls)
-
-    headland_walls = app_state.get_headland_walls()
-    if headland_walls and not headland_walls.is_empty:
-        project["_backend_headland_walls"] = flatten_geometry(headland_walls)
+    # Walls geometry goes to the binary sidecar
+    geometry = _write_geometry(filepath, {
+        "walls": app_state.get_walls(),
+        "headland_walls": app_state.get_headland_walls(),
+    })
+    if geometry:
+        project["_backend_geometry"] = geometry
 
     crs = app_state.get_crs()
     if crs:
@@ -273,8 +502,17 @@ def autosave(req: SaveRequest):
     if carved_polygons:
         project["_backend_carved_polygons"] = carved_polygons
 
-    with open(filepath, 'w') as f:
-        json.dump(project, f)
+    # Autosave runs on a timer whether or not anything changed; a payload
+    # identical to the last one written leaves the file untouched
+    payload_hash = hashlib.blake2b(
+        json.dumps(project, separators=JSON_SEPARATORS).encode(), digest_size=8,
+    ).hexdigest()
+    if payload_hash == _autosave_hash and filepath.exists():
+        return {"success": True, "path": str(filepath), "skipped": True}
+
+    project["savedAt"] = datetime.now(timezone.utc).isoformat()
+    _write_json(filepath, project)
+    _autosave_hash = payload_hash
 
     return {"success": True, "path": str(filepath)}
 
@@ -282,20 +520,30 @@ def autosave(req: SaveRequest):
 @router.get("/autosave/check")
 def check_autosave():
     """Check if an autosave exists for crash recovery."""
+    global _autosave_check
     filepath = AUTOSAVE_DIR / "autosave.cmz"
-    if not filepath.exists():
-        return {"exists": False}
+    try:
+        st = filepath.stat()
+    except FileNotFoundError:
+        # The usual answer, from pre-encoded bytes; a fresh Response each
+        # time because middleware may add headers to it
+        return Response(_NO_AUTOSAVE_JSON, media_type="application/json")
+
+    key = (str(filepath), st.st_mtime_ns, st.st_size)
+    if _autosave_check is not None and _autosave_check[0] == key:
+        return _autosave_check[1]
 
     try:
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        return {
-            "exists": True,
-            "savedAt": data.get("savedAt", ""),
-            "name": data.get("name", "Autosave"),
-        }
-    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        data = _read_json(filepath)
+    except _READ_ERRORS:
         return {"exists": False}
+    result = {
+        "exists": True,
+        "savedAt": data.get("savedAt", ""),
+        "name": data.get("name", "Autosave"),
+    }
+    _autosave_check = (key, result)
+    return result
 
 
 @router.post("/autosave/recover")
@@ -305,38 +553,13 @@ def recover_autosave():
     if not filepath.exists():
         raise HTTPException(status_code=404, detail={"error": "No autosave found"})
 
-    with open(filepath, 'r') as f:
-        project = json.load(f)
-
-    # Restore backend state same as load
-    if "_backend_walls" in project:
-        from shapely.geometry import MultiLineString, LineString
-        lines = []
-        for seg in project["_backend_walls"]:
-            if len(seg) >= 2:
-                lines.append(LineString([(p[0], p[1]) for p in seg]))
-        if lines:
-            app_state.set_walls(MultiLineString(lines))
-
-    if "_backend_headland_walls" in project:
-        from shapely.geometry import MultiLineString, LineString
-        h_lines = []
-        for seg in project["_backend_headland_walls"]:
-            if len(seg) >= 2:
-                h_lines.append(LineString([(p[0], p[1]) for p in seg]))
-        if h_lines:
-            app_state.set_headland_walls(MultiLineString(h_lines))
-
-    if "_backend_crs" in project:
-        app_state.current_crs = project["_backend_crs"]
-
-    if "_backend_offset" in project:
-        app_state.centroid_offset = tuple(project["_backend_offset"])
-
-    if "_backend_carved_polygons" in project:
-        app_state.carved_polygons = list(project["_backend_carved_polygons"])
+    project = _read_json(filepath)
 
-    return {"success": True, "project": project}
+    result = {"success": True, "project": project}
+    warning = _restore_backend_state(filepath, project)
+    if warning:
+        result["warning"] = warning
+    return result
 
 
 @router.delete("/autosave/clear")
@@ -345,4 +568,5 @@ def clear_autosave():
     filepath = AUTOSAVE_DIR / "autosave.cmz"
     if filepath.exists():
         filepath.unlink()
+    _geometry_path(filepath).unlink(missing_ok=True)
     return {"success": True}
@@ -5,9 +5,13 @@ Maintains the current field boundary, maze walls, coordinate system,
 layers, entrances/exits, and emergency exits.
 """
 
+import numpy as np
+import shapely
 from shapely.geometry.base import BaseGeometry
 from typing import Optional, List, Tuple, Dict
 
+from geometry.operations import lines_from_ragged
+
 
 class AppState:
     """
@@ -25,15 +29,49 @@ class AppState:
 
     _instance = None
 
+    # Fixed attribute layout: no per-instance __dict__, and a misspelled
+    # field assignment fails loudly instead of adding a stray attribute
+    __slots__ = (
+        "current_field",
+        "current_walls",
+        "walls_total_length",
+        "headland_walls",
+        "_walls_raw",
+        "_headland_walls_raw",
+        "current_crs",
+        "centroid_offset",
+        "_carved_edges",
+        "_carved_edges_pending",
+        "carved_areas",
+        "original_walls",
+        "original_headland_walls",
+        "layers",
+        "entrances",
+        "exits",
+        "emergency_exits",
+        "carved_paths",
+        "carved_polygons",
+        "_gps_transformer",
+        "_gps_transformer_crs",
+    )
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(AppState, cls).__new__(cls)
             cls._instance.current_field: Optional[BaseGeometry] = None
             cls._instance.current_walls: Optional[BaseGeometry] = None
+            cls._instance.walls_total_length: Optional[float] = None  # Cached current_walls.length
             cls._instance.headland_walls: Optional[BaseGeometry] = None
+            # Walls restored from a project as ragged (coords, offsets) arrays,
+            # turned into geometry on first get_walls() / get_headland_walls()
+            cls._instance._walls_raw: Optional[Tuple[np.ndarray, np.ndarray]] = None
+            cls._instance._headland_walls_raw: Optional[Tuple[np.ndarray, np.ndarray]] = None
             cls._instance.current_crs: Optional[str] = None
             cls._instance.centroid_offset: Optional[tuple] = None
-            cls._instance.carved_edges: Optional[BaseGeometry] = None
+            # Carved path boundaries: the merged union plus additions not yet
+            # merged into it (see the carved_edges property)
+            cls._instance._carved_edges: Optional[BaseGeometry] = None
+            cls._instance._carved_edges_pending: List[BaseGeometry] = []
             cls._instance.carved_areas: Optional[BaseGeometry] = None  # Union of carve eraser polygons
             cls._instance.original_walls: Optional[BaseGeometry] = None  # Uncarved walls for restore
             cls._instance.original_headland_walls: Optional[BaseGeometry] = None  # Uncarved headland walls
@@ -49,16 +87,29 @@ class AppState:
             # Kept separate from the merged carved_areas so the KML exporter can emit
             # one polygon placemark per element rather than one merged blob.
             cls._instance.carved_polygons: List[Dict] = []
+            # WGS84 -> current_crs transformer, rebuilt only when the CRS changes
+            cls._instance._gps_transformer = None
+            cls._instance._gps_transformer_crs: Optional[str] = None
         return cls._instance
 
     def set_field(self, field: BaseGeometry, crs: str, centroid_offset: tuple = None):
-        """Set the current field boundary, CRS, and centroid offset."""
+        """Set the current field boundary, CRS, and centroid offset.
+
+        The field is prepared in place, so every later predicate against it
+        (contains, intersects, ...) from any router reuses one spatial index
+        instead of rebuilding it per call.
+        """
+        if field is not None:
+            shapely.prepare(field)
         self.current_field = field
         self.current_crs = crs
         self.centroid_offset = centroid_offset or (0.0, 0.0)
         # Reset walls and carved edges when field changes
         self.current_walls = None
+        self.walls_total_length = None
         self.headland_walls = None
+        self._walls_raw = None
+        self._headland_walls_raw = None
         self.original_walls = None
         self.original_headland_walls = None
         self.carved_edges = None
@@ -66,9 +117,26 @@ class AppState:
         self.carved_paths = []
         self.carved_polygons = []
 
-    def set_walls(self, walls: BaseGeometry):
-        """Set the current maze walls."""
+    def set_walls(self, walls: BaseGeometry, total_length: Optional[float] = None):
+        """Set the current maze walls.
+
+        Pass *total_length* when the caller already knows the wall length so
+        later readers (e.g. GPS guidance start) skip the geometry traversal;
+        otherwise it is computed lazily on first use.
+        """
         self.current_walls = walls
+        self.walls_total_length = total_length
+        self._walls_raw = None
+
+    def set_walls_raw(self, coords: np.ndarray, offsets: np.ndarray):
+        """Set the maze walls from ragged line arrays, built into geometry on first use.
+
+        Restoring a project this way defers the GEOS construction until a
+        request actually needs the walls.
+        """
+        self.current_walls = None
+        self.walls_total_length = None
+        self._walls_raw = (coords, offsets)
 
     def get_field(self) -> Optional[BaseGeometry]:
         """Get the current field boundary."""
@@ -76,43 +144,104 @@ class AppState:
 
     def get_walls(self) -> Optional[BaseGeometry]:
         """Get the current maze walls."""
+        if self._walls_raw is not None:
+            self.current_walls = lines_from_ragged(*self._walls_raw)
+            self._walls_raw = None
         return self.current_walls
 
+    def get_walls_total_length(self) -> float:
+        """Get the total length of the current walls, cached until they change."""
+        walls = self.get_walls()
+        if walls is None:
+            return 0.0
+        if self.walls_total_length is None:
+            self.walls_total_length = walls.length
+        return self.walls_total_length
+
     def set_headland_walls(self, walls: BaseGeometry):
         """Set the current headland walls (concentric ring rows)."""
         self.headland_walls = walls
+        self._headland_walls_raw = None
+
+    def set_headland_walls_raw(self, coords: np.ndarray, offsets: np.ndarray):
+        """Set the headland walls from ragged line arrays, built on first use."""
+        self.headland_walls = None
+        self._headland_walls_raw = (coords, offsets)
 
     def get_headland_walls(self) -> Optional[BaseGeometry]:
         """Get the current headland walls."""
+        if self._headland_walls_raw is not None:
+            self.headland_walls = lines_from_ragged(*self._headland_walls_raw)
+            self._headland_walls_raw = None
         return self.headland_walls
 
     def get_crs(self) -> Optional[str]:
         """Get the current coordinate reference system."""
         return self.current_crs
 
+    def get_gps_transformer(self):
+        """Get a cached WGS84 (lon, lat) -> current CRS pyproj Transformer.
+
+        Parsing the CRS and building the projection pipeline costs far more
+        than a single transform, so it is done once per CRS rather than on
+        every GPS fix.  Returns None if no CRS is set.
+        """
+        if not self.current_crs:
+            return None
+        if self._gps_transformer_crs != self.current_crs:
+            import pyproj
+            self._gps_transformer = pyproj.Transformer.from_crs(
+                pyproj.CRS.from_epsg(4326), pyproj.CRS(self.current_crs), always_xy=True
+            )
+            self._gps_transformer_crs = self.current_crs
+        return self._gps_transformer
+
     def get_centroid_offset(self) -> tuple:
         """Get the centroid offset used for centering."""
         return self.centroid_offset or (0.0, 0.0)
 
+    @property
+    def carved_edges(self) -> Optional[BaseGeometry]:
+        """Accumulated carved path boundaries, merging pending additions in one union."""
+        if self._carved_edges_pending:
+            parts = self._carved_edges_pending
+            if self._carved_edges is not None:
+                parts = [self._carved_edges, *parts]
+            if len(parts) == 1:
+                self._carved_edges = parts[0]
+            else:
+                self._carved_edges = shapely.union_all(parts)
+            self._carved_edges_pending = []
+        return self._carved_edges
+
+    @carved_edges.setter
+    def carved_edges(self, edges: Optional[BaseGeometry]):
+        self._carved_edges = edges
+        self._carved_edges_pending = []
+
     def get_carved_edges(self) -> Optional[BaseGeometry]:
         """Get the accumulated carved path boundaries."""
         return self.carved_edges
 
     def add_carved_edges(self, new_edges: BaseGeometry):
-        """Add new carved path boundaries to the accumulated edges."""
-        from shapely.ops import unary_union
-        if self.carved_edges is None:
-            self.carved_edges = new_edges
-        else:
-            self.carved_edges = unary_union([self.carved_edges, new_edges])
+        """Add new carved path boundaries to the accumulated edges.
+
+        The union is deferred until the edges are read, so K carvings cost
+        one K-way union instead of K ever-growing pairwise ones.
+        """
+        self._carved_edges_pending.append(new_edges)
 
     def add_carved_area(self, eraser: BaseGeometry):
-        """Accumulate a carve eraser polygon so carvings persist across regeneration."""
-        from shapely.ops import unary_union
+        """Accumulate a carve eraser polygon so carvings persist across regeneration.
+
+        Unlike the carved edges this union is not deferred: /carve and
+        /carve-batch return the merged areas in the same response, so the
+        merge would run on every request anyway.
+        """
         if self.carved_areas is None:
             self.carved_areas = eraser
         else:
-            self.carved_areas = unary_union([self.carved_areas, eraser])
+            self.carved_areas = shapely.union_all([self.carved_areas, eraser])
 
     def set_carved_areas(self, areas: Optional[BaseGeometry]):
         """Set the carved areas directly (used for undo/redo restore)."""
@@ -185,7 +314,10 @@ class AppState:
         """Clear all state."""
         self.current_field = None
         self.current_walls = None
+        self.walls_total_length = None
         self.headland_walls = None
+        self._walls_raw = None
+        self._headland_walls_raw = None
         self.original_walls = None
         self.original_headland_walls = None
         self.current_crs = None
@@ -0,0 +1,45 @@
+"""Shared pytest configuration for the backend tests.
+
+``tests`` is a package, so pytest's default import mode puts its parent,
+``core-engine``, on ``sys.path`` once; test modules import ``state``,
+``geometry``, ... directly without touching the path themselves.
+
+The suite can run in parallel with pytest-xdist:
+
+    pytest -n auto --dist=loadgroup
+
+Modules that touch the AppState singleton are marked
+``xdist_group("appstate")`` so they always share one worker; every other
+test module is independent and spreads across the rest.
+
+Async tests run on anyio's pytest plugin with one asyncio event loop for
+the whole session, so module-scoped async fixtures such as the API client
+and the tests that use them all share it.
+
+Tests marked ``slow`` re-check results at full production fidelity and are
+deselected unless the ``-m`` expression names them, e.g. ``pytest -m slow``.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+def pytest_configure(config):
+    # Registered here too so the mark is known when xdist is not installed
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run all tests with this group name on one xdist worker"
+    )
+    config.addinivalue_line("markers", "slow: full-fidelity check, run only with -m slow")
+
+
+def pytest_collection_modifyitems(config, items):
+    if "slow" in config.getoption("markexpr"):
+        return
+    slow = [item for item in items if item.get_closest_marker("slow")]
+    if slow:
+        config.hook.pytest_deselected(items=slow)
+        items[:] = [item for item in items if not item.get_closest_marker("slow")]
@@ -1,51 +1,91 @@
 """Integration tests for FastAPI API endpoints."""
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import asyncio
+import copy
+import json
+import threading
 
 import pytest
-from fastapi.testclient import TestClient
-from state import AppState
+from httpx import ASGITransport, AsyncClient
+from main import app
+from shapely.geometry.base import BaseGeometry
+from state import AppState, app_state
+
+# Async tests run on anyio's bundled pytest plugin; AppState is shared,
+# so the module stays on one xdist worker
+pytestmark = [pytest.mark.anyio, pytest.mark.xdist_group("appstate")]
 
 
 @pytest.fixture(autouse=True)
 def fresh_state():
-    """Reset singleton between tests."""
-    AppState._instance = None
+    """Reset the singleton's data between tests without rebuilding it."""
+    state = AppState()
+    state.clear()
     yield
-    AppState._instance = None
+    state.clear()
 
 
-@pytest.fixture
-def client():
-    from main import app
-    return TestClient(app)
+@pytest.fixture(scope="module")
+async def client():
+    """One client for the whole module; the app carries no per-test state.
+
+    Requests go straight through the ASGI transport on the test's event
+    loop, without TestClient's thread portal. One warm-up request builds
+    Starlette's middleware stack here rather than inside the first test.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test", follow_redirects=True) as c:
+        await c.get("/health")
+        yield c
+
+
+@pytest.fixture(scope="module")
+async def demo_state(client):
+    """App state right after one demo field import, shared by the module."""
+    resp = await client.get("/gis/import-gps-data", params={"demo": True})
+    assert resp.status_code == 200
+    return {name: getattr(app_state, name) for name in AppState.__slots__}
 
 
 @pytest.fixture
-def loaded_client(client):
+def loaded_client(client, demo_state):
     """Client with a field already loaded."""
-    # Import demo data to set up field
-    resp = client.get("/gis/import-gps-data", params={"demo": True})
-    assert resp.status_code == 200
+    # Restore the demo import instead of re-projecting the field per test.
+    # Geometries are immutable and shared; containers are copied.
+    for name, value in demo_state.items():
+        if not isinstance(value, BaseGeometry):
+            value = copy.deepcopy(value)
+        setattr(app_state, name, value)
     return client
 
 
-def test_health(client):
-    resp = client.get("/health")
+async def test_health(client):
+    resp = await client.get("/health")
     assert resp.status_code == 200
     assert resp.json()["status"] == "ok"
 
 
-def test_root(client):
-    resp = client.get("/")
+async def test_root(client):
+    resp = await client.get("/")
     assert resp.status_code == 200
     assert "Corn Maze CAD Backend" in resp.json()["status"]
 
 
-def test_set_entrances_exits(loaded_client):
-    resp = loaded_client.post("/analysis/set-entrances-exits", json={
+async def test_legacy_path_redirects(client):
+    """Old flat paths redirect to their module routes, keeping the query."""
+    redirect, formats = await asyncio.gather(
+        client.get("/import-gps-data?demo=true", follow_redirects=False),
+        client.get("/supported-formats"),
+    )
+    assert redirect.status_code == 308
+    assert redirect.headers["location"] == "/gis/import-gps-data?demo=true"
+
+    assert formats.status_code == 200
+    assert "formats" in formats.json()
+
+
+async def test_set_entrances_exits(loaded_client):
+    resp = await loaded_client.post("/analysis/set-entrances-exits", json={
         "entrances": [[0, 50]],
         "exits": [[100, 50]],
     })
@@ -57,76 +97,74 @@ def test_set_entrances_exits(loaded_client):
     assert len(data["exits"]) == 1
 
 
-def test_get_entrances_exits(loaded_client):
-    loaded_client.post("/analysis/set-entrances-exits", json={
+async def test_get_entrances_exits(loaded_client):
+    await loaded_client.post("/analysis/set-entrances-exits", json={
         "entrances": [[10, 20]],
         "exits": [[90, 80]],
     })
-    resp = loaded_client.get("/analysis/entrances-exits")
+    resp = await loaded_client.get("/analysis/entrances-exits")
     assert resp.status_code == 200
     data = resp.json()
     assert len(data["entrances"]) == 1
     assert len(data["exits"]) == 1
 
 
-def test_set_emergency_exits(loaded_client):
-    resp = loaded_client.post("/analysis/set-emergency-exits", json={
+async def test_set_emergency_exits(loaded_client):
+    resp = await loaded_client.post("/analysis/set-emergency-exits", json={
         "positions": [[50, 0], [50, 100]],
     })
     assert resp.status_code == 200
     assert resp.json()["count"] == 2
 
 
-def test_get_emergency_exits(loaded_client):
-    loaded_client.post("/analysis/set-emergency-exits", json={
+async def test_get_emergency_exits(loaded_client):
+    await loaded_client.post("/analysis/set-emergency-exits", json={
         "positions": [[25, 0]],
     })
-    resp = loaded_client.get("/analysis/emergency-exits")
+    resp = await loaded_client.get("/analysis/emergency-exits")
     assert resp.status_code == 200
     # Response uses "positions" key
     assert len(resp.json()["positions"]) == 1
 
 
-def test_validate_constraints_no_maze(loaded_client):
+async def test_validate_constraints_no_maze(loaded_client):
     """Constraint validation with no maze should return 400 (no maze generated)."""
-    resp = loaded_client.post("/analysis/validate-constraints", json={})
+    resp = await loaded_client.post("/analysis/validate-constraints", json={})
     # Without walls, the endpoint returns 400
     assert resp.status_code == 400
     data = resp.json()
     assert "error" in data.get("detail", {})
 
 
-def test_project_list(client):
-    resp = client.get("/project/list")
+async def test_project_list(client):
+    resp = await client.get("/project/list")
     assert resp.status_code == 200
-    assert "projects" in resp.json()
+    assert b'"projects":' in resp.content
 
 
-def test_autosave_check(client):
-    resp = client.get("/project/autosave/check")
+async def test_autosave_check(client):
+    resp = await client.get("/project/autosave/check")
     assert resp.status_code == 200
-    assert "exists" in resp.json()
+    assert b'"exists":' in resp.content
 
 
-def test_export_gpx_no_field(client):
+async def test_export_gpx_no_field(client):
     """GPX export without a field should return error."""
-    resp = client.get("/export/gpx")
-    assert resp.status_code == 200
-    data = resp.json()
-    assert data.get("error") or data.get("success")
+    resp = await client.get("/export/gpx")
+    assert resp.status_code == 400
+    assert "error" in resp.json()["detail"]
 
 
-def test_export_dxf_no_field(client):
+async def test_export_dxf_no_field(client):
     """DXF export without a field should return error."""
-    resp = client.get("/export/dxf")
-    assert resp.status_code == 200
-    data = resp.json()
-    assert data.get("error") or data.get("success")
+    resp = await client.get("/export/dxf")
+    assert resp.status_code == 400
+    assert "error" in resp.json()["detail"]
 
 
-def test_guidance_status(client):
+async def test_guidance_status(client):
     """GPS guidance status should work even without active session."""
-    resp = client.get("/guidance/status")
+    resp = await client.get("/guidance/status")
     assert resp.status_code == 200
     data = resp.json()
     # Response uses "is_active" key
@@ -134,9 +172,9 @@ def test_guidance_status(client):
     assert data["is_active"] is False
 
 
-def test_planter_grid(loaded_client):
+async def test_planter_grid(loaded_client):
     """Planter-based row grid computation should work with loaded field."""
-    resp = loaded_client.post("/analysis/planter-grid", json={
+    resp = await loaded_client.post("/analysis/planter-grid", json={
         "planter_rows": 16,
         "spacing_inches": 30,
         "direction_deg": 0,
@@ -152,7 +190,27 @@ def test_planter_grid(loaded_client):
     assert data["planter_width"] > 0
 
 
-def test_import_satellite_boundary(client):
+async def test_generate_maze_reuses_cached_walls(loaded_client):
+    from mazification import router as maze_router
+
+    maze_router._walls_cache.clear()
+    params = {"corn_row_spacing": 0.762, "direction_deg": 30}
+    first = await loaded_client.get("/maze/generate", params=params)
+    assert first.status_code == 200
+    assert len(maze_router._walls_cache) == 1
+
+    second = await loaded_client.get("/maze/generate", params=params)
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert len(maze_router._walls_cache) == 1
+
+    # The standing-row generator ignores spacing and seed, so they share the entry
+    third = await loaded_client.get("/maze/generate", params={**params, "spacing": 25, "seed": 7})
+    assert third.json() == first.json()
+    assert len(maze_router._walls_cache) == 1
+
+
+async def test_import_satellite_boundary(client):
     """Import a field boundary from satellite-traced coordinates."""
     coords = [
         [-93.645, 42.025],
@@ -160,7 +218,7 @@ def test_import_satellite_boundary(client):
         [-93.640, 42.028],
         [-93.645, 42.028],
     ]
-    resp = client.post("/gis/import-satellite-boundary", json={"coordinates": coords})
+    resp = await client.post("/gis/import-satellite-boundary", json={"coordinates": coords})
     assert resp.status_code == 200
     data = resp.json()
     assert data["success"] is True
@@ -170,52 +228,284 @@ def test_import_satellite_boundary(client):
     assert data["source_format"] == "Satellite Trace"
 
 
-def test_import_satellite_boundary_too_few_points(client):
+async def test_import_satellite_boundary_too_few_points(client):
     """Should reject with fewer than 3 points."""
-    resp = client.post("/gis/import-satellite-boundary", json={"coordinates": [[-93.645, 42.025], [-93.640, 42.025]]})
+    resp = await client.post("/gis/import-satellite-boundary", json={"coordinates": [[-93.645, 42.025], [-93.640, 42.025]]})
     assert resp.status_code == 400
 
 
-def test_project_save_and_list(client):
+async def test_project_save_and_list(client):
     """Save a project and verify it appears in the list."""
-    save_resp = client.post("/project/save", json={
+    save_resp = await client.post("/project/save", json={
         "projectData": {"name": "Test Maze", "designElements": []},
         "filename": "test_integration.cmz",
     })
     assert save_resp.status_code == 200
     assert save_resp.json()["success"] is True
 
-    list_resp = client.get("/project/list")
+    list_resp = await client.get("/project/list")
     assert list_resp.status_code == 200
     filenames = [p["filename"] for p in list_resp.json()["projects"]]
     assert "test_integration.cmz" in filenames
 
     # Clean up
-    client.request("DELETE", "/project/delete", params={"filename": "test_integration.cmz"})
+    await client.delete("/project/delete", params={"filename": "test_integration.cmz"})
+
+
+@pytest.mark.parametrize("filename", ["../escape.cmz", "nested/a.cmz", "back\\slash.cmz", "D:evil.cmz", ""])
+async def test_project_endpoints_reject_unsafe_filenames(client, filename):
+    # Each call is rejected before touching the disk, so they can run together
+    params = {"filename": filename}
+    responses = await asyncio.gather(
+        client.post("/project/load", params=params),
+        client.post("/project/load-boundary", params=params),
+        client.delete("/project/delete", params=params),
+    )
+    assert [r.status_code for r in responses] == [400, 400, 400]
+
+
+def test_project_path_rejects_symlink_out_of_projects_dir(tmp_path, monkeypatch):
+    from fastapi import HTTPException
+    import project.router as project_router
+
+    projects = tmp_path / "projects"
+    projects.mkdir()
+    (tmp_path / "outside.cmz").write_text("{}")
+    (projects / "link.cmz").symlink_to(tmp_path / "outside.cmz")
+    monkeypatch.setattr(project_router, "PROJECTS_DIR", projects)
+
+    assert project_router._project_path("plain name é.cmz") == projects / "plain name é.cmz"
+    with pytest.raises(HTTPException):
+        project_router._project_path("link.cmz")
+
+
+def test_project_list_reuses_unchanged_summaries(tmp_path, monkeypatch):
+    import project.router as project_router
+
+    monkeypatch.setattr(project_router, "PROJECTS_DIR", tmp_path)
+    monkeypatch.setattr(project_router, "AUTOSAVE_DIR", tmp_path / "autosave")
+    (tmp_path / "a.cmz").write_text('{"name": "A", "version": 2}')
+    first = project_router.list_projects()["projects"]
+    assert [p["name"] for p in first] == ["A"]
+
+    parsed = []
+    summary = project_router._project_summary
+    monkeypatch.setattr(project_router, "_project_summary", lambda f, st: parsed.append(f.name) or summary(f, st))
+    assert project_router.list_projects()["projects"] == first
+    assert parsed == []
+
+    (tmp_path / "a.cmz").write_text('{"name": "Renamed", "version": 2}')
+    assert project_router.list_projects()["projects"][0]["name"] == "Renamed"
+    assert parsed == ["a.cmz"]
+
+
+def test_project_files_are_compressed_and_plain_files_still_read(tmp_path):
+    from project.router import _write_json, _read_json
+
+    project = {"name": "Packed", "designElements": [{"points": [[0.5, 1.5]] * 200}]}
+    _write_json(tmp_path / "packed.cmz", project)
+    packed = (tmp_path / "packed.cmz").read_bytes()
+    assert packed[:2] == b"\x1f\x8b"
+    assert len(packed) < len(str(project))
+    assert _read_json(tmp_path / "packed.cmz") == project
+
+    (tmp_path / "plain.cmz").write_text('{"name": "Plain"}')
+    assert _read_json(tmp_path / "plain.cmz") == {"name": "Plain"}
+
+
+def test_failed_write_keeps_previous_project_file(tmp_path, monkeypatch):
+    import project.router as project_router
+
+    target = tmp_path / "kept.cmz"
+    project_router._write_json(target, {"name": "Before"})
 
+    def fail(fd):
+        raise OSError("disk full")
 
-def test_autosave_cycle(client):
+    monkeypatch.setattr(project_router.os, "fsync", fail)
+    with pytest.raises(OSError):
+        project_router._write_json(target, {"name": "After"})
+    assert project_router._read_json(target) == {"name": "Before"}
+    assert [p.name for p in tmp_path.iterdir()] == ["kept.cmz"]
+
+
+def test_saved_walls_round_trip(tmp_path):
+    from shapely.geometry import MultiLineString
+    from geometry.operations import lines_from_ragged
+    from project.router import _write_geometry, _read_geometry, _geometry_path
+
+    walls = MultiLineString([[(0, 0), (0, 10)], [(1.5, 0), (1.5, 4), (2, 9)]])
+    filepath = tmp_path / "walls.cmz"
+    ref = _write_geometry(filepath, {"walls": walls, "headland_walls": None})
+    sidecar = _geometry_path(filepath)
+    restored, warning = _read_geometry(filepath, {"_backend_geometry": ref})
+    assert warning is None
+    assert list(restored) == ["walls"]
+    assert lines_from_ragged(*restored["walls"]).equals_exact(walls, 0)
+
+    # Unchanged geometry is not written again
+    sidecar.write_bytes(b"marker")
+    assert _write_geometry(filepath, {"walls": walls, "headland_walls": None}) == ref
+    assert sidecar.read_bytes() == b"marker"
+
+    # Projects saved before the sidecar store one point list per segment
+    legacy = [[[0, 0], [0, 10]], [[1.5, 0], [1.5, 4], [2, 9]], [[5, 5]]]
+    restored, warning = _read_geometry(tmp_path / "old.cmz", {"_backend_walls": legacy})
+    assert warning is None
+    assert lines_from_ragged(*restored["walls"]).equals_exact(walls, 0)
+
+
+def test_mismatched_or_missing_sidecar_is_reported(tmp_path, monkeypatch):
+    from shapely.geometry import LineString
+    import project.router as project_router
+
+    monkeypatch.setattr(project_router, "PROJECTS_DIR", tmp_path)
+    filepath = tmp_path / "paired.cmz"
+    ref = project_router._write_geometry(filepath, {"walls": LineString([(0, 0), (0, 10)])})
+    project_router._write_json(filepath, {"name": "Paired", "_backend_geometry": ref})
+
+    # A later save that crashed between the sidecar and the JSON write
+    project_router._write_geometry(filepath, {"walls": LineString([(5, 0), (5, 10)])})
+    geometry, warning = project_router._read_geometry(filepath, project_router._read_json(filepath))
+    assert geometry == {}
+    assert "does not match" in warning
+
+    # A project copied without its sidecar
+    project_router._geometry_path(filepath).unlink()
+    result = project_router.load_project("paired.cmz")
+    assert result["success"] is True
+    assert "missing" in result["warning"]
+
+
+async def test_autosave_skips_unchanged_payload(client, tmp_path, monkeypatch):
+    import project.router as project_router
+
+    monkeypatch.setattr(project_router, "AUTOSAVE_DIR", tmp_path)
+    monkeypatch.setattr(project_router, "_autosave_hash", None)
+    body = {"projectData": {"name": "Tick", "designElements": []}}
+    first = (await client.post("/project/autosave", json=body)).json()
+    assert "skipped" not in first
+    assert (await client.post("/project/autosave", json=body)).json()["skipped"] is True
+
+    body["projectData"]["name"] = "Tock"
+    assert "skipped" not in (await client.post("/project/autosave", json=body)).json()
+    assert (await client.get("/project/autosave/check")).json()["name"] == "Tock"
+
+
+@pytest.mark.parametrize("body", [b"not json", b"[]", b'{"projectData": 3}', b"{}"])
+async def test_autosave_rejects_malformed_body(client, body):
+    resp = await client.post("/project/autosave", content=body)
+    assert resp.status_code == 400
+
+
+class _AutosaveBody:
+    """Stand-in for the Request that /autosave reads its body from."""
+
+    def __init__(self, name):
+        self.data = json.dumps({"projectData": {"name": name}}).encode()
+
+    async def body(self):
+        return self.data
+
+
+def _blocking_writer(written, fail_on=None):
+    """Fake _write_autosave that holds each write until the test releases it."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def write(project_data):
+        started.set()
+        assert release.wait(5)
+        if project_data["name"] == fail_on:
+            raise OSError("disk full")
+        written.append(project_data["name"])
+        return {"success": True}
+
+    return write, started, release
+
+
+def test_overlapping_autosaves_are_coalesced(monkeypatch):
+    import project.router as project_router
+
+    written = []
+    write, started, release = _blocking_writer(written)
+
+    async def ticks():
+        first = asyncio.create_task(project_router.autosave(_AutosaveBody("one")))
+        assert await asyncio.to_thread(started.wait, 5)
+        later = [await project_router.autosave(_AutosaveBody(name)) for name in ("two", "three")]
+        release.set()
+        return await first, later
+
+    monkeypatch.setattr(project_router, "_write_autosave", write)
+    first, later = asyncio.run(ticks())
+    assert first == {"success": True}
+    assert all(r["coalesced"] for r in later)
+    assert written == ["one", "three"]
+
+
+def test_failed_autosave_drops_coalesced_payload(monkeypatch):
+    import project.router as project_router
+
+    written = []
+    write, started, release = _blocking_writer(written, fail_on="one")
+
+    async def ticks():
+        first = asyncio.create_task(project_router.autosave(_AutosaveBody("one")))
+        assert await asyncio.to_thread(started.wait, 5)
+        assert (await project_router.autosave(_AutosaveBody("two")))["coalesced"]
+        release.set()
+        with pytest.raises(OSError):
+            await first
+        assert project_router._autosave_pending is None
+        return await project_router.autosave(_AutosaveBody("three"))
+
+    monkeypatch.setattr(project_router, "_write_autosave", write)
+    assert asyncio.run(ticks()) == {"success": True}
+    assert written == ["three"]
+
+
+async def test_autosave_cycle(client):
     """Autosave, check, recover, clear cycle."""
     # Save
-    resp = client.post("/project/autosave", json={
+    resp = await client.post("/project/autosave", json={
         "projectData": {"name": "Autosave Test", "designElements": []},
     })
     assert resp.status_code == 200
 
     # Check
-    check = client.get("/project/autosave/check")
+    check = await client.get("/project/autosave/check")
     assert check.json()["exists"] is True
     assert check.json()["name"] == "Autosave Test"
 
     # Recover
-    recover = client.post("/project/autosave/recover")
+    recover = await client.post("/project/autosave/recover")
     assert recover.status_code == 200
     assert recover.json()["project"]["name"] == "Autosave Test"
 
     # Clear
-    clear = client.request("DELETE", "/project/autosave/clear")
+    clear = await client.delete("/project/autosave/clear")
     assert clear.status_code == 200
 
     # Verify cleared
-    check2 = client.get("/project/autosave/check")
+    check2 = await client.get("/project/autosave/check")
     assert check2.json()["exists"] is False
+
+
+async def test_carve_batch_defers_carved_edge_merge(loaded_client):
+    resp = await loaded_client.get("/maze/generate", params={"corn_row_spacing": 0.762})
+    assert resp.status_code == 200
+
+    for i, y in enumerate((-20.0, 20.0)):
+        element = {
+            "id": f"cut{i}", "type": "line", "points": [[-50.0, y], [50.0, y]],
+            "width": 3.0, "closed": False,
+        }
+        resp = await loaded_client.post("/geometry/carve-batch", json={"elements": [element]})
+        assert resp.status_code == 200
+        assert resp.json().get("error") is None
+
+    # Both batches wait for one union until validation reads the edges
+    assert len(app_state._carved_edges_pending) == 2
+    assert app_state.get_carved_edges().length > 0
+    assert app_state._carved_edges_pending == []
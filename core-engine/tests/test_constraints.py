@@ -1,15 +1,11 @@
 """Tests for the constraint validation engine."""
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 import pytest
 from shapely.geometry import Polygon, LineString, MultiLineString
 from constraints.engine import ConstraintEngine
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def engine():
     return ConstraintEngine(
         min_path_width=2.4,
@@ -20,12 +16,12 @@ def engine():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def large_field():
     return Polygon([(0, 0), (200, 0), (200, 200), (0, 200)])
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def small_field():
     return Polygon([(0, 0), (50, 0), (50, 50), (0, 50)])
 
@@ -64,6 +60,18 @@ def test_edge_buffer_ok(engine, large_field):
     assert len(violations) == 0
 
 
+def test_edge_inset_cached_per_field(engine, small_field):
+    from constraints.engine import _edge_inset
+
+    inset = _edge_inset(small_field, 3.0)
+    assert inset.bounds == pytest.approx((3.0, 3.0, 47.0, 47.0))
+    assert _edge_inset(small_field, 3.0) is inset
+    # An equal but distinct field is not served from the cache
+    assert _edge_inset(Polygon(small_field.exterior.coords), 3.0) is not inset
+    walls = MultiLineString([[(1, 1), (1, 40)]])
+    assert engine.check_edge_buffer(walls, small_field)[0]["type"] == "edge_buffer"
+
+
 def test_wall_too_thin(engine, large_field):
     """Two parallel wall segments closer than min_wall_width should violate."""
     walls = MultiLineString([
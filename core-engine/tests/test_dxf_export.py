@@ -1,40 +1,38 @@
 """Tests for DXF export."""
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 import tempfile
 from pathlib import Path
 import pytest
-from shapely.geometry import Polygon, MultiLineString
+from shapely.geometry import Polygon
 from export.dxf import export_maze_dxf
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def field():
     return Polygon([(0, 0), (100, 0), (100, 100), (0, 100)])
 
 
-@pytest.fixture
-def walls():
-    return MultiLineString([
-        [(10, 10), (90, 10)],
-        [(10, 50), (90, 50)],
-        [(10, 90), (90, 90)],
-    ])
+@pytest.fixture(scope="module")
+def carved_paths():
+    """Tractor passes as stored by /carve; corn-row walls are not exported."""
+    return [
+        {"points": [[10, 10], [90, 10]], "width": 3.0},
+        {"points": [[10, 50], [90, 50]], "width": 3.0},
+        {"points": [[10, 90], [90, 90]], "width": 3.0},
+    ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def output_dir():
+    """One directory per module; every test writes under its own base name."""
     with tempfile.TemporaryDirectory() as d:
         yield Path(d)
 
 
-def test_export_dxf(field, walls, output_dir):
+def test_export_dxf(field, carved_paths, output_dir):
     result = export_maze_dxf(
         field=field,
-        walls=walls,
+        carved_paths=carved_paths,
         base_name="test_maze",
         output_dir=output_dir,
     )
@@ -42,17 +40,20 @@ def test_export_dxf(field, walls, output_dir):
     assert Path(result["path"]).exists()
     assert result["path"].endswith(".dxf")
 
-    content = Path(result["path"]).read_text()
+    content = Path(result["path"]).read_bytes()
     # DXF files start with section headers
-    assert "SECTION" in content
-    assert "ENTITIES" in content
-    assert "LWPOLYLINE" in content
+    assert b"SECTION" in content
+    assert b"ENTITIES" in content
+    assert b"LWPOLYLINE" in content
+    # Each carved pass is written as a centerline and a cut polygon
+    assert content.count(b"\nCENTERLINES\n") >= len(carved_paths)
+    assert b"CutPathPolygons" in content
+    assert result["centerline_count"] == len(carved_paths)
 
 
-def test_export_dxf_with_annotations(field, walls, output_dir):
+def test_export_dxf_with_annotations(field, output_dir):
     result = export_maze_dxf(
         field=field,
-        walls=walls,
         entrances=[(0, 50)],
         exits=[(100, 50)],
         emergency_exits=[(50, 0)],
@@ -60,26 +61,26 @@ def test_export_dxf_with_annotations(field, walls, output_dir):
         output_dir=output_dir,
     )
     assert result["success"] is True
-    content = Path(result["path"]).read_text()
-    assert "ANNOTATIONS" in content
-    assert "ENTRANCE 1" in content
-    assert "EXIT 1" in content
-    assert "EMRG EXIT 1" in content
+    content = Path(result["path"]).read_bytes()
+    assert b"ANNOTATIONS" in content
+    assert b"ENTRANCE 1" in content
+    assert b"EXIT 1" in content
+    assert b"EMRG EXIT 1" in content
 
 
 def test_export_dxf_no_walls(field, output_dir):
     result = export_maze_dxf(
         field=field,
-        walls=None,
         base_name="test_no_walls",
         output_dir=output_dir,
     )
     assert result["success"] is True
-    content = Path(result["path"]).read_text()
-    assert "BOUNDARY" in content
+    content = Path(result["path"]).read_bytes()
+    assert b"BOUNDARY" in content
 
 
-def test_dxf_duplicate_filename(field, walls, output_dir):
-    r1 = export_maze_dxf(field, walls, base_name="dup", output_dir=output_dir)
-    r2 = export_maze_dxf(field, walls, base_name="dup", output_dir=output_dir)
+def test_dxf_duplicate_filename(field, output_dir, request):
+    base_name = request.node.name
+    r1 = export_maze_dxf(field, base_name=base_name, output_dir=output_dir)
+    r2 = export_maze_dxf(field, base_name=base_name, output_dir=output_dir)
     assert r1["path"] != r2["path"]
@@ -1,20 +1,18 @@
 """Tests for emergency exit analysis."""
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import json
 
 import pytest
 from shapely.geometry import Polygon, MultiLineString
 from analysis.emergency import analyze_emergency_exits, suggest_emergency_exits
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def field():
     return Polygon([(0, 0), (100, 0), (100, 100), (0, 100)])
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def simple_walls():
     return MultiLineString([
         [(20, 0), (20, 80)],
@@ -24,9 +22,29 @@ def simple_walls():
     ])
 
 
-def test_analyze_full_coverage(field):
+@pytest.fixture
+def coverage_resolution():
+    """Coarse grid for correctness checks; the fine grid runs only with -m slow."""
+    return 20.0
+
+
+def test_analyze_full_coverage(field, coverage_resolution):
     """With exits everywhere, coverage should be high."""
     exits = [(0, 0), (100, 0), (0, 100), (100, 100), (50, 50)]
+    result = analyze_emergency_exits(
+        walls=None,
+        field_boundary=field,
+        emergency_exits=exits,
+        max_distance=80.0,
+        resolution=coverage_resolution,
+    )
+    assert result["coverage_pct"] > 90
+
+
+@pytest.mark.slow
+def test_analyze_full_coverage_fine_grid(field):
+    """Full coverage still holds at the 5 m production grid."""
+    exits = [(0, 0), (100, 0), (0, 100), (100, 100), (50, 50)]
     result = analyze_emergency_exits(
         walls=None,
         field_boundary=field,
@@ -46,8 +64,9 @@ def test_analyze_no_exits(field):
         max_distance=50.0,
         resolution=5.0,
     )
-    # With no exits, min_distances stay at inf, so coverage is 0
     assert result["coverage_pct"] == 0
+    # Short-circuits before the grid, leaving nothing the JSON response can't encode
+    json.dumps(result, allow_nan=False)
 
 
 def test_analyze_single_exit(field):
@@ -81,7 +100,7 @@ def test_suggest_exits(field, simple_walls):
         assert 0 <= sy <= 100
 
 
-def test_suggest_exits_already_covered(field):
+def test_suggest_exits_already_covered(field, coverage_resolution):
     """If already covered, no suggestions needed."""
     exits = [(0, 0), (100, 0), (0, 100), (100, 100), (50, 50)]
     suggestions = suggest_emergency_exits(
@@ -89,6 +108,6 @@ def test_suggest_exits_already_covered(field):
         field_boundary=field,
         existing_exits=exits,
         max_distance=80.0,
-        resolution=5.0,
+        resolution=coverage_resolution,
     )
     assert len(suggestions) == 0
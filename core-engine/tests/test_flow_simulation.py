@@ -1,11 +1,8 @@
 """Tests for visitor flow simulation."""
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 import pytest
 from shapely.geometry import Polygon, MultiLineString
+import analysis.flow_simulation as flow_simulation
 from analysis.flow_simulation import simulate_visitor_flow
 
 
@@ -45,7 +42,7 @@ def test_basic_flow(field):
         field_boundary=field,
         entrances=[(0, 25)],
         exits=[(50, 25)],
-        num_visitors=20,
+        num_visitors=2,
         resolution=5.0,
         seed=42,
     )
@@ -53,11 +50,31 @@ def test_basic_flow(field):
     assert "bottlenecks" in result
     assert "avg_solve_steps" in result
     assert "completion_rate" in result
-    assert result["total_visitors"] == 20
+    assert result["total_visitors"] == 2
     assert result["completion_rate"] >= 0
     assert result["completion_rate"] <= 1
 
 
+@pytest.mark.slow
+def test_full_crowd_flow(field):
+    """A full crowd through a walled field, as the planner runs it."""
+    walls = MultiLineString([
+        [(25, 0), (25, 40)],
+    ])
+    result = simulate_visitor_flow(
+        walls=walls,
+        field_boundary=field,
+        entrances=[(0, 25)],
+        exits=[(50, 25)],
+        num_visitors=20,
+        resolution=5.0,
+        seed=42,
+    )
+    assert result["total_visitors"] == 20
+    assert 0 < result["completion_rate"] <= 1
+    assert len(result["heatmap"]) > 0
+
+
 def test_seeded_reproducibility(field):
     """Same seed should produce same results."""
     kwargs = dict(
@@ -65,7 +82,7 @@ def test_seeded_reproducibility(field):
         field_boundary=field,
         entrances=[(0, 25)],
         exits=[(50, 25)],
-        num_visitors=20,
+        num_visitors=2,
         resolution=5.0,
         seed=123,
     )
@@ -85,9 +102,41 @@ def test_flow_with_walls(field):
         field_boundary=field,
         entrances=[(0, 25)],
         exits=[(50, 25)],
-        num_visitors=15,
+        num_visitors=2,
         resolution=5.0,
         seed=42,
     )
     assert "heatmap" in result
-    assert result["total_visitors"] == 15
+    assert result["total_visitors"] == 2
+
+
+def test_python_walk_fallback(field, monkeypatch):
+    """Without numba the pure-Python walk should behave the same way."""
+    monkeypatch.setattr(flow_simulation, "_HAS_NUMBA", False)
+    kwargs = dict(
+        walls=None,
+        field_boundary=field,
+        entrances=[(0, 25)],
+        exits=[(50, 25)],
+        num_visitors=20,
+        resolution=5.0,
+        seed=7,
+    )
+    r1 = simulate_visitor_flow(**kwargs)
+    r2 = simulate_visitor_flow(**kwargs)
+    assert r1["completion_rate"] == 1.0
+    assert r1["avg_solve_steps"] == r2["avg_solve_steps"]
+
+
+def test_open_neighbors_matches_bounds_checks():
+    import numpy as np
+
+    grid = np.random.default_rng(3).random((7, 9)) < 0.3
+    valid = flow_simulation._open_neighbors(grid)
+    rows, cols = grid.shape
+    for r in range(rows):
+        for c in range(cols):
+            for d, (dr, dc) in enumerate(flow_simulation.NEIGHBORS):
+                nr, nc = r + dr, c + dc
+                expected = 0 <= nr < rows and 0 <= nc < cols and not grid[nr, nc]
+                assert valid[r, c, d] == expected
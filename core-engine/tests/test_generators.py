@@ -0,0 +1,59 @@
+"""Tests for standing corn-row generation."""
+
+import pytest
+from shapely.geometry import Polygon
+from mazification.generators import generate_standing_rows
+
+
+@pytest.fixture
+def field():
+    return Polygon([(0, 0), (100, 0), (100, 60), (0, 60)])
+
+
+def test_requires_row_spacing(field):
+    with pytest.raises(ValueError):
+        generate_standing_rows(field)
+
+
+def test_rows_follow_planting_direction(field):
+    rows = generate_standing_rows(field, row_spacing=10.0)
+    # North-south rows every 10 m, including the two lying on the boundary
+    assert len(rows.geoms) == 11
+    for line in rows.geoms:
+        (x1, y1), (x2, y2) = line.coords
+        assert x1 == x2
+        assert sorted([y1, y2]) == pytest.approx([0.0, 60.0])
+    assert rows.length == pytest.approx(11 * 60.0)
+
+
+def test_rotated_rows_stay_in_field(field):
+    rows = generate_standing_rows(field, direction_deg=90.0, row_spacing=10.0)
+    assert rows.length == pytest.approx(7 * 100.0, rel=1e-6)
+    assert field.buffer(1e-6).contains(rows)
+
+
+def test_headland_inset_shrinks_rows(field):
+    full = generate_standing_rows(field, row_spacing=5.0)
+    inset = generate_standing_rows(field, row_spacing=5.0, headland_inset=10.0)
+    assert inset.length < full.length
+    assert field.buffer(-10.0 + 1e-6).contains(inset)
+
+
+@pytest.mark.parametrize("direction", [0.0, 30.0, 90.0])
+def test_convex_fast_path_matches_geos_clip(monkeypatch, direction):
+    from mazification import generators
+
+    quad = Polygon([(0, 0), (120, 8), (110, 90), (4, 76)])
+    fast = generate_standing_rows(quad, direction_deg=direction, row_spacing=3.0)
+    monkeypatch.setattr(generators, "_is_convex", lambda geom: False)
+    clipped = generate_standing_rows(quad, direction_deg=direction, row_spacing=3.0)
+    assert len(fast.geoms) == len(clipped.geoms)
+    assert fast.equals_exact(clipped, 1e-7)
+
+
+def test_near_coincident_vertices_are_snapped(field):
+    # A digitised boundary repeating a corner a nanometre apart
+    noisy = Polygon([(0, 0), (100, 0), (100, 60), (100 - 1e-9, 60), (50, 70), (0, 60)])
+    clean = Polygon([(0, 0), (100, 0), (100, 60), (50, 70), (0, 60)])
+    rows = generate_standing_rows(noisy, row_spacing=5.0)
+    assert rows.equals_exact(generate_standing_rows(clean, row_spacing=5.0), 1e-9)
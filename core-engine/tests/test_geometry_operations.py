@@ -0,0 +1,74 @@
+"""Tests for geometry operations."""
+
+import pytest
+import numpy as np
+from shapely.geometry import Point, LineString, MultiLineString, GeometryCollection, box
+from shapely.ops import unary_union
+from geometry.operations import union_chunked, hilbert_order, erase_lines, headland_area, flatten_geometry
+
+
+def test_union_chunked_matches_unary_union():
+    discs = [Point(i * 1.5, (i % 7) * 1.5).buffer(1.0) for i in range(100)]
+    chunked = union_chunked(discs, chunk_size=8)
+    expected = unary_union(discs)
+    assert chunked.area == pytest.approx(expected.area)
+    assert chunked.symmetric_difference(expected).area < 1e-6
+
+
+def test_union_chunked_empty():
+    assert union_chunked([]).is_empty
+
+
+def test_hilbert_order_walks_neighbours():
+    cells = [box(i, j, i + 1, j + 1) for i in range(8) for j in range(8)]
+    order = hilbert_order(cells, bits=3)
+    assert sorted(order.tolist()) == list(range(64))
+    # Consecutive cells along the curve share an edge
+    corners = np.array([cells[i].bounds[:2] for i in order])
+    assert np.abs(np.diff(corners, axis=0)).sum(axis=1).max() == 1.0
+
+
+def test_erase_lines_only_cuts_touched_walls():
+    walls = MultiLineString([[(x, 0), (x, 100)] for x in range(0, 100, 10)])
+    eraser = box(15, 40, 35, 60)
+    erased = erase_lines(walls, eraser)
+    assert erased.equals(walls.difference(eraser))
+    # Untouched walls keep their position; cut walls are split in place
+    assert list(erased.geoms[0].coords) == [(0.0, 0.0), (0.0, 100.0)]
+    assert [g.coords[0][0] for g in erased.geoms][:4] == [0.0, 10.0, 20.0, 20.0]
+
+
+def test_erase_lines_miss_returns_input():
+    walls = MultiLineString([[(0, 0), (0, 10)], [(5, 0), (5, 10)]])
+    assert erase_lines(walls, box(50, 50, 60, 60)) is walls
+
+
+def test_headland_area_cached_per_field():
+    field = box(0, 0, 100, 60)
+    inset = headland_area(field, 5.0)
+    assert inset.bounds == pytest.approx((5.0, 5.0, 95.0, 55.0))
+    assert headland_area(field, 5.0) is inset
+    # An equal but distinct field is not served from the cache
+    assert headland_area(box(0, 0, 100, 60), 5.0) is not inset
+
+
+def test_headland_area_collapsed_or_disabled():
+    field = box(0, 0, 10, 10)
+    assert headland_area(field, 0.0) is None
+    assert headland_area(field, 6.0) is None
+
+
+def test_flatten_geometry_keeps_line_order_through_collections():
+    geom = GeometryCollection([
+        Point(1, 1),
+        LineString([(0, 0), (1, 0)]),
+        MultiLineString([[(5, 5), (6, 6), (7, 6)]]),
+        box(0, 0, 1, 1),
+        GeometryCollection([LineString([(9, 9), (8, 8)])]),
+    ])
+    assert flatten_geometry(geom) == [
+        [(0.0, 0.0), (1.0, 0.0)],
+        [(5.0, 5.0), (6.0, 6.0), (7.0, 6.0)],
+        [(9.0, 9.0), (8.0, 8.0)],
+    ]
+    assert flatten_geometry(None) == []
@@ -0,0 +1,207 @@
+"""Tests for GPS cutting guidance."""
+
+import json
+import pytest
+import numpy as np
+import pyproj
+from shapely.geometry import Polygon, MultiLineString
+from state import app_state
+from gps_guidance.router import (
+    guidance_state,
+    start_guidance,
+    stop_guidance,
+    get_guidance_status,
+    update_position,
+    update_positions,
+    suggest_next_path,
+    mark_cut,
+    mark_cut_by_id,
+    list_segments,
+    StartGuidanceRequest,
+    PositionUpdate,
+    PositionBatch,
+    MarkCutRequest,
+    MarkCutByIdRequest,
+    CUT_BUFFER_CAPACITY,
+)
+from gps_guidance.segments import point_segment_distances, nearest_segment
+
+# Tests drive the shared app_state, so keep them on one xdist worker
+pytestmark = pytest.mark.xdist_group("appstate")
+
+CRS = "EPSG:32615"
+OFFSET = (500000.0, 4500000.0)
+
+
+def _gps_fix(x, y):
+    """Build a PositionUpdate for design coordinates (x, y)."""
+    to_wgs = pyproj.Transformer.from_crs(CRS, "EPSG:4326", always_xy=True)
+    lon, lat = to_wgs.transform(x + OFFSET[0], y + OFFSET[1])
+    return PositionUpdate(latitude=lat, longitude=lon)
+
+
+def _body(response):
+    """Decode a cached JSON Response."""
+    return json.loads(response.body)
+
+
+@pytest.fixture(autouse=True)
+def maze():
+    """Load a small field with three vertical walls and start guidance."""
+    app_state.clear()
+    field = Polygon([(0, 0), (100, 0), (100, 100), (0, 100)])
+    app_state.set_field(field, CRS, OFFSET)
+    app_state.set_walls(MultiLineString([
+        [(20, 0), (20, 100)],
+        [(50, 0), (50, 100)],
+        [(80, 0), (80, 50), (90, 50)],
+    ]))
+    start_guidance(StartGuidanceRequest())
+    yield
+    guidance_state.reset()
+    app_state.clear()
+
+
+def test_start_indexes_walls():
+    assert len(guidance_state.lines) == 3
+    assert guidance_state.tree is not None
+
+
+def test_start_precomputes_lengths():
+    assert list(guidance_state.line_lengths) == [100.0, 100.0, 60.0]
+    assert guidance_state.total_path_length == pytest.approx(260.0)
+
+
+def test_update_position_nearest_distance():
+    result = update_position(_gps_fix(51.0, 30.0))
+    assert result["nearest_wall_distance"] == pytest.approx(1.0, abs=0.05)
+    assert result["on_path"] is True
+
+    result = update_position(_gps_fix(35.0, 30.0))
+    assert result["nearest_wall_distance"] == pytest.approx(15.0, abs=0.05)
+    assert result["on_path"] is False
+
+
+def test_update_positions_batch():
+    fixes = [_gps_fix(51.0, 30.0), _gps_fix(35.0, 30.0), _gps_fix(84.0, 40.0)]
+    positions = update_positions(PositionBatch(points=fixes))["positions"]
+    assert [p["nearest_wall_distance"] for p in positions] == pytest.approx(
+        [1.0, 15.0, 4.0], abs=0.05
+    )
+    assert [p["on_path"] for p in positions] == [True, False, False]
+    assert guidance_state.current_position == pytest.approx([84.0, 40.0], abs=0.05)
+
+
+def test_next_path_suggests_nearest_line():
+    update_position(_gps_fix(84.0, 40.0))
+    suggestion = _body(suggest_next_path())["suggestion"]
+    assert suggestion["start"] == [80.0, 0.0]
+    assert suggestion["end"] == [90.0, 50.0]
+    assert suggestion["distance"] == pytest.approx(4.0, abs=0.05)
+
+
+def test_mark_cut_accumulates():
+    result = mark_cut(MarkCutRequest(startX=35, startY=0, endX=35, endY=26))
+    assert result["segment_id"] is None
+    assert result["segment_length"] == 26.0
+    assert result["completion_pct"] == 10.0
+    assert guidance_state.cut_segments.tolist() == [[35.0, 0.0, 35.0, 26.0]]
+
+
+def test_mark_cut_snaps_to_wall_line():
+    result = mark_cut(MarkCutRequest(startX=20, startY=0, endX=20, endY=5))
+    assert result["segment_id"] == 0
+    assert result["already_cut"] is False
+    assert result["segment_length"] == 100.0
+    assert result["total_cut"] == 100.0
+    assert guidance_state.cut_segments.tolist() == [[20.0, 0.0, 20.0, 100.0]]
+    assert list_segments()["segments"][0]["cut"] is True
+
+    again = mark_cut(MarkCutRequest(startX=20, startY=0, endX=20, endY=5))
+    assert again["already_cut"] is True
+    assert again["total_cut"] == 100.0
+
+
+def test_mark_cut_and_by_id_credit_line_once():
+    mark_cut_by_id(MarkCutByIdRequest(segment_id=1))
+    result = mark_cut(MarkCutRequest(startX=50, startY=10, endX=50, endY=15))
+    assert result["segment_id"] == 1
+    assert result["already_cut"] is True
+    assert result["total_cut"] == 100.0
+
+    mark_cut(MarkCutRequest(startX=20, startY=40, endX=20, endY=45))
+    again = mark_cut_by_id(MarkCutByIdRequest(segment_id=0))
+    assert again["already_cut"] is True
+    assert again["total_cut"] == 200.0
+    assert guidance_state.cut_path_length == pytest.approx(guidance_state.line_lengths[:2].sum())
+
+
+def test_mark_cut_by_id():
+    result = mark_cut_by_id(MarkCutByIdRequest(segment_id=2))
+    assert result["already_cut"] is False
+    assert result["total_cut"] == 60.0
+    assert result["completion_pct"] == pytest.approx(23.1)
+
+    again = mark_cut_by_id(MarkCutByIdRequest(segment_id=2))
+    assert again["already_cut"] is True
+    assert again["total_cut"] == 60.0
+
+
+def test_next_path_skips_cut_lines():
+    update_position(_gps_fix(84.0, 40.0))
+    mark_cut_by_id(MarkCutByIdRequest(segment_id=2))
+    suggestion = _body(suggest_next_path())["suggestion"]
+    assert suggestion["start"] == [50.0, 0.0]
+    assert suggestion["distance"] == pytest.approx(34.0, abs=0.05)
+
+    mark_cut_by_id(MarkCutByIdRequest(segment_id=0))
+    mark_cut_by_id(MarkCutByIdRequest(segment_id=1))
+    assert _body(suggest_next_path())["suggestion"] is None
+
+
+def test_cut_buffer_grows():
+    for i in range(CUT_BUFFER_CAPACITY + 1):
+        guidance_state.add_cut(0, i, 1, i)
+    assert len(guidance_state.cut_segments) == CUT_BUFFER_CAPACITY + 1
+    assert guidance_state.cut_segments[-1].tolist() == [0, CUT_BUFFER_CAPACITY, 1, CUT_BUFFER_CAPACITY]
+    assert guidance_state.cut_path_length == CUT_BUFFER_CAPACITY + 1
+
+
+def test_status_cached_until_state_changes():
+    first = get_guidance_status()
+    assert get_guidance_status().body is first.body
+
+    update_position(_gps_fix(51.0, 30.0))
+    updated = get_guidance_status()
+    assert updated.body is not first.body
+    assert _body(updated)["current_position"] == pytest.approx([51.0, 30.0], abs=0.05)
+
+    mark_cut_by_id(MarkCutByIdRequest(segment_id=0))
+    assert _body(get_guidance_status())["segments_cut"] == 1
+
+
+def test_stop_clears_index():
+    stop_guidance()
+    assert guidance_state.tree is None
+    assert guidance_state.lines == []
+    assert len(guidance_state.line_lengths) == 0
+
+
+def test_point_segment_distances():
+    p0 = np.array([[0.0, 0.0], [0.0, 0.0], [5.0, 5.0]])
+    p1 = np.array([[10.0, 0.0], [0.0, 10.0], [5.0, 5.0]])
+    # Projection onto the interior, past an endpoint, and a degenerate segment
+    d = point_segment_distances(p0, p1, 12.0, 3.0)
+    assert d == pytest.approx([np.hypot(2.0, 3.0), 12.0, np.hypot(7.0, 2.0)])
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_nearest_segment_matches_numpy_kernel(dtype):
+    rng = np.random.default_rng(0)
+    p0 = rng.uniform(0, 100, (200, 2)).astype(dtype)
+    p1 = rng.uniform(0, 100, (200, 2)).astype(dtype)
+    idx, dist = nearest_segment(p0, p1, 40.0, 60.0)
+    distances = point_segment_distances(p0, p1, 40.0, 60.0)
+    assert distances.dtype == dtype
+    assert idx == int(distances.argmin())
+    assert dist == pytest.approx(float(distances.min()), rel=1e-5)
@@ -1,9 +1,5 @@
 """Tests for GPX export."""
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 import tempfile
 from pathlib import Path
 import pytest
@@ -11,7 +7,7 @@ from shapely.geometry import Polygon, MultiLineString
 from export.gpx import export_boundary_gpx, export_walls_gpx, export_cutting_guide_gpx
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def field():
     """A simple field in UTM Zone 15N coordinates."""
     return Polygon([
@@ -19,7 +15,7 @@ def field():
     ])
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def walls():
     return MultiLineString([
         [(10, 10), (90, 10)],
@@ -27,13 +23,25 @@ def walls():
     ])
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
+def carved_paths():
+    """Tractor passes as stored by /carve."""
+    return [
+        {"points": [[10, 10], [90, 10]], "width": 3.0},
+        {"points": [[10, 50], [90, 50]], "width": 3.0},
+    ]
+
+
+@pytest.fixture(scope="module")
 def output_dir():
+    """One directory per module; every test writes under its own base name."""
     with tempfile.TemporaryDirectory() as d:
         yield Path(d)
 
 
-def test_export_boundary_gpx(field, output_dir):
+@pytest.fixture(scope="module")
+def boundary_export(field, output_dir):
+    """One boundary export shared by the boundary checks: (result, file bytes)."""
     result = export_boundary_gpx(
         field=field,
         crs="EPSG:32615",
@@ -41,18 +49,12 @@ def test_export_boundary_gpx(field, output_dir):
         base_name="test_boundary",
         output_dir=output_dir,
     )
-    assert result["success"] is True
-    assert Path(result["path"]).exists()
-
-    content = Path(result["path"]).read_text()
-    assert '<?xml version="1.0"' in content
-    assert '<gpx' in content
-    assert '<rte>' in content
-    assert '<rtept' in content
-    assert 'Field Boundary' in content
+    return result, Path(result["path"]).read_bytes()
 
 
-def test_export_walls_gpx(walls, output_dir):
+@pytest.fixture(scope="module")
+def walls_export(walls, output_dir):
+    """One walls export shared by the walls checks: (result, file bytes)."""
     result = export_walls_gpx(
         walls=walls,
         crs="EPSG:32615",
@@ -60,21 +62,47 @@ def test_export_walls_gpx(walls, output_dir):
         base_name="test_walls",
         output_dir=output_dir,
     )
+    return result, Path(result["path"]).read_bytes()
+
+
+def test_export_boundary_gpx(boundary_export):
+    result, _ = boundary_export
+    assert result["success"] is True
+    assert Path(result["path"]).exists()
+
+
+def test_boundary_is_gpx_document(boundary_export):
+    _, content = boundary_export
+    assert b'<?xml version="1.0"' in content
+    assert b'<gpx' in content
+
+
+def test_boundary_has_named_route(boundary_export):
+    _, content = boundary_export
+    assert b'<rte>' in content
+    assert b'<rtept' in content
+    assert b'Field Boundary' in content
+
+
+def test_export_walls_gpx(walls_export):
+    result, _ = walls_export
     assert result["success"] is True
     assert result["track_count"] == 2
     assert Path(result["path"]).exists()
 
-    content = Path(result["path"]).read_text()
-    assert '<trk>' in content
-    assert '<trkpt' in content
+
+def test_walls_have_tracks(walls_export):
+    _, content = walls_export
+    assert b'<trk>' in content
+    assert b'<trkpt' in content
 
 
-def test_export_cutting_guide_gpx(field, walls, output_dir):
+def test_export_cutting_guide_gpx(field, carved_paths, output_dir):
     result = export_cutting_guide_gpx(
         field=field,
-        walls=walls,
         crs="EPSG:32615",
         centroid_offset=(500000, 4500000),
+        carved_paths=carved_paths,
         entrances=[(0, 50)],
         exits=[(100, 50)],
         base_name="test_guide",
@@ -82,31 +110,46 @@ def test_export_cutting_guide_gpx(field, walls, output_dir):
     )
     assert result["success"] is True
     assert result["waypoint_count"] == 2  # 1 entrance + 1 exit
-    assert result["track_count"] == 2     # 2 wall segments
+    assert result["cut_path_count"] == 2  # 2 carved passes
 
-    content = Path(result["path"]).read_text()
-    assert '<wpt' in content
-    assert 'Entrance 1' in content
-    assert 'Exit 1' in content
+    content = Path(result["path"]).read_bytes()
+    assert b'<wpt' in content
+    assert b'Entrance 1' in content
+    assert b'Exit 1' in content
+    assert content.count(b'<trk>') == 2
+    assert b'<name>Cut Path 2</name>' in content
+    assert b'<cmt>width: 3.00 m</cmt>' in content
 
 
-def test_export_cutting_guide_no_walls(field, output_dir):
+def test_export_cutting_guide_no_cut_paths(field, output_dir):
     result = export_cutting_guide_gpx(
         field=field,
-        walls=None,
         crs="EPSG:32615",
         centroid_offset=(500000, 4500000),
-        base_name="test_no_walls",
+        base_name="test_no_cut_paths",
         output_dir=output_dir,
     )
     assert result["success"] is True
-    assert result["track_count"] == 0
+    assert result["cut_path_count"] == 0
+
+    content = Path(result["path"]).read_bytes()
+    assert b'<trk>' not in content
+    assert b'Field Boundary' in content
 
 
-def test_duplicate_filename_handling(field, output_dir):
+def test_duplicate_filename_handling(field, output_dir, request):
     """Second export should get a timestamped filename."""
-    r1 = export_boundary_gpx(field, "EPSG:32615", (500000, 4500000), "dup_test", output_dir)
-    r2 = export_boundary_gpx(field, "EPSG:32615", (500000, 4500000), "dup_test", output_dir)
+    base_name = request.node.name
+    r1 = export_boundary_gpx(field, "EPSG:32615", (500000, 4500000), base_name, output_dir)
+    r2 = export_boundary_gpx(field, "EPSG:32615", (500000, 4500000), base_name, output_dir)
     assert r1["path"] != r2["path"]
     assert Path(r1["path"]).exists()
     assert Path(r2["path"]).exists()
+
+
+def test_wgs84_transformer_built_once_per_crs():
+    from export.gpx import _wgs84_transformer
+
+    transformer = _wgs84_transformer("EPSG:32615")
+    assert _wgs84_transformer("EPSG:32615") is transformer
+    assert _wgs84_transformer("EPSG:32616") is not transformer
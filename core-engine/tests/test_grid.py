@@ -0,0 +1,51 @@
+"""Tests for the shared analysis cell grid."""
+
+import numpy as np
+from shapely.geometry import Point, Polygon
+from analysis.grid import cell_centers, inside_mask, polygon_mask
+
+
+def _grid(geom, resolution):
+    minx, miny, maxx, maxy = geom.bounds
+    cols = max(1, int((maxx - minx) / resolution))
+    rows = max(1, int((maxy - miny) / resolution))
+    return minx, miny, rows, cols
+
+
+def test_polygon_mask_matches_contains():
+    # Vertices off the cell lattice so no centre sits exactly on an edge
+    field = Polygon([(0.3, 0.7), (90.1, 10.4), (120.6, 80.2), (40.9, 110.3), (10.2, 60.8)])
+    field = field.difference(Point(60, 50).buffer(15))
+    minx, miny, rows, cols = _grid(field, 1.3)
+    xs, ys = cell_centers(minx, miny, rows, cols, 1.3)
+    mask = polygon_mask(field, minx, miny, rows, cols, 1.3)
+    assert np.array_equal(mask, inside_mask(field, xs, ys))
+
+
+def test_polygon_mask_multipolygon():
+    parts = Point(0, 0).buffer(10).union(Point(40, 0).buffer(10))
+    minx, miny, rows, cols = _grid(parts, 0.5)
+    xs, ys = cell_centers(minx, miny, rows, cols, 0.5)
+    mask = polygon_mask(parts, minx, miny, rows, cols, 0.5)
+    assert mask.any()
+    assert np.array_equal(mask, inside_mask(parts, xs, ys))
+
+
+def test_polygon_mask_numpy_fallback(monkeypatch):
+    import analysis.grid as grid
+
+    field = Point(0.2, 0.1).buffer(25).difference(Point(5.3, 4.9).buffer(6))
+    minx, miny, rows, cols = _grid(field, 0.7)
+    expected = polygon_mask(field, minx, miny, rows, cols, 0.7)
+    monkeypatch.setattr(grid, "_HAS_NUMBA", False)
+    assert np.array_equal(polygon_mask(field, minx, miny, rows, cols, 0.7), expected)
+
+
+def test_polygon_mask_parallel_sweep(monkeypatch):
+    import analysis.grid as grid
+
+    field = Point(0.2, 0.1).buffer(25).difference(Point(5.3, 4.9).buffer(6))
+    minx, miny, rows, cols = _grid(field, 0.7)
+    expected = polygon_mask(field, minx, miny, rows, cols, 0.7)
+    monkeypatch.setattr(grid, "PARALLEL_FILL_MIN_CELLS", 0)
+    assert np.array_equal(polygon_mask(field, minx, miny, rows, cols, 0.7), expected)
@@ -0,0 +1,41 @@
+"""Tests for A* pathfinding."""
+
+import pytest
+from shapely.geometry import Polygon, MultiLineString
+from analysis import pathfinding
+from analysis.pathfinding import find_path, is_solvable
+
+
+@pytest.fixture
+def field():
+    return Polygon([(0, 0), (60, 0), (60, 40), (0, 40)])
+
+
+@pytest.fixture
+def walls():
+    # Two baffles through cell centres forcing an S-shaped route
+    return MultiLineString([[(20.5, 0), (20.5, 30)], [(40.5, 10), (40.5, 40)]])
+
+
+def test_path_routes_around_walls(field, walls):
+    path = find_path(walls, (5, 5), (55, 35), field, resolution=1.0)
+    assert path is not None
+    assert path[0] == (5.5, 5.5)
+    assert path[-1] == (55.5, 35.5)
+    # The route has to climb over the first baffle and under the second
+    assert max(y for x, y in path if 20 < x < 21) > 30
+    assert min(y for x, y in path if 40 < x < 41) < 10
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_is_solvable(field, walls, monkeypatch, use_numba):
+    monkeypatch.setattr(pathfinding, "_HAS_NUMBA", use_numba and pathfinding._HAS_NUMBA)
+    assert is_solvable(walls, (5, 5), (55, 35), field, resolution=1.0)
+    wall = MultiLineString([[(30.5, -1), (30.5, 41)]])
+    assert not is_solvable(wall, (5, 5), (55, 35), field, resolution=1.0)
+
+
+def test_python_search_fallback(field, walls, monkeypatch):
+    expected = find_path(walls, (5, 5), (55, 35), field, resolution=1.0)
+    monkeypatch.setattr(pathfinding, "_HAS_NUMBA", False)
+    assert find_path(walls, (5, 5), (55, 35), field, resolution=1.0) == expected
@@ -1,20 +1,28 @@
 """Tests for AppState singleton."""
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 import pytest
-from shapely.geometry import Polygon
+import shapely
+from shapely.geometry import Polygon, MultiLineString
 from state import AppState
 
+# Geometries are immutable, so tests share one instance of each
+FIELD = Polygon([(0, 0), (100, 0), (100, 100), (0, 100)])
+WALLS = MultiLineString([
+    [(0, 0), (10, 0)],
+    [(0, 5), (10, 5)],
+])
+
+# Tests reset the AppState singleton, so keep them on one xdist worker
+pytestmark = pytest.mark.xdist_group("appstate")
+
 
 @pytest.fixture(autouse=True)
 def fresh_state():
-    """Reset singleton between tests."""
-    AppState._instance = None
+    """Reset the singleton's data between tests without rebuilding it."""
+    state = AppState()
+    state.clear()
     yield
-    AppState._instance = None
+    state.clear()
 
 
 def test_singleton():
@@ -25,23 +33,49 @@ def test_singleton():
 
 def test_set_field():
     state = AppState()
-    field = Polygon([(0, 0), (100, 0), (100, 100), (0, 100)])
-    state.set_field(field, "EPSG:32615", (50.0, 50.0))
-    assert state.get_field() is not None
+    state.set_field(FIELD, "EPSG:32615", (50.0, 50.0))
+    assert state.get_field() is FIELD
+    assert shapely.is_prepared(state.get_field())
     assert state.get_crs() == "EPSG:32615"
     assert state.get_centroid_offset() == (50.0, 50.0)
 
 
 def test_set_walls():
     state = AppState()
-    from shapely.geometry import LineString, MultiLineString
-    walls = MultiLineString([
-        [(0, 0), (10, 0)],
-        [(0, 5), (10, 5)],
-    ])
-    state.set_walls(walls)
-    assert state.get_walls() is not None
-    assert state.get_walls().geom_type == 'MultiLineString'
+    state.set_walls(WALLS)
+    assert state.get_walls() is WALLS
+
+
+def test_raw_walls_hydrate_on_first_access():
+    import numpy as np
+
+    state = AppState()
+    state.set_walls_raw(np.array([[0.0, 0.0], [10.0, 0.0], [0.0, 5.0], [10.0, 5.0]]), np.array([0, 2, 4]))
+    assert state.current_walls is None
+    walls = state.get_walls()
+    assert walls.geom_type == 'MultiLineString'
+    assert len(walls.geoms) == 2
+    assert state.get_walls() is walls
+    assert state.get_walls_total_length() == 20.0
+
+    # Setting geometry directly supersedes pending raw walls
+    state.set_walls_raw(np.array([[0.0, 0.0], [1.0, 0.0]]), np.array([0, 2]))
+    state.set_walls(None)
+    assert state.get_walls() is None
+
+
+def test_carved_edges_union_on_read():
+    from shapely.geometry import LineString
+
+    state = AppState()
+    first = LineString([(0, 0), (10, 0)])
+    state.add_carved_edges(first)
+    assert state.get_carved_edges() is first
+    state.add_carved_edges(LineString([(5, -5), (5, 5)]))
+    state.add_carved_edges(LineString([(20, 0), (30, 0)]))
+    assert state.get_carved_edges().length == 30.0
+    state.carved_edges = None
+    assert state.get_carved_edges() is None
 
 
 def test_entrances_exits():
@@ -67,8 +101,7 @@ def test_layers():
 
 def test_clear():
     state = AppState()
-    field = Polygon([(0, 0), (100, 0), (100, 100), (0, 100)])
-    state.set_field(field, "EPSG:32615")
+    state.set_field(FIELD, "EPSG:32615")
     state.set_entrances([(0, 50)])
     state.set_exits([(100, 50)])
     state.set_emergency_exits([(50, 0)])
@@ -81,3 +114,38 @@ def test_clear():
     assert len(state.get_exits()) == 0
     assert len(state.get_emergency_exits()) == 0
     assert len(state.get_layers()) == 0
+
+
+def test_gps_transformer_cached_per_crs():
+    state = AppState()
+    assert state.get_gps_transformer() is None
+
+    state.set_field(FIELD, "EPSG:32615")
+    transformer = state.get_gps_transformer()
+    assert transformer is not None
+    assert state.get_gps_transformer() is transformer
+
+    state.current_crs = "EPSG:32616"
+    assert state.get_gps_transformer() is not transformer
+
+
+def test_walls_total_length_cached_until_walls_change():
+    state = AppState()
+    assert state.get_walls_total_length() == 0.0
+
+    state.set_walls(WALLS)
+    assert state.get_walls_total_length() == 20.0
+    assert state.walls_total_length == 20.0
+
+    state.set_walls(MultiLineString([[(0, 0), (3, 4)]]))
+    assert state.get_walls_total_length() == 5.0
+
+    state.clear()
+    assert state.get_walls_total_length() == 0.0
+
+
+def test_set_walls_with_known_length():
+    state = AppState()
+    state.set_walls(MultiLineString([[(0, 0), (10, 0)]]), total_length=10.0)
+    assert state.walls_total_length == 10.0
+    assert state.get_walls_total_length() == 10.0